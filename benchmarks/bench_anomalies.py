@@ -0,0 +1,53 @@
+"""Throughput of the anomaly methods on synthetic data.
+
+    python benchmarks/bench_anomalies.py --symbols 1000 --years 10
+
+Reports rows/sec for the vectorized rolling and EWM z-scores over the whole
+universe and for IsolationForest scored through ``score_universe`` on a
+subset of the symbols (it is orders of magnitude slower per row).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stock_analyzer.anomalies import ewm_zscore, rolling_zscore, score_universe  # noqa: E402
+from stock_analyzer.synthetic import generate_panel  # noqa: E402
+
+
+def timed(label, rows, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {rows:>12,} rows  {elapsed:8.3f} s  {rows / elapsed:14,.0f} rows/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--window", type=int, default=20)
+    parser.add_argument("--if-symbols", type=int, default=50,
+                        help="symbols to score with IsolationForest")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    panel = generate_panel(args.symbols, args.years)
+    close, volume = panel["Close"], panel["Volume"]
+    rows = close.size
+    timed("rolling z-score", rows, lambda: rolling_zscore(close, args.window))
+    timed("ewm z-score", rows, lambda: ewm_zscore(close, args.window))
+
+    subset = close.columns[:args.if_symbols]
+    frames = {s: pd.DataFrame({"Close": close[s], "Volume": volume[s]}) for s in subset}
+    timed("isolation forest (pool)", len(close) * len(subset),
+          lambda: score_universe(frames, "isolation_forest", processes=args.processes))
+
+
+if __name__ == "__main__":
+    main()
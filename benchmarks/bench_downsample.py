@@ -0,0 +1,61 @@
+"""Chart payload size and prep time with and without downsampling.
+
+    python benchmarks/bench_downsample.py --points 1000000 --width 1600
+
+Builds the same Plotly figures the pages build (close line, OHLC lines,
+volume bars) from a synthetic series and reports the serialized JSON size and
+the time to prepare and serialize each figure, before and after downsampling.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stock_analyzer.downsample import downsample, ohlc_buckets  # noqa: E402
+from stock_analyzer.synthetic import generate  # noqa: E402
+
+
+def line_figure(df):
+    return go.Figure(go.Scatter(x=df.index, y=df["Close"], mode="lines"))
+
+
+def ohlc_figure(df):
+    fig = go.Figure()
+    for col in ("Open", "High", "Low", "Close"):
+        fig.add_trace(go.Scatter(x=df.index, y=df[col], mode="lines", name=col))
+    fig.add_trace(go.Bar(x=df.index, y=df["Volume"], name="Volume"))
+    return fig
+
+
+def measure(label, build):
+    start = time.perf_counter()
+    payload = build().to_json()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<30} {len(payload) / 1e6:10.2f} MB  {elapsed:8.3f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--width", type=int, default=1600)
+    args = parser.parse_args(argv)
+
+    df = generate(1, interval="1m", rows=args.points)["S0000"]
+    anomalies = np.zeros(len(df), dtype=bool)
+    anomalies[np.random.default_rng(1).choice(len(df), 200, replace=False)] = True
+
+    measure("close line, full", lambda: line_figure(df))
+    measure("close line, lttb", lambda: line_figure(downsample(df, "Close", args.width, keep=anomalies)))
+    measure("close line, min/max", lambda: line_figure(downsample(df, "Close", args.width, method="minmax")))
+    measure("ohlc + volume, full", lambda: ohlc_figure(df))
+    measure("ohlc + volume, bucketed", lambda: ohlc_figure(ohlc_buckets(df, args.width)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Dashboard startup costs: per-page import time and cold start to first chart.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --symbols AAPL,MSFT,SPY --out startup.json
+
+Every measurement runs in a fresh interpreter so nothing is already imported
+or cached. Page import time runs only the import block at the top of each
+page script and lists the heavy modules it pulled in. First chart renders the
+Charts page (``streamlit.testing``) with the synthetic provider and an empty
+store: once cold, timed from interpreter start, and once after a boot-time
+prewarm of ``--symbols`` (``STOCK_ANALYZER_PREWARM``), timed from the page
+request.
+"""
+
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ["plotly.express", "plotly.subplots", "sklearn", "yfinance", "requests", "scipy"]
+
+IMPORTS = """
+import sys, time
+start = time.perf_counter()
+{imports}
+seconds = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print({{"seconds": seconds, "heavy": heavy}})
+"""
+
+FIRST_CHART = """
+import time
+from streamlit.testing.v1 import AppTest
+if {prewarm}:
+    import utils
+    utils.prewarm_thread.join()
+start = time.perf_counter()
+at = AppTest.from_file({page!r}, default_timeout=300).run()
+at.button[0].click().run()
+assert at.get("plotly_chart"), [e.value for e in at.error]
+print({{"seconds": time.perf_counter() - start}})
+"""
+
+
+def scripts():
+    return [os.path.join(ROOT, "Home.py")] + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def leading_imports(path):
+    """The import block a page runs before it draws anything."""
+    with open(path, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read())
+    block = []
+    for node in tree.body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            break
+        block.append(ast.unparse(node))
+    return "\n".join(block)
+
+
+def run(code, env=None):
+    """Run ``code`` in a fresh interpreter; returns (its printed dict, wall seconds from launch)."""
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+                         env={**os.environ, "PYTHONPATH": ROOT, **(env or {})})
+    wall = time.perf_counter() - start
+    if out.returncode:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "failed")
+    return ast.literal_eval(out.stdout.strip().splitlines()[-1]), wall
+
+
+def best(code, repeat, env=None):
+    runs = [run(code, env) for _ in range(repeat)]
+    return min(runs, key=lambda r: r[1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", default="AAPL,MSFT,GOOGL,AMZN,SPY", help="universe to prewarm")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {"pages": [], "first_chart": {}}
+    _, interpreter = best("print({})", args.repeat)
+    print(f"{'interpreter':<24} {interpreter * 1000:8.0f} ms")
+    for path in scripts():
+        name = os.path.splitext(os.path.basename(path))[0]
+        stats, _ = best(IMPORTS.format(imports=leading_imports(path), heavy=HEAVY), args.repeat)
+        results["pages"].append({"page": name, "seconds": stats["seconds"], "heavy": stats["heavy"]})
+        print(f"{name:<24} {stats['seconds'] * 1000:8.0f} ms  {', '.join(stats['heavy'])}")
+
+    # The Charts page opens on AAPL, so the prewarmed universe should include it.
+    page = os.path.join(ROOT, "pages", "Charts and Graphs.py")
+    for label, prewarm in (("cold", False), ("prewarmed", True)):
+        with tempfile.TemporaryDirectory() as store:
+            env = {"STOCK_ANALYZER_PROVIDER": "synthetic", "STOCK_ANALYZER_STORE": store}
+            if prewarm:
+                env["STOCK_ANALYZER_PREWARM"] = args.symbols
+            stats, wall = run(FIRST_CHART.format(prewarm=prewarm, page=page), env)
+        results["first_chart"][label] = {"request_seconds": stats["seconds"], "process_seconds": wall}
+        print(f"{'first chart, ' + label:<24} {stats['seconds'] * 1000:8.0f} ms  "
+              f"from page request ({wall * 1000:.0f} ms from interpreter start)")
+
+    results["interpreter"] = interpreter
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
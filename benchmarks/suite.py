@@ -0,0 +1,204 @@
+"""Time and peak memory of the analytics hot paths at several data sizes.
+
+    python benchmarks/suite.py --sizes 10x1,100x5,500x10 --out results.json
+    python benchmarks/suite.py --baseline results.json
+
+Each size is ``symbols x years`` of synthetic bars at ``--interval`` (seeded,
+so every run sees the same data; no network access). For every case the best
+of ``--repeat`` wall times is kept and one extra run is traced for peak
+Python/NumPy memory. ``--baseline`` compares against an earlier JSON file and
+exits non-zero when a case got slower than ``--tolerance`` times its old time
+(cases that took under ``--floor`` seconds are reported but never flagged).
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+from stock_analyzer.anomalies import detect, rolling_zscore  # noqa: E402
+from stock_analyzer.portfolio import monte_carlo, returns  # noqa: E402
+from stock_analyzer.price_store import PriceStore  # noqa: E402
+from stock_analyzer.screener import LatestTable  # noqa: E402
+from stock_analyzer.sentiment import NEGATIVE, POSITIVE, LexiconScorer, ScoreCache, score_articles  # noqa: E402
+from stock_analyzer.synthetic import SyntheticProvider, generate  # noqa: E402
+
+
+def per_symbol(fn, limit=None):
+    """Run ``fn(frame)`` on a fresh copy of every symbol's frame, like one page load each."""
+    def prepare(frames, interval):
+        selected = list(frames.values())[:limit]
+
+        def run():
+            for frame in selected:
+                fn(frame.copy())
+        return run
+    return prepare
+
+
+def close_matrix(fn):
+    def prepare(frames, interval):
+        close = pd.DataFrame({symbol: frame["Close"] for symbol, frame in frames.items()})
+        return lambda: fn(close)
+    return prepare
+
+
+def store_matrix(warm):
+    """``PriceStore.get_matrix`` over the universe from an empty or an already filled store."""
+    def prepare(frames, interval):
+        symbols = list(frames)
+        index = next(iter(frames.values())).index
+        start, end = index[0], index[-1] + pd.Timedelta(days=1)
+        if not warm:
+            def run():
+                with tempfile.TemporaryDirectory() as root:
+                    PriceStore(root, SyntheticProvider()).get_matrix(symbols, start, end, interval=interval)
+            return run
+        root = tempfile.TemporaryDirectory()
+        store = PriceStore(root.name, SyntheticProvider())
+        store.get_matrix(symbols, start, end, interval=interval)
+        run = lambda: store.get_matrix(symbols, start, end, interval=interval)  # noqa: E731
+        run.root = root  # keep the directory alive as long as the case
+        return run
+    return prepare
+
+
+def screener_scan(expression):
+    """One scan of an already loaded universe table (the per-rerun cost on the Screener page)."""
+    def prepare(frames, interval):
+        close = pd.DataFrame({symbol: frame["Close"] for symbol, frame in frames.items()})
+        table = LatestTable.from_prices(close)
+        return lambda: table.scan(expression)
+    return prepare
+
+
+def portfolio_monte_carlo(method, paths=10_000, horizon=250, assets=50):
+    def prepare(frames, interval):
+        close = pd.DataFrame({symbol: frame["Close"] for symbol, frame in list(frames.items())[:assets]})
+        asset_ret = returns(close)
+        return lambda: monte_carlo(asset_ret, paths=paths, horizon=horizon, method=method, processes=1)
+    return prepare
+
+
+def sentiment_cold(per_symbol=100):
+    """Score ``per_symbol`` seeded random headlines per symbol with an empty score cache."""
+    def prepare(frames, interval):
+        rng = np.random.default_rng(0)
+        words = np.array(POSITIVE + NEGATIVE + ["the", "shares", "company", "said", "not", "market"] * 20)
+        articles = [{"url": f"{symbol}/{i}", "title": " ".join(rng.choice(words, 12)),
+                     "description": " ".join(rng.choice(words, 30))}
+                    for symbol in frames for i in range(per_symbol)]
+        scorer = LexiconScorer()
+        return lambda: score_articles(articles, scorer, ScoreCache())
+    return prepare
+
+
+# Each case maps the generated ``{symbol: OHLCV frame}`` and their bar interval
+# to a zero-argument callable; only the callable is timed.
+CASES = {
+    "add_rsi": per_symbol(utils.add_rsi),
+    "add_macd": per_symbol(utils.add_macd),
+    "add_bollinger_bands": per_symbol(utils.add_bollinger_bands),
+    "detect_anomalies": per_symbol(utils.detect_anomalies, limit=20),
+    "anomaly_zscore": per_symbol(lambda df: detect(df, "rolling")),
+    "anomaly_zscore_matrix": close_matrix(rolling_zscore),
+    "compare_matrix_cold": store_matrix(warm=False),
+    "compare_matrix_warm": store_matrix(warm=True),
+    "screener_load": close_matrix(LatestTable.from_prices),
+    "screener_scan": screener_scan("rsi14 < 30 and close > ma50 and anomaly_z > 2"),
+    "monte_carlo_normal": portfolio_monte_carlo("normal"),
+    "monte_carlo_bootstrap": portfolio_monte_carlo("bootstrap"),
+    "sentiment_cold": sentiment_cold(),
+}
+
+
+def measure(run, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def parse_sizes(text):
+    return [tuple(int(part) for part in size.split("x")) for size in text.split(",")]
+
+
+def compare(results, baseline, tolerance, floor):
+    old = {(r["case"], r["symbols"], r["years"], r["interval"]): r for r in baseline["results"]}
+    regressions = 0
+    for row in results:
+        prev = old.get((row["case"], row["symbols"], row["years"], row["interval"]))
+        if prev is None:
+            continue
+        ratio = row["seconds"] / prev["seconds"] if prev["seconds"] else float("inf")
+        flag = "  REGRESSION" if ratio > tolerance and row["seconds"] >= floor else ""
+        regressions += bool(flag)
+        print(f"{row['case']:<24} {row['symbols']:>5}x{row['years']:<3} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10x1,100x5,500x10", help="comma-separated SYMBOLSxYEARS")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--cases", default=",".join(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    parser.add_argument("--floor", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    results = []
+    for symbols, years in parse_sizes(args.sizes):
+        frames = generate(symbols, years, args.interval, seed=args.seed)
+        rows = sum(len(f) for f in frames.values())
+        for name in args.cases.split(","):
+            seconds, peak = measure(CASES[name](frames, args.interval), args.repeat)
+            results.append({"case": name, "symbols": symbols, "years": years,
+                            "interval": args.interval, "rows": rows,
+                            "seconds": seconds, "peak_mb": peak / 2**20})
+            print(f"{name:<24} {symbols:>5}x{years:<3} {rows:>12,} rows  "
+                  f"{seconds:9.4f} s  {peak / 2**20:9.1f} MB")
+
+    report = {
+        "created": pd.Timestamp.now(tz="UTC").isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(report, fh, indent=2)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            if compare(results, json.load(fh), args.tolerance, args.floor):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,49 +1,48 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import plotly.express as px
+from utils import fetch_stock_data
+from stock_analyzer.anomalies import detect
+from stock_analyzer.downsample import downsample
+from stock_analyzer import telemetry
 
+telemetry.begin("Anomaly Detection")
 st.title("🚨 Anomaly Detection")
 
 symbol = st.text_input("Enter Stock Symbol", "AAPL").upper()
 start_date = st.date_input("Start Date", pd.to_datetime("2020-01-01"))
 end_date = st.date_input("End Date", pd.to_datetime("today"))
+methods = {"Rolling z-score": "rolling", "EWM z-score": "ewm", "Isolation Forest": "isolation_forest"}
+method = st.selectbox("Detection Method", list(methods))
+window = st.slider("Window (days)", 5, 120, 20, disabled=methods[method] == "isolation_forest")
 
 if symbol and start_date and end_date:
     try:
-        df = yf.download(symbol, start=start_date, end=end_date, group_by='ticker')
+        df = fetch_stock_data(symbol, start_date, end_date)
 
         if df.empty:
             st.error(f"No data found for {symbol}. Try another symbol or date range.")
         else:
             # Reset index to bring 'Date' as a column
             df = df.reset_index()
+            close_col = "Close"
 
-            # If multi-indexed columns, flatten them
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = ['_'.join([str(i) for i in col if i]) for col in df.columns]
-
-            # Find the appropriate close column (e.g., Close_AAPL or Close)
-            close_col = None
-            for col in df.columns:
-                if "Close" in col and symbol in col:
-                    close_col = col
-                    break
-            if not close_col and "Close" in df.columns:
-                close_col = "Close"
-
-            if not close_col:
+            if close_col not in df.columns:
                 st.error(f"Could not find Close price column in data. Available columns: {df.columns}")
             else:
-                # Anomaly detection based on z-score
-                mean = df[close_col].mean()
-                std = df[close_col].std()
-                df['Anomaly'] = np.where(abs((df[close_col] - mean) / std) > 2, df[close_col], np.nan)
-
-                fig = px.line(df, x="Date", y=close_col, title=f"{symbol} Close Price with Anomalies")
-                fig.add_scatter(x=df["Date"], y=df["Anomaly"], mode="markers", name="Anomalies", marker=dict(color="red", size=8))
-                st.plotly_chart(fig, use_container_width=True)
+                # Rolling/EWM z-score or cached Isolation Forest on return and volume features
+                flags = detect(df.set_index("Date"), methods[method], window=window, symbol=symbol)["anomaly"].to_numpy()
+                df['Anomaly'] = np.where(flags, df[close_col], np.nan)
+
+                # Downsample the line for the browser; anomalous rows are always kept
+                import plotly.express as px
+
+                with telemetry.span("plot"):
+                    line = downsample(df, close_col, keep=flags)
+                    points = df[flags]
+                    fig = px.line(line, x="Date", y=close_col, title=f"{symbol} Close Price with Anomalies")
+                    fig.add_scatter(x=points["Date"], y=points["Anomaly"], mode="markers", name="Anomalies", marker=dict(color="red", size=8))
+                    st.plotly_chart(fig, use_container_width=True)
 
     except Exception as e:
         st.error(f"An error occurred: {e}")
@@ -1,11 +1,15 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
-import plotly.graph_objects as go
+from utils import fetch_price_matrix, comparison_cache
+from stock_analyzer.compare import beta, normalized_performance
+from stock_analyzer.downsample import downsample
+from stock_analyzer import telemetry
 
 # Set page config at the top
 st.set_page_config(page_title="Compare Stocks", layout="wide")
 
+telemetry.begin("Compare")
+
 # Title
 st.title("📈 Compare Multiple Stocks")
 
@@ -15,6 +19,8 @@ with st.sidebar:
     symbols_input = st.text_input("Enter stock symbols (comma separated)", "AAPL, MSFT, GOOGL")
     start_date = st.date_input("Start Date", pd.to_datetime("2023-01-01"))
     end_date = st.date_input("End Date", pd.to_datetime("today"))
+    benchmark = st.text_input("Benchmark symbol", "SPY").strip().upper()
+    corr_window = st.slider("Correlation window (days)", 20, 252, 60)
 
 # Process input symbols
 symbols_list = [s.strip().upper() for s in symbols_input.split(",") if s.strip()]
@@ -24,51 +30,65 @@ if len(symbols_list) < 2:
     st.warning("Please enter at least 2 valid stock symbols to compare.")
     st.stop()
 
-# Fetch data
-@st.cache_data
-def fetch_stock_data(symbol, start, end):
-    try:
-        df = yf.download(symbol, start=start, end=end)
-        df["Symbol"] = symbol
-        return df
-    except Exception as e:
-        st.error(f"Failed to fetch data for {symbol}: {e}")
-        return pd.DataFrame()
-
-# Gather all stock data
-data_frames = [fetch_stock_data(symbol, start_date, end_date) for symbol in symbols_list]
-data = pd.concat(data_frames)
+# Gather all stock data as one date-aligned close matrix (dates x symbols)
+universe = symbols_list + [benchmark] if benchmark and benchmark not in symbols_list else symbols_list
+prices = fetch_price_matrix(tuple(universe), start_date, end_date)
 
 # Check if data is valid
-if data.empty:
+if prices.empty or prices.isna().all().all():
     st.error("No data found for the given symbols and date range.")
     st.stop()
 
-# Reset index and prepare for plotting
-data.reset_index(inplace=True)
-
-# Plot using Plotly
-fig = go.Figure()
-for symbol in symbols_list:
-    symbol_df = data[data["Symbol"] == symbol]
-    fig.add_trace(go.Scatter(
-        x=symbol_df["Date"],
-        y=symbol_df["Close"],
-        mode='lines',
-        name=symbol
-    ))
-
-fig.update_layout(
-    title="Stock Closing Price Comparison",
-    xaxis_title="Date",
-    yaxis_title="Closing Price (USD)",
-    template="plotly_dark",
-    height=600,
-)
-
-st.plotly_chart(fig, use_container_width=True)
+# Plot using Plotly (imported only once there is data to draw)
+import plotly.express as px
+import plotly.graph_objects as go
+
+with telemetry.span("plot.close"):
+    fig = go.Figure()
+    for symbol in symbols_list:
+        series = downsample(prices[[symbol]].dropna(), symbol)[symbol]
+        fig.add_trace(go.Scatter(
+            x=series.index,
+            y=series,
+            mode='lines',
+            name=symbol,
+            connectgaps=True
+        ))
+
+    fig.update_layout(
+        title="Stock Closing Price Comparison",
+        xaxis_title="Date",
+        yaxis_title="Closing Price (USD)",
+        template="plotly_dark",
+        height=600,
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
 
 # Show table
-st.subheader("📄 Raw Data (Last 5 Days per Stock)")
-latest_data = data.groupby("Symbol").apply(lambda x: x.tail(5)).reset_index(drop=True)
-st.dataframe(latest_data)
+st.subheader("📄 Closing Prices (Last 5 Days)")
+st.dataframe(prices[symbols_list].tail(5))
+
+# Normalized performance: every symbol rebased to 1.0 at the start of the range
+st.subheader("📊 Normalized Performance")
+with telemetry.span("plot.performance"):
+    performance = normalized_performance(prices[symbols_list])
+    perf_fig = go.Figure()
+    for symbol in symbols_list:
+        series = downsample(performance[[symbol]].dropna(), symbol)[symbol]
+        perf_fig.add_trace(go.Scatter(x=series.index, y=series, mode='lines', name=symbol))
+    perf_fig.update_layout(template="plotly_dark", height=450, yaxis_title="Growth of 1")
+    st.plotly_chart(perf_fig, use_container_width=True)
+
+# Rolling correlation and beta, maintained incrementally per (universe, window)
+with telemetry.span("correlation"):
+    cov, corr = comparison_cache.get(prices, corr_window)
+st.subheader(f"🔗 Return Correlation (last {corr_window} days)")
+with telemetry.span("plot.correlation"):
+    corr_fig = px.imshow(corr.loc[symbols_list, symbols_list], zmin=-1, zmax=1, color_continuous_scale="RdBu_r")
+    corr_fig.update_layout(template="plotly_dark", height=600)
+    st.plotly_chart(corr_fig, use_container_width=True)
+
+if benchmark in cov.columns:
+    st.subheader(f"📐 Beta vs {benchmark} (last {corr_window} days)")
+    st.dataframe(beta(cov, benchmark).loc[symbols_list].rename("Beta").to_frame())
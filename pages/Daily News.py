@@ -1,6 +1,11 @@
+import datetime
 import streamlit as st
-import pandas as pd 
-from utils import fetch_news
+import pandas as pd
+from utils import fetch_news, fetch_stock_data, news_sentiment, sentiment_feed
+from stock_analyzer.anomalies import detect
+from stock_analyzer import telemetry
+
+telemetry.begin("Daily News")
 
 st.title("📰 Latest Stock News")
 
@@ -17,3 +22,46 @@ else:
             st.write(article["description"])
             st.markdown(f"[Read more]({article['url']})")
             st.markdown("---")
+
+    # Sentiment is fetched and scored on a background thread; until it lands
+    # this section polls for it instead of blocking the page.
+    end = datetime.date.today() + datetime.timedelta(days=1)
+    prices = fetch_stock_data(symbol, end - datetime.timedelta(days=120), end)
+    feed = sentiment_feed()
+    feed.refresh([symbol])
+    pending = feed.pending([symbol])
+
+    @st.fragment(run_every=2 if pending else None)
+    def show_sentiment():
+        if prices.empty:
+            return
+        scored, daily = news_sentiment(symbol, prices.index)
+        if feed.pending([symbol]):
+            st.info("Scoring news sentiment...")
+            return
+        if pending:
+            st.rerun()
+        if scored.empty:
+            st.info("No news to score yet.")
+            return
+        st.header("🧭 Daily News Sentiment")
+        flags = detect(prices, "rolling")["anomaly"].to_numpy()
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
+        with telemetry.span("plot.sentiment"):
+            fig = make_subplots(specs=[[{"secondary_y": True}]])
+            fig.add_trace(go.Bar(x=prices.index, y=daily["sentiment"][symbol], name="Sentiment",
+                                 marker_color=["green" if v > 0 else "red" for v in daily["sentiment"][symbol].fillna(0)],
+                                 opacity=0.5), secondary_y=True)
+            fig.add_trace(go.Scatter(x=prices.index, y=prices["Close"], mode='lines', name="Close"))
+            fig.add_trace(go.Scatter(x=prices.index[flags], y=prices["Close"][flags], mode='markers',
+                                     name="Anomalies", marker=dict(color="orange", size=8)))
+            fig.update_layout(template="plotly_dark", height=450)
+            fig.update_yaxes(title_text="Close", secondary_y=False)
+            fig.update_yaxes(title_text="Sentiment", range=[-1, 1], secondary_y=True)
+            st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"{len(scored)} articles scored; {int(daily['articles'][symbol].sum())} fall in the charted range.")
+        st.dataframe(scored[["published", "score", "title", "source"]].head(50), use_container_width=True)
+
+    show_sentiment()
@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd 
-from utils import fetch_stock_data
+from utils import load_prices, forecast_models
+from stock_analyzer.forecast import METHODS, evaluate, forecast, walk_forward
+from stock_analyzer import telemetry
 
 st.set_page_config(page_title="Stock Dashboard", layout="wide")
+telemetry.begin("Data Forecast")
 st.title("📊 Real-Time Stock Dashboard")
 
 symbol = st.text_input("Enter stock symbol (e.g., AAPL)", "AAPL")
@@ -10,13 +13,33 @@ start_date = st.date_input("Start Date", value=pd.to_datetime("2020-01-01"))
 end_date = st.date_input("End Date", value=pd.to_datetime("today"))
 
 if symbol:
-    data = fetch_stock_data(symbol, start_date, end_date)
-    if data.empty:
+    try:
+        prices = load_prices(symbol, start_date, end_date)
+    except Exception as e:
+        st.error(f"Error fetching data: {e}")
+        st.stop()
+    if len(prices) == 0:
         st.error("Failed to fetch data. Please check symbol or date range.")
     else:
         st.session_state["symbol"] = symbol
         st.session_state["start_date"] = start_date
         st.session_state["end_date"] = end_date
-        st.session_state["data"] = data
+        # The series is shared across sessions; only a reference is kept here
+        st.session_state["prices"] = prices
         st.success(f"Data for {symbol} loaded successfully!")
-        st.dataframe(data.tail())
+        st.dataframe(prices.frame().tail())
+
+        # Forecasts: baselines plus the persisted ridge model, updated only with new bars
+        st.subheader("🔮 Price Forecast")
+        horizon = st.slider("Forecast horizon (trading days)", 1, 60, 5)
+        close = prices.frame()["Close"]
+        with telemetry.span("forecast"):
+            model = forecast_models.updated(symbol, close, horizon)
+            table = pd.DataFrame({method: forecast(close, horizon, method, model=model) for method in METHODS}).T
+        st.dataframe(table.style.format({"last_close": "{:.2f}", "expected_return": "{:.2%}", "forecast": "{:.2f}"}))
+
+        if st.checkbox("Run walk-forward evaluation"):
+            with telemetry.span("walk_forward"):
+                walk = walk_forward(close, horizon, step=max(1, horizon))
+            st.dataframe(evaluate(walk))
+            st.line_chart(walk)
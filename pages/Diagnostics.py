@@ -0,0 +1,65 @@
+import os
+import streamlit as st
+import pandas as pd
+from stock_analyzer import telemetry
+
+st.set_page_config(page_title="Diagnostics", layout="wide")
+st.title("🩺 Diagnostics")
+
+# Telemetry is process-wide, so only an admin deployment lets visitors switch
+# it or clear it; everyone else gets a read-only view.
+ADMIN = os.environ.get("STOCK_ANALYZER_DIAGNOSTICS_ADMIN", "") not in ("", "0")
+if ADMIN:
+    enabled = st.toggle("Collect timings and counters", value=telemetry.enabled())
+    if enabled != telemetry.enabled():
+        telemetry.enable(enabled)
+else:
+    enabled = telemetry.enabled()
+if not enabled:
+    st.info("Telemetry is off. Start the app with STOCK_ANALYZER_TELEMETRY=1 (or turn it on here when "
+            "STOCK_ANALYZER_DIAGNOSTICS_ADMIN=1) and use the other pages to collect data.")
+    st.stop()
+if ADMIN and st.button("Reset"):
+    telemetry.reset()
+
+# Per-rerun waterfall
+traces = [t for t in reversed(telemetry.traces()) if t.spans]
+st.subheader("⏱️ Page reruns")
+if not traces:
+    st.info("No page reruns recorded yet.")
+else:
+    labels = [f"{pd.Timestamp(t.started, unit='s'):%H:%M:%S} {t.name} ({t.seconds * 1000:.0f} ms)" for t in traces]
+    trace = traces[st.selectbox("Rerun", range(len(traces)), format_func=labels.__getitem__)]
+    spans = sorted(trace.spans, key=lambda s: s[1])
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Bar(
+        y=[f"{'  ' * depth}{name}" for name, _, _, depth in spans],
+        x=[seconds * 1000 for _, _, seconds, _ in spans],
+        base=[offset * 1000 for _, offset, _, _ in spans],
+        orientation="h",
+        hovertemplate="%{y}: %{x:.1f} ms<extra></extra>",
+    ))
+    fig.update_layout(template="plotly_dark", xaxis_title="ms since rerun start",
+                      yaxis=dict(autorange="reversed"), height=120 + 30 * len(spans))
+    st.plotly_chart(fig, use_container_width=True)
+
+# Aggregates since start (or the last reset)
+st.subheader("📊 Span totals")
+stats = telemetry.span_stats()
+if stats:
+    table = pd.DataFrame.from_dict(stats, orient="index", columns=["count", "total_s", "max_s"])
+    table["mean_ms"] = table["total_s"] / table["count"] * 1000
+    st.dataframe(table.sort_values("total_s", ascending=False), use_container_width=True)
+
+st.subheader("🗃️ Counters")
+counters = telemetry.counters()
+if counters:
+    rows = [{"counter": name, **dict(labels), "value": value} for (name, labels), value in counters.items()]
+    st.dataframe(pd.DataFrame(rows).fillna(""), use_container_width=True)
+
+st.subheader("Prometheus export")
+text = telemetry.prometheus()
+st.download_button("Download metrics.txt", text, file_name="metrics.txt", mime="text/plain")
+with st.expander("Show"):
+    st.code(text, language="text")
@@ -0,0 +1,51 @@
+import streamlit as st
+import pandas as pd
+from utils import watchlist
+from stock_analyzer import telemetry
+
+st.set_page_config(page_title="Live Watchlist", layout="wide")
+telemetry.begin("Live Watchlist")
+
+# Title
+st.title("⏱️ Live Watchlist")
+
+with st.sidebar:
+    st.header("Watchlist Settings")
+    symbols_input = st.text_input("Symbols (comma separated)", "AAPL, MSFT, GOOGL, AMZN")
+    refresh_every = st.slider("Refresh the table every (seconds)", 5, 120, 15)
+
+symbols_list = [s.strip().upper() for s in symbols_input.split(",") if s.strip()]
+if not symbols_list:
+    st.warning("Please enter at least one symbol.")
+    st.stop()
+
+live = watchlist()
+live.watch(symbols_list)
+if live.snapshot().get(symbols_list[0]) is None:
+    # First visit: load these symbols now instead of waiting for the next poll
+    with st.spinner("Loading watchlist..."):
+        live.refresh(symbols_list)
+
+
+# Only this fragment reruns on the timer; it reads the latest published
+# snapshot and never triggers a download itself.
+@st.fragment(run_every=refresh_every)
+def show_table():
+    # Renew the watch while this page is open; unwatched symbols expire.
+    live.watch(symbols_list)
+    snapshot = live.snapshot()
+    table = snapshot.frame(symbols_list)
+    if table.empty:
+        st.info("Waiting for the first update...")
+        return
+    if snapshot.updated_at is not None:
+        st.caption(f"Last update: {pd.Timestamp(snapshot.updated_at, unit='s'):%Y-%m-%d %H:%M:%S} UTC")
+    st.dataframe(
+        table.style.format(precision=2).apply(
+            lambda row: ["background-color: #ffcccc" if row["anomaly"] else "" for _ in row], axis=1
+        ),
+        use_container_width=True,
+    )
+
+
+show_table()
@@ -0,0 +1,110 @@
+import streamlit as st
+import pandas as pd
+from utils import fetch_price_matrix, simulate_portfolio
+from stock_analyzer import portfolio, telemetry
+from stock_analyzer.downsample import downsample
+
+st.set_page_config(page_title="Portfolio Risk", layout="wide")
+telemetry.begin("Portfolio")
+
+# Title
+st.title("💼 Portfolio Risk")
+
+with st.sidebar:
+    st.header("Portfolio Settings")
+    symbols_input = st.text_input("Enter stock symbols (comma separated)", "AAPL, MSFT, GOOGL, AMZN")
+    weights_input = st.text_input("Weights (comma separated, blank = equal)", "")
+    start_date = st.date_input("Start Date", pd.to_datetime("2021-01-01"))
+    end_date = st.date_input("End Date", pd.to_datetime("today"))
+    level = st.slider("VaR confidence", 0.90, 0.99, 0.95, step=0.01)
+    vol_window = st.slider("Volatility window (days)", 10, 126, 21)
+    st.header("Monte Carlo")
+    method = st.radio("Return model", ["normal", "bootstrap"], horizontal=True)
+    paths = st.selectbox("Paths", [10_000, 50_000, 100_000], index=0)
+    horizon = st.slider("Horizon (trading days)", 1, 252, 21)
+
+symbols_list = list(dict.fromkeys(s.strip().upper() for s in symbols_input.split(",") if s.strip()))
+if not symbols_list:
+    st.warning("Please enter at least one symbol.")
+    st.stop()
+
+try:
+    weights = [float(w) for w in weights_input.split(",")] if weights_input.strip() else None
+    weights = portfolio.normalize_weights(symbols_list, weights)
+except ValueError as e:
+    st.error(f"Invalid weights: {e}")
+    st.stop()
+
+prices = fetch_price_matrix(tuple(symbols_list), start_date, end_date)
+if prices.empty or prices.isna().all().all():
+    st.error("No data found for the given symbols and date range.")
+    st.stop()
+prices = prices[symbols_list].dropna(how="all")
+
+with telemetry.span("portfolio"):
+    asset_returns = portfolio.returns(prices)
+    port_returns = portfolio.portfolio_returns(prices, weights)
+    stats = portfolio.summary(prices, weights, level)
+
+col1, col2, col3, col4, col5 = st.columns(5)
+col1.metric("Total return", f"{stats['total_return']:.1%}")
+col2.metric("Annual volatility", f"{stats['annual_volatility']:.1%}")
+col3.metric("Max drawdown", f"{stats['max_drawdown']:.1%}")
+col4.metric(f"1-day VaR ({level:.0%})", f"{stats['var']:.2%}")
+col5.metric(f"1-day CVaR ({level:.0%})", f"{stats['cvar']:.2%}")
+
+# Plotly is imported only once there is data to draw
+import plotly.graph_objects as go
+
+# Equity curve and drawdown
+st.subheader("📈 Growth of 1 and Drawdown")
+with telemetry.span("plot.equity"):
+    curves = pd.DataFrame({"equity": (1 + port_returns).cumprod(), "drawdown": portfolio.drawdown(port_returns)})
+    equity = downsample(curves[["equity"]], "equity")["equity"]
+    dd = downsample(curves[["drawdown"]], "drawdown")["drawdown"]
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=equity.index, y=equity, mode='lines', name="Portfolio"))
+    fig.add_trace(go.Scatter(x=dd.index, y=dd, mode='lines', name="Drawdown", fill='tozeroy', yaxis="y2",
+                             line=dict(color='red')))
+    fig.update_layout(template="plotly_dark", height=500,
+                      yaxis=dict(title="Growth of 1"),
+                      yaxis2=dict(title="Drawdown", overlaying="y", side="right", tickformat=".0%"))
+    st.plotly_chart(fig, use_container_width=True)
+
+# Rolling volatility
+st.subheader(f"🌊 Rolling Volatility ({vol_window} days, annualized)")
+with telemetry.span("plot.volatility"):
+    vol = portfolio.rolling_volatility(port_returns, vol_window).dropna().to_frame("volatility")
+    vol = downsample(vol, "volatility")["volatility"]
+    vol_fig = go.Figure(go.Scatter(x=vol.index, y=vol, mode='lines', name="Volatility"))
+    vol_fig.update_layout(template="plotly_dark", height=400, yaxis_tickformat=".0%")
+    st.plotly_chart(vol_fig, use_container_width=True)
+
+# Risk contributions
+st.subheader("🧩 Risk Contributions")
+contributions = portfolio.risk_contributions(asset_returns, weights)
+with telemetry.span("plot.contributions"):
+    rc_fig = go.Figure([
+        go.Bar(x=contributions.index, y=contributions["weight"], name="Weight"),
+        go.Bar(x=contributions.index, y=contributions["share"], name="Share of volatility"),
+    ])
+    rc_fig.update_layout(template="plotly_dark", height=400, barmode="group", yaxis_tickformat=".0%")
+    st.plotly_chart(rc_fig, use_container_width=True)
+st.dataframe(contributions.style.format("{:.2%}"))
+
+# Monte Carlo
+st.subheader(f"🎲 Monte Carlo: {horizon}-day return over {paths:,} paths")
+with st.spinner("Simulating..."):
+    var, cvar, outcomes = simulate_portfolio(asset_returns, tuple(weights), paths, horizon, level, method)
+hist_var, hist_cvar = portfolio.historical_var(port_returns, level, horizon)
+col1, col2, col3, col4 = st.columns(4)
+col1.metric(f"Monte Carlo VaR ({level:.0%})", f"{var:.2%}")
+col2.metric(f"Monte Carlo CVaR ({level:.0%})", f"{cvar:.2%}")
+col3.metric(f"Historical VaR ({level:.0%})", f"{hist_var:.2%}")
+col4.metric(f"Historical CVaR ({level:.0%})", f"{hist_cvar:.2%}")
+with telemetry.span("plot.monte_carlo"):
+    mc_fig = go.Figure(go.Histogram(x=outcomes, nbinsx=100, name="Simulated returns"))
+    mc_fig.add_vline(x=-var, line_color="red", line_dash="dash", annotation_text="VaR")
+    mc_fig.add_vline(x=-cvar, line_color="orange", line_dash="dot", annotation_text="CVaR")
+    mc_fig.update_layout(template="plotly_dark", height=400, xaxis_tickformat=".0%", showlegend=False)
+    st.plotly_chart(mc_fig, use_container_width=True)
@@ -0,0 +1,67 @@
+import datetime
+import time
+import streamlit as st
+from utils import fetch_price_matrix, screener_table, watchlist
+from stock_analyzer import telemetry
+
+st.set_page_config(page_title="Screener", layout="wide")
+telemetry.begin("Screener")
+
+# Title
+st.title("🔎 Stock Screener")
+
+with st.sidebar:
+    st.header("Universe")
+    universe_input = st.text_area("Symbols (comma or newline separated)",
+                                  "AAPL, MSFT, GOOGL, AMZN, META, NVDA, TSLA, JPM, V, WMT")
+    keep_live = st.checkbox("Keep these symbols updating live", value=True)
+    refresh_every = st.slider("Rescan every (seconds)", 5, 120, 30)
+
+universe = list(dict.fromkeys(s.strip().upper() for s in universe_input.replace("\n", ",").split(",") if s.strip()))
+if not universe:
+    st.warning("Please enter at least one symbol.")
+    st.stop()
+
+table = screener_table()
+missing = [s for s in universe if s not in table]
+if missing:
+    # Load the history once for symbols the table has not seen; later reruns only scan.
+    end = datetime.date.today() + datetime.timedelta(days=1)
+    with st.spinner(f"Loading {len(missing)} symbols..."):
+        close = fetch_price_matrix(tuple(missing), end - datetime.timedelta(days=400), end)
+    if not close.empty:
+        with telemetry.span("screener_load"):
+            table.load(close.dropna(axis=1, how="all"))
+
+live = watchlist()
+if keep_live:
+    live.watch(universe)
+
+expression = st.text_input("Condition", "rsi14 < 30 and close > ma50",
+                           help="Combine columns with and / or / not, comparisons, + - * / and abs(). "
+                                "Example: rsi14 < 30 and close > ma50 and anomaly_z > 2")
+col1, col2 = st.columns(2)
+sort_by = col1.selectbox("Sort by", ["rsi14", "anomaly_z", "close", "macd", "ma50", "ema20"])
+descending = col2.checkbox("Descending", value=False)
+
+
+@st.fragment(run_every=refresh_every)
+def show_matches():
+    if keep_live:
+        # Renew the watch while this page is open; unwatched symbols expire.
+        live.watch(universe)
+    table.sync(live.snapshot())
+    start = time.perf_counter()
+    try:
+        with telemetry.span("screener_scan"):
+            matches = table.scan(expression, sort=sort_by, ascending=not descending)
+    except (ValueError, KeyError) as e:
+        st.error(str(e).strip("'\""))
+        return
+    matches = matches[matches.index.isin(universe)]
+    st.caption(f"{len(matches)} of {len(universe)} symbols match "
+               f"({(time.perf_counter() - start) * 1000:.1f} ms over {len(table)} symbols)")
+    st.dataframe(matches.style.format(precision=2), use_container_width=True)
+
+
+show_matches()
@@ -1,45 +1,11 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-
-# Function to compute RSI
-def compute_rsi(df, close_col='Close', window=14):
-    delta = df[close_col].diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
-
-    avg_gain = gain.rolling(window).mean()
-    avg_loss = loss.rolling(window).mean()
-
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-
-    df['RSI'] = rsi
-    return df
-
-# Function to compute MACD
-def compute_macd(df, close_col='Close'):
-    exp1 = df[close_col].ewm(span=12, adjust=False).mean()
-    exp2 = df[close_col].ewm(span=26, adjust=False).mean()
-    macd = exp1 - exp2
-    signal = macd.ewm(span=9, adjust=False).mean()
-    df['MACD'] = macd
-    df['MACD_Signal'] = signal
-    return df
-
-# Function to compute Moving Averages
-def compute_moving_averages(df, close_col='Close'):
-    df['MA_20'] = df[close_col].rolling(window=20).mean()
-    df['MA_50'] = df[close_col].rolling(window=50).mean()
-    return df
-
-# Fetch stock data
-@st.cache_data
-def fetch_stock_data(symbol, start_date, end_date):
-    data = yf.download(symbol, start=start_date, end=end_date)
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = [' '.join(col).strip() for col in data.columns.values]
-    return data
+from utils import fetch_stock_data
+from stock_analyzer.indicators import compute_indicators
+from stock_analyzer.backtest import equity_curve, run
+from stock_analyzer import telemetry
+
+telemetry.begin("Stock Indicators")
 
 # UI
 st.title("📊 Stock Indicators")
@@ -53,6 +19,7 @@ indicators = st.multiselect(
     ["RSI", "MACD", "Moving Averages"],
     default=["RSI"]
 )
+run_backtest = st.checkbox("Backtest the selected signals")
 
 if st.button("Fetch Data"):
     df = fetch_stock_data(symbol, start_date, end_date)
@@ -63,10 +30,22 @@ if st.button("Fetch Data"):
 
         if close_col:
             st.subheader(f"Indicators for {symbol}")
-            
+
+            # Evaluate every selected indicator in one pass over the close series
+            specs = []
+            if "RSI" in indicators:
+                specs.append("rsi:14")
+            if "MACD" in indicators:
+                specs.append("macd")
+            if "Moving Averages" in indicators:
+                specs += ["ma:20", "ma:50"]
+            results = compute_indicators(df[close_col], specs)
+            for name, column in [("rsi14", "RSI"), ("macd", "MACD"), ("macd_signal", "MACD_Signal"), ("ma20", "MA_20"), ("ma50", "MA_50")]:
+                if name in results:
+                    df[column] = results[name]
+
             # RSI
             if "RSI" in indicators:
-                df = compute_rsi(df, close_col=close_col)
                 st.line_chart(df.set_index('Date')[['RSI']])
                 
                 latest_rsi = df['RSI'].dropna().iloc[-1]
@@ -80,7 +59,6 @@ if st.button("Fetch Data"):
 
             # MACD
             if "MACD" in indicators:
-                df = compute_macd(df, close_col=close_col)
                 st.line_chart(df.set_index('Date')[['MACD', 'MACD_Signal']])
 
                 latest_macd = df['MACD'].dropna().iloc[-1]
@@ -93,7 +71,6 @@ if st.button("Fetch Data"):
 
             # Moving Averages
             if "Moving Averages" in indicators:
-                df = compute_moving_averages(df, close_col=close_col)
                 st.line_chart(df.set_index('Date')[[close_col, 'MA_20', 'MA_50']])
 
                 latest_close = df[close_col].iloc[-1]
@@ -108,6 +85,20 @@ if st.button("Fetch Data"):
                 else:
                     st.info("ℹ️ Price is in a mixed zone between MA20 and MA50.")
 
+            # Backtest: trade each signal rule from the next bar and compare with buy & hold
+            if run_backtest and indicators:
+                st.subheader("Signal Backtest")
+                rules = {"RSI": "rsi", "MACD": "macd", "Moving Averages": "ma"}
+                close = df.set_index('Date')[close_col]
+                selected = [rules[name] for name in indicators]
+                with telemetry.span("backtest"):
+                    stats = pd.concat([run(close, rule) for rule in selected])
+                stats.index = selected
+                st.dataframe(stats.style.format("{:.2f}"))
+                curves = pd.concat([equity_curve(close, rule) for rule in selected], axis=1)
+                curves["buy & hold"] = close / close.iloc[0]
+                st.line_chart(curves)
+
         else:
             st.error("Close column not found.")
     else:
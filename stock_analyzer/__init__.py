@@ -0,0 +1,11 @@
+"""Headless stock analytics: price store, indicators and anomaly detection.
+
+Nothing in this package imports Streamlit or Plotly, so it can run in cron
+jobs and worker processes; the Streamlit pages are thin views over it.
+"""
+
+from .indicators import compute_indicators
+from .pipeline import analyze_frame, analyze_symbol, analyze_universe
+from .price_store import PriceStore
+
+__all__ = ["PriceStore", "analyze_frame", "analyze_symbol", "analyze_universe", "compute_indicators"]
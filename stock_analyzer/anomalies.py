@@ -0,0 +1,209 @@
+"""Anomaly detection over one symbol or a whole universe.
+
+Three methods share one output shape, a frame with a ``score`` column (higher
+means more unusual) and a boolean ``anomaly`` column:
+
+* ``"rolling"`` - z-score of the close against its trailing rolling mean/std,
+* ``"ewm"`` - z-score against an exponentially weighted mean/variance,
+* ``"isolation_forest"`` - IsolationForest on return and volume features.
+
+The z-score methods are vectorized over a dates x symbols matrix. Fitted
+IsolationForest models are cached per ``(symbol, window)`` and refitted on a
+fixed cadence, so a rerun or a few appended bars only score rows not seen yet. ``score_universe`` splits a universe across
+processes.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from . import telemetry
+from .indicators import ema, rolling_mean, rolling_std
+
+METHODS = ("rolling", "ewm", "isolation_forest")
+
+# Rows before this position have truncated features (no previous close, a
+# partial volume window) that depend on where the frame starts.
+FEATURE_WARMUP = 20
+
+
+def _matrix(close):
+    values = np.asarray(close, dtype="float64")
+    return values.reshape(len(values), -1)
+
+
+def _like(close, values):
+    if isinstance(close, pd.DataFrame):
+        return pd.DataFrame(values, index=close.index, columns=close.columns)
+    if isinstance(close, pd.Series):
+        return pd.Series(values[:, 0], index=close.index, name=close.name)
+    return values if np.ndim(close) == 2 else values[:, 0]
+
+
+def rolling_zscore(close, window=20):
+    """Z-score of each close against its trailing ``window``-bar mean and std."""
+    values = _matrix(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (values - rolling_mean(values, window)) / rolling_std(values, window)
+    return _like(close, z)
+
+
+def ewm_zscore(close, span=20):
+    """Z-score against an ``adjust=False`` exponentially weighted mean and variance."""
+    values = _matrix(close)
+    with np.errstate(all="ignore"):
+        centered = values - np.nanmean(values, axis=0)
+        mean = ema(centered, span)
+        var = np.maximum(ema(centered * centered, span) - mean * mean, 0.0)
+        z = (centered - mean) / np.sqrt(var)
+    return _like(close, z)
+
+
+def features(df):
+    """Log return, absolute log return and log volume relative to its 20-bar mean."""
+    close = df["Close"].to_numpy(dtype="float64")
+    volume = df["Volume"].to_numpy(dtype="float64") if "Volume" in df else np.ones_like(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = np.diff(np.log(close), prepend=np.nan)
+        vol = np.log(volume / rolling_mean(volume.reshape(-1, 1), 20)[:, 0])
+    feats = np.column_stack([ret, np.abs(ret), vol])
+    feats[~np.isfinite(feats)] = 0.0
+    return feats
+
+
+class IsolationForestDetector:
+    """IsolationForest scorer with one fitted model cached per ``(symbol, window)``.
+
+    The model for a frame is fitted on the last ``window`` rows dated before
+    a cutoff that moves forward every ``refit_every`` business days (frames
+    with fewer rows than that before the cutoff train on their last
+    ``window`` rows). The training rows therefore depend only on the frame,
+    not on which frames were scored before it, and bars appended within a
+    period reuse the cached model: only rows whose scores are not cached yet
+    go through ``decision_function``. A frame whose training rows differ
+    from the cached model's refits and replaces it. At most ``max_models``
+    keys are kept (LRU). Calls with ``symbol=None`` fit a throwaway model and
+    cache nothing.
+    """
+
+    def __init__(self, window=504, contamination=0.05, n_estimators=100,
+                 max_models=64, random_state=0, refit_every=21):
+        self.window = window
+        self.contamination = contamination
+        self.n_estimators = n_estimators
+        self.max_models = max_models
+        self.random_state = random_state
+        self.refit_every = refit_every
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _training_rows(self, index):
+        """Row range ``(lo, hi)`` of ``index`` the model is fitted on."""
+        if not len(index):
+            return 0, 0
+        days = np.busday_count(np.datetime64("1970-01-01", "D"),
+                               pd.DatetimeIndex(index).values.astype("datetime64[D]"))
+        period = days // self.refit_every
+        hi = int(np.searchsorted(period, period[-1]))
+        if hi < self.refit_every:
+            hi = len(index)
+        return max(0, hi - self.window), hi
+
+    def _fit(self, feats):
+        # Imported here so the z-score paths and the package import stay light.
+        from sklearn.ensemble import IsolationForest
+        from sklearn.preprocessing import StandardScaler
+
+        scaler = StandardScaler().fit(feats)
+        model = IsolationForest(n_estimators=self.n_estimators, contamination=self.contamination,
+                                random_state=self.random_state)
+        model.fit(scaler.transform(feats))
+        return {"scaler": scaler, "model": model, "scores": pd.Series(dtype="float64")}
+
+    def score(self, symbol, df):
+        feats = features(df)
+        lo, hi = self._training_rows(df.index)
+        if symbol is None:
+            entry = self._fit(feats[lo:hi])
+            scores = pd.Series(-entry["model"].decision_function(entry["scaler"].transform(feats)),
+                               index=df.index)
+            return pd.DataFrame({"score": scores, "anomaly": scores > 0})
+        key = (symbol, self.window)
+        trained = (df.index[lo], df.index[hi - 1], hi - lo)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None and entry["trained"] == trained:
+                self._models.move_to_end(key)
+            else:
+                entry = None
+        telemetry.count("cache_requests", cache="isolation_forest", result="miss" if entry is None else "hit")
+        if entry is None:
+            entry = self._fit(feats[lo:hi])
+            entry["trained"] = trained
+            with self._lock:
+                self._models[key] = entry
+                self._models.move_to_end(key)
+                while len(self._models) > self.max_models:
+                    self._models.popitem(last=False)
+
+        cached = entry["scores"].reindex(df.index)
+        cached.iloc[:FEATURE_WARMUP] = np.nan
+        new = cached.isna().to_numpy()
+        if new.any():
+            scaled = entry["scaler"].transform(feats[new])
+            fresh = pd.Series(-entry["model"].decision_function(scaled), index=df.index[new])
+            cached[new] = fresh.to_numpy()
+            # Only rows with complete features are the same whichever frame they came from.
+            keep = fresh[np.flatnonzero(new) >= FEATURE_WARMUP]
+            entry["scores"] = pd.concat([entry["scores"], keep]).groupby(level=0).last()
+        return pd.DataFrame({"score": cached, "anomaly": cached > 0})
+
+
+@telemetry.timed("anomalies")
+def detect(df, method="rolling", window=20, threshold=2.0, symbol=None, detector=None):
+    """Score one symbol's OHLCV frame; returns ``score`` and ``anomaly`` columns."""
+    if method == "rolling":
+        score = rolling_zscore(df["Close"], window)
+    elif method == "ewm":
+        score = ewm_zscore(df["Close"], window)
+    elif method == "isolation_forest":
+        detector = detector or _default_detector
+        return detector.score(symbol, df)
+    else:
+        raise ValueError(f"Unknown anomaly method: {method!r}")
+    return pd.DataFrame({"score": score, "anomaly": score.abs() > threshold})
+
+
+_default_detector = IsolationForestDetector()
+
+
+def _score_chunk(method, chunk, params):
+    detector = IsolationForestDetector(**params.pop("detector", {}))
+    return {symbol: detect(df, method, symbol=symbol, detector=detector, **params)
+            for symbol, df in chunk}
+
+
+def score_universe(frames, method="rolling", processes=None, chunk_size=32, **params):
+    """Score ``{symbol: ohlcv frame}`` across a process pool.
+
+    ``params`` are passed to ``detect``; a ``detector`` dict, if given, holds
+    ``IsolationForestDetector`` keyword arguments. With ``processes=1`` the
+    work runs inline.
+    """
+    items = list(frames.items())
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(chunks) <= 1:
+        results = [_score_chunk(method, chunk, dict(params)) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = pool.map(_score_chunk, [method] * len(chunks), chunks,
+                               [dict(params) for _ in chunks])
+    out = {}
+    for result in results:
+        out.update(result)
+    return out
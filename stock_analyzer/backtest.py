@@ -0,0 +1,179 @@
+"""Vectorized backtests of the Stock Indicators page's signal rules.
+
+Each rule turns a dates x symbols close matrix into a position matrix
+(1 long, 0 flat, -1 short) with no per-bar Python loop:
+
+* ``rsi`` - go long when RSI drops below ``lower``, exit when it rises above
+  ``upper`` (the Oversold / Overbought messages),
+* ``macd`` - long while MACD is above its signal line, short below it when
+  ``allow_short`` (Bullish / Bearish Signal),
+* ``ma`` - long when the close is above both moving averages, short (or flat)
+  when below both, unchanged in the mixed zone (Bullish / Bearish Trend).
+
+Positions are applied from the next bar, so a signal never trades on the
+close that produced it. ``sweep`` runs a parameter grid across a process pool,
+sharing indicator arrays between parameter combinations in each worker.
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .indicators import compute_indicators, ema, rolling_mean
+
+METRICS = ["total_return", "sharpe", "max_drawdown", "turnover", "exposure"]
+
+
+def _ffill(values):
+    """Forward-fill NaNs along axis 0; leading NaNs become 0 (flat)."""
+    rows = np.arange(len(values)).reshape(-1, *([1] * (values.ndim - 1)))
+    last = np.maximum.accumulate(np.where(np.isnan(values), 0, rows), axis=0)
+    filled = np.take_along_axis(values, np.broadcast_to(last, values.shape), axis=0)
+    return np.nan_to_num(filled, nan=0.0)
+
+
+def _memo(cache, key, fn):
+    if cache is None:
+        return fn()
+    if key not in cache:
+        cache[key] = fn()
+    return cache[key]
+
+
+def rsi_positions(close, window=14, lower=30, upper=70, cache=None):
+    rsi = _memo(cache, ("rsi", window),
+                lambda: compute_indicators(close, [f"rsi:{window}"])[f"rsi{window}"])
+    events = np.where(rsi < lower, 1.0, np.where(rsi > upper, 0.0, np.nan))
+    return _ffill(events)
+
+
+def macd_positions(close, fast=12, slow=26, signal=9, allow_short=False, cache=None):
+    macd = _memo(cache, ("macd", fast, slow),
+                 lambda: _memo(cache, ("ema", fast), lambda: ema(close, fast))
+                 - _memo(cache, ("ema", slow), lambda: ema(close, slow)))
+    line = _memo(cache, ("macd_signal", fast, slow, signal), lambda: ema(macd, signal))
+    positions = np.where(macd > line, 1.0, -1.0 if allow_short else 0.0)
+    return np.where(np.isnan(line), 0.0, positions)
+
+
+def ma_positions(close, fast=20, slow=50, allow_short=False, cache=None):
+    ma_fast = _memo(cache, ("ma", fast), lambda: rolling_mean(close, fast))
+    ma_slow = _memo(cache, ("ma", slow), lambda: rolling_mean(close, slow))
+    above = (close > ma_fast) & (close > ma_slow)
+    below = (close < ma_fast) & (close < ma_slow)
+    events = np.where(above, 1.0, np.where(below, -1.0 if allow_short else 0.0, np.nan))
+    return _ffill(events)
+
+
+RULES = {"rsi": rsi_positions, "macd": macd_positions, "ma": ma_positions}
+
+
+def asset_returns(close):
+    """Simple per-bar returns with the first bar and any gaps set to 0."""
+    close = np.asarray(close, dtype="float64")
+    ret = np.zeros_like(close)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret[1:] = close[1:] / close[:-1] - 1
+    return np.nan_to_num(ret, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def strategy_returns(close, positions, cost=0.0, ret=None):
+    """Per-bar strategy returns: yesterday's position times today's return, minus costs.
+
+    ``cost`` is charged as a fraction of traded notional per unit of
+    position change. ``ret`` may pass precomputed ``asset_returns(close)``.
+    """
+    if ret is None:
+        ret = asset_returns(close)
+    held = np.zeros_like(positions)
+    held[1:] = positions[:-1]
+    trades = np.abs(np.diff(held, axis=0, prepend=0.0))
+    return held * ret - cost * trades, held, trades
+
+
+def metrics(close, positions, cost=0.0, periods=252, ret=None):
+    """Total return, annualized Sharpe, max drawdown, annual turnover and exposure per column."""
+    returns, held, trades = strategy_returns(close, positions, cost, ret)
+    equity = np.cumprod(1 + returns, axis=0)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+    std = returns.std(axis=0, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, returns.mean(axis=0) / std * np.sqrt(periods), np.nan)
+    years = len(returns) / periods
+    return {
+        "total_return": equity[-1] - 1,
+        "sharpe": sharpe,
+        "max_drawdown": drawdown.min(axis=0),
+        "turnover": trades.sum(axis=0) / years,
+        "exposure": (held != 0).mean(axis=0),
+    }
+
+
+def run(close, rule, cost=0.0, periods=252, **params):
+    """Backtest ``rule`` with ``params`` on a close DataFrame; one metrics row per symbol."""
+    values = np.asarray(close, dtype="float64").reshape(len(close), -1)
+    positions = RULES[rule](values, **params)
+    columns = close.columns if isinstance(close, pd.DataFrame) else [getattr(close, "name", 0)]
+    return pd.DataFrame(metrics(values, positions, cost, periods), index=columns)[METRICS]
+
+
+def equity_curve(close, rule, cost=0.0, **params):
+    """Cumulative growth of 1 unit for ``rule`` on a single close Series."""
+    values = close.to_numpy(dtype="float64").reshape(-1, 1)
+    returns, _, _ = strategy_returns(values, RULES[rule](values, **params), cost)
+    return pd.Series(np.cumprod(1 + returns[:, 0]), index=close.index, name=rule)
+
+
+_worker_close = None
+
+
+def _init_worker(close):
+    global _worker_close
+    _worker_close = close
+
+
+def _run_combos(rule, combos, cost, periods):
+    cache = {}
+    ret = asset_returns(_worker_close)
+    rows = []
+    for params in combos:
+        positions = RULES[rule](_worker_close, cache=cache, **params)
+        rows.append((params, metrics(_worker_close, positions, cost, periods, ret)))
+    return rows
+
+
+def sweep(close, rule, grid, cost=0.0, periods=252, processes=None, chunk_size=64):
+    """Backtest every combination in ``grid`` (``{param: [values]}``) on every symbol.
+
+    Returns a long frame with one row per (combination, symbol): the
+    parameter columns, ``symbol`` and the ``METRICS`` columns.
+    """
+    values = np.ascontiguousarray(np.asarray(close, dtype="float64").reshape(len(close), -1))
+    symbols = list(close.columns) if isinstance(close, pd.DataFrame) else list(range(values.shape[1]))
+    names = list(grid)
+    combos = [dict(zip(names, combo)) for combo in itertools.product(*grid.values())]
+    # Keep combinations that share an indicator window in the same chunk so
+    # the worker cache reuses it.
+    combos.sort(key=lambda c: tuple(c[n] for n in names))
+    chunks = [combos[i:i + chunk_size] for i in range(0, len(combos), chunk_size)]
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(chunks) <= 1:
+        _init_worker(values)
+        results = [_run_combos(rule, chunk, cost, periods) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(values,)) as pool:
+            results = list(pool.map(_run_combos, [rule] * len(chunks), chunks,
+                                    [cost] * len(chunks), [periods] * len(chunks)))
+
+    rows = [(params, stats) for chunk in results for params, stats in chunk]
+    n = len(symbols)
+    out = {name: np.repeat([params[name] for params, _ in rows], n) for name in names}
+    out["symbol"] = np.tile(symbols, len(rows))
+    for metric in METRICS:
+        out[metric] = np.concatenate([stats[metric] for _, stats in rows]) if rows else []
+    return pd.DataFrame(out)
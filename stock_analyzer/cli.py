@@ -0,0 +1,128 @@
+"""Command-line entry point: ``python -m stock_analyzer analyze ...``.
+
+    python -m stock_analyzer analyze --symbols-file universe.txt \
+        --indicators rsi,macd --anomalies --out results.parquet
+
+Results are written symbol by symbol as workers finish, so memory stays flat
+regardless of universe size. ``.parquet`` output needs ``pyarrow``; any other
+extension is written as CSV.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+import pandas as pd
+
+from .anomalies import METHODS
+from .indicators import parse_spec
+from .pipeline import analyze_universe
+from .price_store import DEFAULT_ROOT
+
+
+class CSVWriter:
+    def __init__(self, path):
+        self.path = path
+        self._header = True
+
+    def write(self, frame):
+        frame.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+        self._header = False
+
+    def close(self):
+        pass
+
+
+class ParquetWriter:
+    """Appends each frame as a row group of one Parquet file."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow: pip install pyarrow")
+        self._pa, self._pq = pa, pq
+        self.path = path
+        self._writer = None
+
+    def write(self, frame):
+        if self._writer is None:
+            table = self._pa.Table.from_pandas(frame, preserve_index=False)
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = self._pa.Table.from_pandas(frame, schema=self._writer.schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_writer(path):
+    return ParquetWriter(path) if path.endswith(".parquet") else CSVWriter(path)
+
+
+def read_symbols(path):
+    with open(path) as fh:
+        lines = (line.split("#", 1)[0].strip() for line in fh)
+        return list(dict.fromkeys(line.upper() for line in lines if line))
+
+
+def indicator_specs(text):
+    """Comma-separated indicator specs, each checked before any symbol is fetched."""
+    specs = [s.strip() for s in text.split(",") if s.strip()]
+    for spec in specs:
+        try:
+            parse_spec(spec)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+    return specs
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="stock_analyzer")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyze = commands.add_parser("analyze", help="Compute indicators and anomalies for a universe")
+    source = analyze.add_mutually_exclusive_group(required=True)
+    source.add_argument("--symbols-file", help="One symbol per line; '#' starts a comment")
+    source.add_argument("--symbols", help="Comma-separated symbols")
+    analyze.add_argument("--start", default="2020-01-01")
+    analyze.add_argument("--end", default=str(pd.Timestamp("today").date()))
+    analyze.add_argument("--indicators", default="", type=indicator_specs,
+                         help="Comma-separated specs, e.g. rsi,macd,bb:20:2,ma:50")
+    analyze.add_argument("--anomalies", nargs="?", const="rolling", choices=METHODS,
+                         help="Add anomaly columns (default method: rolling)")
+    analyze.add_argument("--window", type=int, default=20, help="Anomaly z-score window")
+    analyze.add_argument("--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    analyze.add_argument("--store", default=DEFAULT_ROOT, help="Price store directory")
+    analyze.add_argument("--provider", default=None,
+                         help="Provider chain, e.g. replay:fixtures,yfinance (default: $STOCK_ANALYZER_PROVIDER or yfinance)")
+    analyze.add_argument("--out", required=True, help="Output .parquet or .csv path")
+    return parser
+
+
+def analyze(args):
+    if args.symbols_file:
+        symbols = read_symbols(args.symbols_file)
+    else:
+        symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    writer = open_writer(args.out)
+    done = 0
+    try:
+        for frame in analyze_universe(symbols, args.start, args.end, args.indicators, args.anomalies,
+                                      args.window, args.processes, args.store, args.provider):
+            writer.write(frame)
+            done += 1
+    finally:
+        writer.close()
+    print(f"Analyzed {done}/{len(symbols)} symbols -> {args.out}", file=sys.stderr)
+    return 0 if done else 1
+
+
+def main(argv=None):
+    logging.basicConfig(level=os.environ.get("LOGLEVEL", "WARNING"), format="%(levelname)s %(message)s")
+    args = build_parser().parse_args(argv)
+    return analyze(args)
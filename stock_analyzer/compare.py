@@ -0,0 +1,157 @@
+"""Cross-sectional analytics over a wide dates x symbols close matrix.
+
+``RollingCorrelation`` keeps the pairwise sums behind a sliding-window
+covariance/correlation matrix. Seeding a window costs a few matrix products,
+and every new bar after that is a handful of rank-1 updates (O(N^2)) instead
+of an O(N^2 * T) recompute. Missing values are handled pairwise: each pair
+only uses the rows where both symbols have a return. ``ComparisonCache``
+keeps one instance per (universe, window) and slides it forward as new bars
+arrive.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+from . import telemetry
+
+
+def log_return_matrix(prices):
+    """Aligned log returns; NaN where either bar is missing."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.log(prices).diff().iloc[1:]
+
+
+def normalized_performance(prices):
+    """Each column divided by its first valid price (1.0 = start of range)."""
+    first = prices.bfill().iloc[0]
+    return prices / first
+
+
+def universe_key(symbols, window):
+    digest = hashlib.sha1(",".join(sorted(symbols)).encode()).hexdigest()[:16]
+    return digest, window
+
+
+class RollingCorrelation:
+    """Sliding-window pairwise covariance and correlation of return columns."""
+
+    def __init__(self, symbols, window=60):
+        self.symbols = list(symbols)
+        self.window = window
+        n = len(self.symbols)
+        self.rows = deque()
+        self.last_date = None
+        self._since_resum = 0
+        self.count = np.zeros((n, n))
+        self.sum_x = np.zeros((n, n))   # sum of x_i over rows where j is valid
+        self.sum_xx = np.zeros((n, n))  # sum of x_i * x_j
+        self.sum_sq = np.zeros((n, n))  # sum of x_i^2 over rows where j is valid
+
+    def _resum(self):
+        block = np.array(self.rows) if self.rows else np.zeros((0, len(self.symbols)))
+        valid = (~np.isnan(block)).astype("float64")
+        x = np.nan_to_num(block)
+        self.count = valid.T @ valid
+        self.sum_x = x.T @ valid
+        self.sum_xx = x.T @ x
+        self.sum_sq = (x * x).T @ valid
+        self._since_resum = 0
+
+    def _apply(self, row, sign):
+        valid = (~np.isnan(row)).astype("float64")
+        x = np.nan_to_num(row)
+        self.count += sign * np.outer(valid, valid)
+        self.sum_x += sign * np.outer(x, valid)
+        self.sum_xx += sign * np.outer(x, x)
+        self.sum_sq += sign * np.outer(x * x, valid)
+
+    def seed(self, returns):
+        """Reset to the last ``window`` rows of ``returns`` (DataFrame with these columns)."""
+        tail = returns[self.symbols].iloc[-self.window:]
+        self.rows = deque(tail.to_numpy(dtype="float64"))
+        self.last_date = tail.index[-1] if len(tail) else None
+        self._resum()
+        return self
+
+    def update(self, returns):
+        """Slide over rows of ``returns`` dated after ``last_date``."""
+        new = returns if self.last_date is None else returns[returns.index > self.last_date]
+        if len(new) >= self.window:
+            return self.seed(new)
+        for date, row in zip(new.index, new[self.symbols].to_numpy(dtype="float64")):
+            self.rows.append(row)
+            self._apply(row, 1.0)
+            if len(self.rows) > self.window:
+                self._apply(self.rows.popleft(), -1.0)
+            self.last_date = date
+            self._since_resum += 1
+        # Rebuild from the window now and then so add/subtract rounding
+        # cannot accumulate.
+        if self._since_resum >= self.window:
+            self._resum()
+        return self
+
+    def cov(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_i = self.sum_x / self.count
+            cov = (self.sum_xx - mean_i * self.sum_x.T) / (self.count - 1)
+        cov[self.count < 2] = np.nan
+        return pd.DataFrame(cov, index=self.symbols, columns=self.symbols)
+
+    def corr(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n = self.count
+            cross = self.sum_xx - self.sum_x * self.sum_x.T / n
+            var_i = self.sum_sq - self.sum_x ** 2 / n
+            corr = cross / np.sqrt(var_i * var_i.T)
+        corr[n < 2] = np.nan
+        return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=self.symbols, columns=self.symbols)
+
+
+def beta(cov, benchmark):
+    """Each symbol's beta to ``benchmark`` from a covariance matrix."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return cov[benchmark] / cov.loc[benchmark, benchmark]
+
+
+class ComparisonCache:
+    """LRU of ``RollingCorrelation`` keyed by (universe hash, window).
+
+    ``get`` returns ``(cov, corr)`` snapshots so callers never read an engine
+    that another session is sliding forward. A range shorter than ``window``
+    is computed on its own and not cached, so its result never includes rows
+    from before its start.
+    """
+
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, prices, window=60):
+        returns = log_return_matrix(prices)
+        if len(returns) < window:
+            telemetry.count("cache_requests", cache="comparison", result="miss")
+            engine = RollingCorrelation(returns.columns, window).seed(returns)
+            return engine.cov(), engine.corr()
+        key = universe_key(returns.columns, window)
+        with self._lock:
+            engine = self._entries.get(key)
+            if (engine is None or len(engine.rows) < window or engine.last_date is None
+                    or engine.last_date not in returns.index):
+                telemetry.count("cache_requests", cache="comparison", result="miss")
+                engine = RollingCorrelation(returns.columns, window).seed(returns)
+            elif engine.last_date != returns.index[-1]:
+                telemetry.count("cache_requests", cache="comparison", result="update")
+                engine.update(returns)
+            else:
+                telemetry.count("cache_requests", cache="comparison", result="hit")
+            self._entries[key] = engine
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return engine.cov(), engine.corr()
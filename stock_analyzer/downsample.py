@@ -0,0 +1,117 @@
+"""Reduce long price series to roughly one point per chart pixel.
+
+``lttb`` picks visually representative points for line charts
+(Largest-Triangle-Three-Buckets), ``minmax_indices`` keeps each bucket's low
+and high, and ``ohlc_buckets`` aggregates bars into wider OHLCV bars without
+losing any high or low. ``downsample`` always keeps the first and last rows,
+the global extremes and any rows flagged in ``keep`` (e.g. anomalies).
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_WIDTH = 1600
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype("int64").astype("float64")
+    return x.astype("float64")
+
+
+def lttb(x, y, n_out):
+    """Return the indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets.
+
+    NaN values in ``y`` are never selected.
+    """
+    y = np.asarray(y, dtype="float64")
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    if n_out >= n or n_out < 3:
+        return valid
+    xs, ys = _as_float(x)[valid], y[valid]
+
+    # n_out - 2 interior buckets between the fixed first and last points.
+    edges = np.linspace(1, n - 1, n_out - 1).astype("int64")
+    starts = edges[:-1]
+    counts = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(xs[:-1], starts) / counts, xs[-1])
+    mean_y = np.append(np.add.reduceat(ys[:-1], starts) / counts, ys[-1])
+
+    selected = np.empty(n_out, dtype="int64")
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((xs[a] - mean_x[i + 1]) * (ys[lo:hi] - ys[a])
+                      - (xs[a] - xs[lo:hi]) * (mean_y[i + 1] - ys[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return valid[selected]
+
+
+def minmax_indices(y, n_buckets):
+    """Indices of the minimum and maximum of each of ``n_buckets`` equal-size buckets."""
+    y = np.asarray(y, dtype="float64")
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.flatnonzero(~np.isnan(y))
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    grid = padded.reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    lows = offsets + np.argmin(np.where(np.isnan(grid), np.inf, grid), axis=1)
+    highs = offsets + np.argmax(np.where(np.isnan(grid), -np.inf, grid), axis=1)
+    idx = np.unique(np.concatenate([lows, highs]))
+    idx = idx[idx < n]
+    return idx[~np.isnan(y[idx])]
+
+
+def downsample(df, y="Close", width=DEFAULT_WIDTH, keep=None, method="lttb"):
+    """Return the rows of ``df`` worth plotting as a ``width``-pixel line of column ``y``.
+
+    ``keep`` is a boolean mask or array of row positions that must survive.
+    ``df`` is expected to have a DatetimeIndex or be plotted against row order.
+    """
+    values = df[y].to_numpy(dtype="float64")
+    if len(values) <= 2 * width:
+        return df
+    if method == "lttb":
+        x = df.index.values if isinstance(df.index, pd.DatetimeIndex) else np.arange(len(df))
+        idx = lttb(x, values, width)
+    elif method == "minmax":
+        idx = minmax_indices(values, width)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method!r}")
+
+    extras = [idx, [0, len(values) - 1]]
+    if not np.isnan(values).all():
+        extras.append([np.nanargmin(values), np.nanargmax(values)])
+    if keep is not None:
+        keep = np.asarray(keep)
+        extras.append(np.flatnonzero(keep) if keep.dtype == bool else keep)
+    return df.iloc[np.unique(np.concatenate(extras).astype("int64"))]
+
+
+def ohlc_buckets(df, width=DEFAULT_WIDTH):
+    """Aggregate OHLCV rows into at most ``width`` bars.
+
+    Each bar takes the first open, highest high, lowest low, last close and
+    summed volume of its bucket and is stamped with the bucket's first date.
+    """
+    n = len(df)
+    if n <= width:
+        return df
+    starts = np.linspace(0, n, width, endpoint=False).astype("int64")
+    ends = np.append(starts[1:], n) - 1
+    out = {
+        "Open": df["Open"].to_numpy()[starts],
+        "High": np.fmax.reduceat(df["High"].to_numpy(dtype="float64"), starts),
+        "Low": np.fmin.reduceat(df["Low"].to_numpy(dtype="float64"), starts),
+        "Close": df["Close"].to_numpy()[ends],
+    }
+    if "Volume" in df:
+        out["Volume"] = np.add.reduceat(np.nan_to_num(df["Volume"].to_numpy(dtype="float64")), starts)
+    return pd.DataFrame(out, index=df.index[starts])
@@ -0,0 +1,250 @@
+"""Price forecasts from loaded closes: baselines, an AR ridge model and walk-forward checks.
+
+All methods forecast the ``horizon``-bar cumulative log return and turn it
+into a price with ``last_close * exp(return)``:
+
+* ``drift`` - mean log return over the last ``lookback`` bars times ``horizon``,
+* ``ewma`` - exponentially weighted mean log return times ``horizon``,
+* ``ridge`` - ridge regression of the ``horizon``-bar return on the last
+  ``lags`` one-bar returns.
+
+``RidgeForecaster`` keeps only the running sums the closed-form ridge
+solution needs (the same fit as ``sklearn.linear_model.Ridge`` with an
+unpenalized intercept). New bars are folded in with ``update`` at
+O(lags^2) each instead of a refit, and the sums persist through
+``ModelStore``.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .indicators import ema, rolling_mean
+
+METHODS = ("drift", "ewma", "ridge")
+DEFAULT_MODEL_ROOT = os.environ.get("STOCK_ANALYZER_MODELS", ".forecast_models")
+
+
+def log_returns(close):
+    values = np.asarray(close, dtype="float64")
+    out = np.full(values.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = np.diff(np.log(values), axis=0)
+    return out
+
+
+def drift_forecast(close, horizon=5, lookback=252):
+    """Expected ``horizon``-bar log return at every bar (rows) for every column."""
+    return rolling_mean(log_returns(close).reshape(len(close), -1), lookback) * horizon
+
+
+def ewma_forecast(close, horizon=5, span=63):
+    ret = np.nan_to_num(log_returns(close).reshape(len(close), -1), nan=0.0)
+    return ema(ret, span) * horizon
+
+
+def _design(ret, lags, horizon):
+    """Lagged-return features and forward ``horizon``-bar targets, one row per bar.
+
+    Row ``t`` holds returns ``t-lags+1 .. t`` and the sum of returns
+    ``t+1 .. t+horizon`` (NaN where not yet known).
+    """
+    n = len(ret)
+    feats = np.full((n, lags), np.nan)
+    for k in range(lags):
+        feats[k:, k] = ret[:n - k]
+    csum = np.concatenate([[0.0], np.cumsum(np.nan_to_num(ret))])
+    target = np.full(n, np.nan)
+    target[:n - horizon] = csum[horizon + 1:] - csum[1:n - horizon + 1]
+    return feats, target
+
+
+class RidgeForecaster:
+    """Autoregressive ridge model updated from running sums of its design matrix."""
+
+    def __init__(self, lags=10, horizon=5, alpha=1e-4):
+        self.lags = lags
+        self.horizon = horizon
+        self.alpha = alpha
+        self.n = 0
+        self.sx = np.zeros(lags)
+        self.sxx = np.zeros((lags, lags))
+        self.sy = 0.0
+        self.sxy = np.zeros(lags)
+        # Epoch ns of the last bar whose sample has been added (its target end).
+        self.trained_through = np.iinfo("int64").min
+
+    def _add(self, feats, target):
+        ok = ~(np.isnan(feats).any(axis=1) | np.isnan(target))
+        x, y = feats[ok], target[ok]
+        self.n += len(y)
+        self.sx += x.sum(axis=0)
+        self.sxx += x.T @ x
+        self.sy += y.sum()
+        self.sxy += x.T @ y
+
+    def update(self, close):
+        """Fold in every sample whose target completes after ``trained_through``.
+
+        ``close`` is a Date-indexed Series; calling it again with a longer
+        series only processes the new bars.
+        """
+        dates = close.index.values.astype("datetime64[ns]").astype("int64")
+        start = max(0, np.searchsorted(dates, self.trained_through, side="right") - self.horizon - self.lags)
+        ret = log_returns(close.to_numpy()[start:])
+        feats, target = _design(ret, self.lags, self.horizon)
+        ends = np.full(len(ret), np.iinfo("int64").min)
+        ends[:len(ret) - self.horizon] = dates[start + self.horizon:]
+        new = ends > self.trained_through
+        self._add(feats[new], target[new])
+        if new.any():
+            self.trained_through = int(ends[new].max())
+        return self
+
+    def coefficients(self):
+        if self.n <= self.lags:
+            return np.zeros(self.lags), 0.0
+        cxx = self.sxx - np.outer(self.sx, self.sx) / self.n
+        cxy = self.sxy - self.sx * self.sy / self.n
+        coef = np.linalg.solve(cxx + self.alpha * np.eye(self.lags), cxy)
+        return coef, (self.sy - coef @ self.sx) / self.n
+
+    def predict(self, close):
+        """Expected ``horizon``-bar log return from the latest ``lags`` returns."""
+        ret = log_returns(close.to_numpy()[-(self.lags + 1):])
+        latest = np.nan_to_num(ret[::-1][:self.lags])
+        coef, intercept = self.coefficients()
+        return float(latest @ coef + intercept)
+
+    def state(self):
+        return {"lags": self.lags, "horizon": self.horizon, "alpha": self.alpha, "n": self.n,
+                "sx": self.sx, "sxx": self.sxx, "sy": self.sy, "sxy": self.sxy,
+                "trained_through": self.trained_through}
+
+    @classmethod
+    def from_state(cls, state):
+        model = cls(int(state["lags"]), int(state["horizon"]), float(state["alpha"]))
+        model.n = int(state["n"])
+        model.sx, model.sxx = np.asarray(state["sx"]), np.asarray(state["sxx"])
+        model.sy, model.sxy = float(state["sy"]), np.asarray(state["sxy"])
+        model.trained_through = int(state["trained_through"])
+        return model
+
+
+class ModelStore:
+    """Persists ``RidgeForecaster`` state per (symbol, horizon, lags) as ``.npz`` files."""
+
+    def __init__(self, root=DEFAULT_MODEL_ROOT):
+        self.root = root
+
+    def _path(self, symbol, horizon, lags):
+        return os.path.join(self.root, f"{symbol.upper()}_h{horizon}_l{lags}.npz")
+
+    def load(self, symbol, horizon, lags):
+        try:
+            with np.load(self._path(symbol, horizon, lags)) as data:
+                return RidgeForecaster.from_state(dict(data))
+        except (OSError, KeyError, ValueError):
+            return RidgeForecaster(lags, horizon)
+
+    def save(self, symbol, model):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(symbol, model.horizon, model.lags)
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **model.state())
+        os.replace(tmp, path)
+
+    def updated(self, symbol, close, horizon=5, lags=10):
+        """Load the model for ``symbol``, fold in any new bars and save it back.
+
+        When ``close`` ends before the stored model's ``trained_through`` the
+        stored sums include targets from after its last bar, so a model fitted
+        on ``close`` alone is returned instead and the stored one is left as is.
+        """
+        model = self.load(symbol, horizon, lags)
+        if len(close) and model.trained_through > pd.Timestamp(close.index[-1]).value:
+            return RidgeForecaster(lags, horizon).update(close)
+        before = model.trained_through
+        model.update(close)
+        if model.trained_through != before:
+            self.save(symbol, model)
+        return model
+
+
+def forecast(close, horizon=5, method="drift", model=None, lookback=252, span=63, lags=10):
+    """Forecast one Date-indexed close Series; returns expected log return and price."""
+    if method == "drift":
+        expected = drift_forecast(close, horizon, lookback)[-1, 0]
+    elif method == "ewma":
+        expected = ewma_forecast(close, horizon, span)[-1, 0]
+    elif method == "ridge":
+        model = model or RidgeForecaster(lags, horizon).update(close)
+        expected = model.predict(close)
+    else:
+        raise ValueError(f"Unknown forecast method: {method!r}")
+    last = float(close.iloc[-1])
+    return {"last_close": last, "expected_return": float(expected),
+            "forecast": last * float(np.exp(expected))}
+
+
+def walk_forward(close, horizon=5, min_train=252, step=1, lookback=252, span=63, lags=10):
+    """Score every method on rolling forecast origins using only data up to each origin.
+
+    Returns a frame indexed by origin date with the realized ``horizon``-bar
+    log return and each method's forecast of it.
+    """
+    ret = log_returns(close)
+    _, actual = _design(ret, lags, horizon)
+    out = pd.DataFrame({
+        "actual": actual,
+        "drift": drift_forecast(close, horizon, lookback)[:, 0],
+        "ewma": ewma_forecast(close, horizon, span)[:, 0],
+        "ridge": np.nan,
+    }, index=close.index)
+
+    model = RidgeForecaster(lags, horizon)
+    feats, _ = _design(ret, lags, horizon)
+    origins = range(min_train, len(close) - horizon, step)
+    ridge = out["ridge"].to_numpy().copy()
+    for t in origins:
+        # Only samples whose targets are known at the origin may be used.
+        model.update(close.iloc[:t + 1])
+        coef, intercept = model.coefficients()
+        ridge[t] = np.nan_to_num(feats[t]) @ coef + intercept
+    out["ridge"] = ridge
+    return out.iloc[list(origins)]
+
+
+def evaluate(walk):
+    """MAE and directional hit rate of each forecast column against ``actual``."""
+    rows = {}
+    for method in METHODS:
+        valid = walk[[method, "actual"]].dropna()
+        err = (valid[method] - valid["actual"]).abs()
+        rows[method] = {"mae": err.mean(),
+                        "hit_rate": (np.sign(valid[method]) == np.sign(valid["actual"])).mean(),
+                        "origins": len(valid)}
+    return pd.DataFrame(rows).T
+
+
+def _forecast_one(symbol, close, horizon, method, model_root):
+    model = None
+    if method == "ridge" and model_root:
+        model = ModelStore(model_root).updated(symbol, close, horizon)
+    return symbol, forecast(close, horizon, method, model=model)
+
+
+def forecast_universe(closes, horizon=5, method="drift", processes=None, model_root=DEFAULT_MODEL_ROOT):
+    """Forecast ``{symbol: close Series}`` across a process pool; one row per symbol."""
+    items = list(closes.items())
+    processes = processes or os.cpu_count() or 1
+    args = ([s for s, _ in items], [c for _, c in items], [horizon] * len(items),
+            [method] * len(items), [model_root] * len(items))
+    if processes == 1:
+        results = list(map(_forecast_one, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_forecast_one, *args, chunksize=max(1, len(items) // (4 * processes))))
+    return pd.DataFrame({symbol: row for symbol, row in results}).T
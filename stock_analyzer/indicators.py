@@ -0,0 +1,182 @@
+"""Vectorized technical indicators over a dates x symbols close matrix.
+
+Indicators are requested as spec strings (``"rsi"``, ``"rsi:21"``,
+``"macd"``, ``"macd:5:35:5"``, ``"bb:20:2"``, ``"ema:20"``, ``"ma:50"``) and
+evaluated together so that intermediates such as the price difference,
+rolling means and EMAs are computed once and shared between specs. Inputs are
+never modified.
+
+Result names: ``rsi14``, ``ema20``, ``ma50``, ``bb20_upper``/``bb20_lower``
+and ``macd``/``macd_signal`` (suffixed with ``_fast_slow_signal`` when the
+MACD parameters are not the default 12/26/9).
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import telemetry
+
+DEFAULTS = {
+    "rsi": (14,),
+    "macd": (12, 26, 9),
+    "bb": (20, 2.0),
+    "ema": (20,),
+    "ma": (20,),
+}
+
+
+def parse_spec(spec):
+    """Split ``"name:arg:arg"`` into ``(name, args)``, filling in default arguments."""
+    name, *raw = spec.strip().lower().split(":")
+    if name not in DEFAULTS:
+        raise ValueError(f"Unknown indicator: {spec!r}")
+    defaults = DEFAULTS[name]
+    if len(raw) > len(defaults):
+        raise ValueError(f"Too many arguments for {name}: {spec!r}")
+    args = tuple(type(default)(value) for value, default in zip(raw, defaults))
+    return name, args + defaults[len(args):]
+
+
+class _Context:
+    """Memoizes shared intermediates for one evaluation."""
+
+    def __init__(self, close):
+        self.close = close
+        self._cache = {}
+
+    def _memo(self, key, fn):
+        if key not in self._cache:
+            self._cache[key] = fn()
+        return self._cache[key]
+
+    def diff(self):
+        def fn():
+            out = np.empty_like(self.close)
+            out[0] = np.nan
+            np.subtract(self.close[1:], self.close[:-1], out=out[1:])
+            return out
+        return self._memo(("diff",), fn)
+
+    def rolling_mean(self, values_key, window):
+        return self._memo(("mean", values_key, window),
+                          lambda: rolling_mean(self._values(values_key), window))
+
+    def rolling_std(self, window):
+        return self._memo(("std", window), lambda: rolling_std(self.close, window))
+
+    def ema(self, values_key, span):
+        return self._memo(("ema", values_key, span), lambda: ema(self._values(values_key), span))
+
+    def _values(self, key):
+        if key == "close":
+            return self.close
+        if key == "gain":
+            return self._memo(("gain",), lambda: np.where(self.diff() > 0, self.diff(), 0.0))
+        if key == "loss":
+            return self._memo(("loss",), lambda: np.where(self.diff() < 0, -self.diff(), 0.0))
+        return self._cache[key]
+
+
+def _window_sums(values, window):
+    """Per-window sums and non-NaN counts along axis 0, via cumulative sums."""
+    valid = ~np.isnan(values)
+    csum = np.cumsum(np.where(valid, values, 0.0), axis=0)
+    count = np.cumsum(valid, axis=0)
+    sums = csum[window - 1:].copy()
+    sums[1:] -= csum[:-window]
+    counts = count[window - 1:].copy()
+    counts[1:] -= count[:-window]
+    return sums, counts
+
+
+def rolling_mean(values, window):
+    """Trailing mean over ``window`` rows; NaN until the window is full or if it holds a NaN."""
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        sums, counts = _window_sums(values, window)
+        out[window - 1:] = np.where(counts == window, sums / window, np.nan)
+    return out
+
+
+def rolling_std(values, window):
+    """Trailing sample standard deviation (``ddof=1``), matching ``pandas.rolling().std()``."""
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        # Center each column first so the running sum of squares does not
+        # lose precision to the price level.
+        with np.errstate(all="ignore"):
+            centered = values - np.nanmean(values, axis=0)
+        sums, counts = _window_sums(centered, window)
+        squares, _ = _window_sums(centered * centered, window)
+        var = np.maximum(squares - sums * sums / window, 0.0) / (window - 1)
+        out[window - 1:] = np.where(counts == window, np.sqrt(var), np.nan)
+    return out
+
+
+def ema(values, span):
+    """``adjust=False`` exponential mean along axis 0, vectorized across columns.
+
+    Same as ``Series.ewm(span=span, adjust=False).mean()``: each column starts
+    at its first non-NaN value and NaN rows carry the previous value forward,
+    but still age it (``ignore_na=False``), so the first bar after a gap gets
+    more weight.
+    """
+    values = np.asarray(values, dtype="float64")
+    table = values[:, None] if values.ndim == 1 else values
+    out = pd.DataFrame(table).ewm(span=span, adjust=False).mean().to_numpy()
+    return out.reshape(values.shape)
+
+
+def _evaluate(ctx, name, args):
+    if name == "rsi":
+        (window,) = args
+        gain = ctx.rolling_mean("gain", window)
+        loss = ctx.rolling_mean("loss", window)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - (100 / (1 + gain / loss))
+        return {f"rsi{window}": rsi}
+    if name == "ema":
+        (span,) = args
+        return {f"ema{span}": ctx.ema("close", span)}
+    if name == "ma":
+        (window,) = args
+        return {f"ma{window}": ctx.rolling_mean("close", window)}
+    if name == "bb":
+        window, num_std = args
+        mean = ctx.rolling_mean("close", window)
+        width = ctx.rolling_std(window) * num_std
+        return {f"bb{window}_upper": mean + width, f"bb{window}_lower": mean - width}
+    if name == "macd":
+        fast, slow, signal = args
+        suffix = "" if args == DEFAULTS["macd"] else f"_{fast}_{slow}_{signal}"
+        key = ("macd", fast, slow)
+        if key not in ctx._cache:
+            ctx._cache[key] = ctx.ema("close", fast) - ctx.ema("close", slow)
+        return {f"macd{suffix}": ctx._cache[key], f"macd_signal{suffix}": ctx.ema(key, signal)}
+    raise ValueError(f"Unknown indicator: {name!r}")
+
+
+@telemetry.timed("indicators")
+def compute_indicators(close, specs):
+    """Evaluate ``specs`` over ``close`` in one pass and return ``{name: result}``.
+
+    ``close`` may be a 1-D array or Series (one symbol) or a 2-D array or
+    DataFrame (dates x symbols). Results have the same shape and, for pandas
+    inputs, the same index and columns.
+    """
+    values = np.asarray(close, dtype="float64")
+    one_d = values.ndim == 1
+    ctx = _Context(values.reshape(len(values), -1))
+    results = {}
+    for spec in specs:
+        results.update(_evaluate(ctx, *parse_spec(spec)))
+
+    def wrap(arr):
+        if one_d:
+            arr = arr[:, 0]
+            return pd.Series(arr, index=close.index) if isinstance(close, pd.Series) else arr
+        if isinstance(close, pd.DataFrame):
+            return pd.DataFrame(arr, index=close.index, columns=close.columns)
+        return arr
+
+    return {name: wrap(arr) for name, arr in results.items()}
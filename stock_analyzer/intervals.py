@@ -0,0 +1,114 @@
+"""Bar intervals and vectorized OHLCV resampling between them.
+
+Only one resolution per symbol is stored for intraday data (``BASE`` by
+default) and one for daily data; every coarser interval is built from it
+locally. Bars are grouped into fixed, epoch-anchored buckets (minutes and
+hours on the clock, days at midnight, weeks starting Monday), so bucket
+boundaries are a single vectorized pass over the int64 date column and
+``resample`` is a handful of ``reduceat`` calls with no pandas groupby.
+"""
+
+import os
+
+import numpy as np
+
+MINUTE = 60 * 10**9
+DAY = 24 * 60 * MINUTE
+
+# Width of each interval in nanoseconds; "1wk" is special-cased to Mondays.
+INTERVALS = {
+    "1m": MINUTE,
+    "2m": 2 * MINUTE,
+    "5m": 5 * MINUTE,
+    "15m": 15 * MINUTE,
+    "30m": 30 * MINUTE,
+    "1h": 60 * MINUTE,
+    "1d": DAY,
+    "1wk": 7 * DAY,
+}
+BASE = os.environ.get("STOCK_ANALYZER_BASE_INTERVAL", "5m")
+
+# How far back Yahoo serves each intraday resolution.
+MAX_LOOKBACK_DAYS = {"1m": 30, "2m": 60, "5m": 60, "15m": 60, "30m": 60, "1h": 730}
+
+
+def check(interval):
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown interval: {interval!r} (expected one of {', '.join(INTERVALS)})")
+    return interval
+
+
+def is_intraday(interval):
+    return INTERVALS[check(interval)] < DAY
+
+
+def base_interval(interval, base=BASE):
+    """The stored resolution ``interval`` is built from.
+
+    Daily and weekly bars come from the daily partition. Intraday intervals
+    that are a multiple of ``base`` come from ``base``; finer ones are
+    stored as their own partition.
+    """
+    if not is_intraday(interval):
+        return "1d"
+    if INTERVALS[interval] % INTERVALS[check(base)] == 0:
+        return base
+    return interval
+
+
+def max_lookback_days(interval, base=BASE):
+    """How far back ``interval`` bars can be fetched, or None when there is no limit.
+
+    The provider is asked for the stored resolution (``base_interval``), so
+    its limit applies too: 1h built from 5m bars only reaches back as far as
+    5m bars do.
+    """
+    limits = [MAX_LOOKBACK_DAYS[i] for i in (check(interval), base_interval(interval, base))
+              if i in MAX_LOOKBACK_DAYS]
+    return min(limits) if limits else None
+
+
+def bucket_ids(dates, interval):
+    """Bucket number of every epoch-ns date; equal ids share a bar."""
+    dates = np.asarray(dates, dtype="int64")
+    if interval == "1wk":
+        # 1970-01-01 was a Thursday; shift so buckets start on Monday.
+        return (dates // DAY + 3) // 7
+    return dates // INTERVALS[check(interval)]
+
+
+def bucket_start(ids, interval):
+    """Epoch-ns timestamp each bucket is labelled with."""
+    if interval == "1wk":
+        return (ids * 7 - 3) * DAY
+    return ids * INTERVALS[interval]
+
+
+def boundaries(dates, interval):
+    """Row offsets where each ``interval`` bar starts in sorted ``dates``."""
+    ids = bucket_ids(dates, interval)
+    if not len(ids):
+        return np.empty(0, dtype="int64"), ids
+    starts = np.flatnonzero(np.diff(ids)) + 1
+    return np.concatenate([[0], starts]), ids
+
+
+def resample(dates, values, interval):
+    """Aggregate sorted ``rows x 5`` OHLCV ``values`` into ``interval`` bars.
+
+    Each bar takes the first open, highest high, lowest low, last close and
+    summed volume of its bucket and is stamped with the bucket start.
+    Returns new ``(dates, values)`` arrays.
+    """
+    starts, ids = boundaries(dates, interval)
+    if not len(starts):
+        return np.empty(0, dtype="int64"), np.empty((0, 5))
+    values = np.asarray(values, dtype="float64")
+    ends = np.append(starts[1:], len(ids)) - 1
+    out = np.empty((len(starts), 5))
+    out[:, 0] = values[starts, 0]
+    out[:, 1] = np.fmax.reduceat(values[:, 1], starts)
+    out[:, 2] = np.fmin.reduceat(values[:, 2], starts)
+    out[:, 3] = values[ends, 3]
+    out[:, 4] = np.add.reduceat(np.nan_to_num(values[:, 4]), starts)
+    return bucket_start(ids[starts], interval), out
@@ -0,0 +1,303 @@
+"""Background refresh of a watchlist with incrementally updated indicators.
+
+A ``Watchlist`` polls a tick source for every watched symbol at a fixed
+cadence on a daemon thread; a symbol stays watched for ``ttl`` seconds after
+the last ``watch`` call that named it, so symbols no open page asks for any
+more drop out of the poll set. Concurrent refreshes of the same symbols (from
+the scheduler and any number of sessions) are coalesced into one source call.
+Each symbol keeps streaming indicator state (see ``streaming``), so a poll
+costs O(1) per new bar, and the results are published as an immutable
+``Snapshot`` that readers take without locking.
+
+The latest bar of each poll may still be forming (today's daily bar), so it
+is applied to a copy of the state; it is committed once a later bar shows up.
+
+Sources implement ``history(symbol)`` (a Date-indexed close Series used to
+seed the state) and ``poll(symbols)`` (``{symbol: close Series}`` of the
+most recent bars). ``StoreSource`` reads through a ``PriceStore``;
+``SimulatedSource`` generates random-walk ticks for tests and demos.
+"""
+
+import copy
+import logging
+import math
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from .streaming import IndicatorSet, RollingStats
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SPECS = ["rsi", "macd", "bb", "ema:20", "ma:50"]
+
+
+class StoreSource:
+    """Ticks read through a ``PriceStore``.
+
+    Polling asks the store for the last few days, so only the bars that are
+    not stored yet (always including today's) are downloaded, and all
+    symbols go out in one batched request when the provider supports it.
+    """
+
+    def __init__(self, store, interval="1d", history_days=400, poll_days=7):
+        self.store = store
+        self.interval = interval
+        self.history_days = history_days
+        self.poll_days = poll_days
+
+    def _range(self, days):
+        today = pd.Timestamp.today().normalize()
+        return today - pd.Timedelta(days=days), today + pd.Timedelta(days=1)
+
+    def history(self, symbol):
+        start, end = self._range(self.history_days)
+        return self.store.get(symbol, start, end, self.interval)["Close"]
+
+    def poll(self, symbols):
+        start, end = self._range(self.poll_days)
+        matrix = self.store.get_matrix(symbols, start, end, "Close", self.interval)
+        return {symbol: matrix[symbol].dropna() for symbol in matrix}
+
+
+class SimulatedSource:
+    """Deterministic random-walk bars; every ``poll`` advances the clock one bar.
+
+    Each poll returns the last ``overlap`` bars, so consumers see repeated
+    bars the way a real provider returns them.
+    """
+
+    def __init__(self, start="2024-01-02 09:30", freq="1min", history=500, vol=0.002,
+                 seed=0, overlap=2):
+        self.freq = pd.Timedelta(freq)
+        self.origin = pd.Timestamp(start)
+        self.history_bars = history
+        self.vol = vol
+        self.seed = seed
+        self.overlap = overlap
+        self.ticks = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _closes(self, symbol, n):
+        rng = np.random.default_rng([self.seed, zlib.crc32(symbol.encode())])
+        steps = rng.normal(0.0, self.vol, n)
+        close = 100 * np.exp(np.cumsum(steps))
+        index = self.origin + self.freq * np.arange(n)
+        return pd.Series(close, index=pd.DatetimeIndex(index, name="Date"), name=symbol)
+
+    def history(self, symbol):
+        return self._closes(symbol, self.history_bars + self.ticks)
+
+    def poll(self, symbols):
+        with self._lock:
+            self.calls += 1
+            self.ticks += 1
+            n = self.history_bars + self.ticks
+        return {symbol: self._closes(symbol, n).iloc[-self.overlap:] for symbol in symbols}
+
+
+class _SymbolState:
+    def __init__(self, specs, window, threshold):
+        self.indicators = IndicatorSet(specs)
+        self.zscore = RollingStats(window)
+        self.threshold = threshold
+        self.committed = None  # date of the last bar folded into the state
+        self.row = None
+
+    def _update(self, indicators, zscore, close):
+        values = indicators.update(close)
+        mean = zscore.update(close)
+        std = zscore.std
+        z = (close - mean) / std if std > 0 else math.nan
+        values["anomaly_z"] = z
+        values["anomaly"] = bool(abs(z) > self.threshold)
+        return values
+
+    def apply(self, closes):
+        """Fold in bars after ``committed``; returns False when nothing changed."""
+        closes = closes.dropna()
+        if self.committed is not None:
+            closes = closes[closes.index > self.committed]
+        if closes.empty:
+            return False
+        for close in closes.iloc[:-1].to_numpy():
+            self._update(self.indicators, self.zscore, float(close))
+        if len(closes) > 1:
+            self.committed = closes.index[-2]
+        last_date, last = closes.index[-1], float(closes.iloc[-1])
+        if self.row is not None and self.row["date"] == last_date and self.row["close"] == last:
+            return False
+        forming = copy.deepcopy((self.indicators, self.zscore))
+        self.row = {"date": last_date, "close": last, **self._update(*forming, last)}
+        return True
+
+
+class Snapshot:
+    """Immutable view of the latest values for every watched symbol."""
+
+    __slots__ = ("version", "updated_at", "rows")
+
+    def __init__(self, version, updated_at, rows):
+        self.version = version
+        self.updated_at = updated_at
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __repr__(self):
+        return f"Snapshot(version={self.version}, symbols={len(self.rows)})"
+
+    def get(self, symbol):
+        return self.rows.get(symbol.upper())
+
+    def frame(self, symbols=None):
+        """One row per symbol, indexed by symbol."""
+        symbols = list(self.rows) if symbols is None else [s.upper() for s in symbols]
+        rows = {s: self.rows[s] for s in symbols if s in self.rows}
+        frame = pd.DataFrame.from_dict(rows, orient="index")
+        frame.index.name = "Symbol"
+        return frame
+
+
+class Watchlist:
+    """Polls ``source`` for the watched symbols every ``every`` seconds once started.
+
+    Callers re-``watch`` the symbols they still show; a symbol not watched for
+    ``ttl`` seconds is dropped together with its state and snapshot row.
+    """
+
+    def __init__(self, source, every=60.0, specs=DEFAULT_SPECS, window=20, threshold=2.0,
+                 ttl=900.0, clock=time.time):
+        self.source = source
+        self.every = every
+        self.ttl = ttl
+        self.specs = list(specs)
+        self.window = window
+        self.threshold = threshold
+        self._clock = clock
+        self._symbols = {}  # symbol -> clock() of the last watch
+        self._states = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._apply_lock = threading.Lock()
+        self._snapshot = Snapshot(0, None, {})
+        self._stop = threading.Event()
+        self._thread = None
+
+    def watch(self, symbols):
+        """Add ``symbols`` or renew their ``ttl``."""
+        now = self._clock()
+        with self._lock:
+            self._symbols.update((s.upper(), now) for s in symbols)
+
+    def unwatch(self, symbols):
+        with self._lock:
+            for symbol in symbols:
+                self._symbols.pop(symbol.upper(), None)
+
+    @property
+    def symbols(self):
+        """Watched symbols whose ``ttl`` has not run out."""
+        now = self._clock()
+        with self._lock:
+            return sorted(s for s, watched in self._symbols.items() if now - watched < self.ttl)
+
+    def expire(self):
+        """Forget symbols not watched for ``ttl`` seconds; returns them."""
+        now = self._clock()
+        with self._lock:
+            stale = [s for s, watched in self._symbols.items()
+                     if now - watched >= self.ttl and s not in self._inflight]
+            for symbol in stale:
+                del self._symbols[symbol]
+                self._states.pop(symbol, None)
+        if stale:
+            with self._apply_lock:
+                old = self._snapshot
+                rows = {s: row for s, row in old.rows.items() if s not in stale}
+                self._snapshot = Snapshot(old.version + 1, old.updated_at, rows)
+        return stale
+
+    def snapshot(self):
+        """The latest published snapshot; never blocks on a refresh."""
+        return self._snapshot
+
+    def refresh(self, symbols=None):
+        """Poll ``symbols`` (default: the watchlist) and publish a new snapshot.
+
+        Symbols already being polled by another caller are not fetched again;
+        this call waits for that poll instead.
+        """
+        symbols = self.symbols if symbols is None else [s.upper() for s in symbols]
+        with self._lock:
+            mine = [s for s in symbols if s not in self._inflight]
+            others = {self._inflight[s] for s in symbols if s in self._inflight}
+            future = Future()
+            for symbol in mine:
+                self._inflight[symbol] = future
+        try:
+            if mine:
+                self._publish(self._poll(mine))
+            future.set_result(None)
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                for symbol in mine:
+                    self._inflight.pop(symbol, None)
+        for other in others:
+            other.result()
+        return self._snapshot
+
+    def _poll(self, symbols):
+        ticks = self.source.poll(symbols)
+        changed = {}
+        for symbol in symbols:
+            state = self._states.get(symbol)
+            fresh = state is None
+            if fresh:
+                state = _SymbolState(self.specs, self.window, self.threshold)
+                state.apply(self.source.history(symbol))
+                self._states[symbol] = state
+            closes = ticks.get(symbol)
+            if (closes is not None and state.apply(closes)) or (fresh and state.row is not None):
+                changed[symbol] = state.row
+        return changed
+
+    def _publish(self, changed):
+        if not changed:
+            return
+        with self._apply_lock:
+            old = self._snapshot
+            self._snapshot = Snapshot(old.version + 1, self._clock(), {**old.rows, **changed})
+
+    def start(self):
+        """Start the background poller (idempotent)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="watchlist", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                self.expire()
+                if self.symbols:
+                    self.refresh()
+            except Exception:
+                log.exception("watchlist refresh failed")
+            if self._stop.wait(self.every):
+                return
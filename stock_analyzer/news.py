@@ -0,0 +1,172 @@
+"""NewsAPI client with connection pooling, caching and rate limiting.
+
+Responses are kept in a TTL + LRU cache keyed by query. Once an entry expires
+it is revalidated with ``If-None-Match`` / ``If-Modified-Since`` when the
+server sent an ETag or Last-Modified header, so an unchanged result costs a
+304 instead of a full payload. Outgoing requests go through a token bucket,
+and ``fetch_many`` pulls a whole watchlist concurrently.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import telemetry
+
+NEWSAPI_URL = "https://newsapi.org/v2"
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second with bursts of up to ``capacity``."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self._sleep(wait)
+
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries go stale after ``ttl`` seconds.
+
+    Stale entries are kept (until evicted) so their validators can be reused.
+    """
+
+    def __init__(self, maxsize=256, ttl=900, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        """Return ``(value, fresh)`` or ``(None, False)`` when absent."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None, False
+            self._data.move_to_end(key)
+            stored, value = item
+            fresh = self._clock() - stored < self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value, fresh
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (self._clock(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def dedupe(articles, seen=None):
+    """Drop articles whose URL (or title, without a URL) was already seen."""
+    seen = set() if seen is None else seen
+    out = []
+    for article in articles:
+        key = article.get("url") or article.get("title")
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(article)
+    return out
+
+
+class NewsClient:
+    def __init__(self, api_key, base_url=NEWSAPI_URL, ttl=900, cache_size=256,
+                 rate=1.0, burst=5, timeout=10, max_workers=8, session=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.cache = TTLCache(cache_size, ttl)
+        self.limiter = TokenBucket(rate, burst)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def fetch(self, symbol, page_size=20):
+        """Return the latest articles for ``symbol``, newest first, without duplicates."""
+        key = (symbol.upper(), page_size)
+        cached, fresh = self.cache.get(key)
+        if fresh:
+            telemetry.count("cache_requests", cache="news", result="hit")
+            return cached["articles"]
+
+        headers = {"X-Api-Key": self.api_key}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        self.limiter.acquire()
+        with telemetry.span("news.request"):
+            response = self.session.get(
+                f"{self.base_url}/everything",
+                params={"q": symbol, "sortBy": "publishedAt", "pageSize": page_size},
+                headers=headers,
+                timeout=self.timeout,
+            )
+        telemetry.count("fetched_bytes", len(response.content), source="newsapi")
+        if response.status_code == 304 and cached is not None:
+            telemetry.count("cache_requests", cache="news", result="revalidated")
+            self.cache.put(key, cached)
+            return cached["articles"]
+        telemetry.count("cache_requests", cache="news", result="miss")
+        response.raise_for_status()
+
+        entry = {
+            "articles": dedupe(response.json().get("articles", [])),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        self.cache.put(key, entry)
+        return entry["articles"]
+
+    def fetch_many(self, symbols, page_size=20, unique=False):
+        """Fetch a watchlist concurrently; returns ``{symbol: articles}``.
+
+        With ``unique=True`` an article is only listed under the first symbol
+        (in input order) that returned it. A symbol whose request fails maps
+        to an empty list.
+        """
+        def one(symbol):
+            try:
+                return self.fetch(symbol, page_size)
+            except requests.RequestException:
+                return []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = dict(zip(symbols, pool.map(one, symbols)))
+        if unique:
+            seen = set()
+            results = {symbol: dedupe(articles, seen) for symbol, articles in results.items()}
+        return results
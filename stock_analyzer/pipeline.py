@@ -0,0 +1,80 @@
+"""Per-symbol analysis and the parallel universe driver used by the CLI."""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .anomalies import detect
+from .indicators import compute_indicators
+from .price_store import DEFAULT_ROOT, PriceStore
+from .providers import provider_from_spec
+
+log = logging.getLogger(__name__)
+
+
+def analyze_frame(symbol, df, indicators=(), anomalies=None, window=20):
+    """Attach indicator and anomaly columns to one symbol's OHLCV frame.
+
+    Returns a long-format frame with ``Date`` and ``Symbol`` columns first,
+    ready to be appended to a results file.
+    """
+    out = df.copy()
+    for name, values in compute_indicators(df["Close"], indicators).items():
+        out[name] = values
+    if anomalies:
+        scored = detect(df, anomalies, window=window, symbol=symbol)
+        out["anomaly_score"] = scored["score"]
+        out["anomaly"] = scored["anomaly"]
+    out = out.reset_index()
+    out.insert(1, "Symbol", symbol)
+    return out
+
+
+def analyze_symbol(symbol, start, end, indicators=(), anomalies=None, window=20, store=None):
+    store = store if store is not None else PriceStore()
+    df = store.get(symbol, start, end)
+    if df.empty:
+        return None
+    return analyze_frame(symbol.upper(), df, indicators, anomalies, window)
+
+
+def _worker(symbol, start, end, indicators, anomalies, window, store_root, provider):
+    provider = provider_from_spec(provider) if provider else None
+    return analyze_symbol(symbol, start, end, indicators, anomalies, window,
+                          store=PriceStore(store_root, provider))
+
+
+def analyze_universe(symbols, start, end, indicators=(), anomalies=None, window=20,
+                     processes=None, store_root=DEFAULT_ROOT, provider=None):
+    """Yield one result frame per symbol, in completion order.
+
+    Symbols are spread across a process pool (``processes=1`` runs inline).
+    A symbol that fails or has no data is logged and skipped. ``provider``
+    is a ``providers.provider_from_spec`` string.
+    """
+    args = (start, end, tuple(indicators), anomalies, window, store_root, provider)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        results = ((s, _call(_worker, s, *args)) for s in symbols)
+    else:
+        pool = ProcessPoolExecutor(max_workers=processes)
+        futures = {pool.submit(_worker, s, *args): s for s in symbols}
+        results = ((futures[f], _call(f.result)) for f in as_completed(futures))
+    try:
+        for symbol, frame in results:
+            if frame is None:
+                log.warning("No data for %s", symbol)
+            elif isinstance(frame, Exception):
+                log.warning("Failed to analyze %s: %s", symbol, frame)
+            else:
+                yield frame
+    finally:
+        if processes != 1:
+            pool.shutdown(cancel_futures=True)
+
+
+def _call(fn, *args):
+    try:
+        return fn(*args)
+    except Exception as e:
+        return e
@@ -0,0 +1,212 @@
+"""Portfolio returns and risk over a dates x symbols close matrix.
+
+Weights are fixed fractions rebalanced every bar, so the portfolio return is
+one matrix-vector product per bar. On top of that series:
+
+* ``rolling_volatility``, ``drawdown`` / ``max_drawdown``,
+* ``historical_var`` - VaR and CVaR (expected shortfall) from the observed
+  (optionally overlapping multi-bar) returns,
+* ``monte_carlo`` - VaR and CVaR of the horizon return over simulated
+  correlated asset paths, either multivariate normal or bootstrapped days,
+* ``risk_contributions`` - each symbol's share of portfolio volatility.
+
+Losses are reported as positive fractions (0.05 = 5% loss). ``monte_carlo``
+draws paths in chunks of at most ``chunk_mb`` so a 100k path x 250 bar x 50
+asset run needs tens of MB, not tens of GB. Each chunk has its own seed from
+one ``SeedSequence``, so results do not depend on ``processes``.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from . import backtest
+
+PERIODS = 252
+
+
+def normalize_weights(symbols, weights=None):
+    """Weights aligned with ``symbols`` summing to 1; equal weights when ``weights`` is None.
+
+    ``weights`` may be a sequence aligned with ``symbols`` or a ``{symbol: weight}``
+    mapping (missing symbols get 0).
+    """
+    if weights is None:
+        w = np.ones(len(symbols))
+    elif isinstance(weights, dict):
+        w = np.array([float(weights.get(s, 0.0)) for s in symbols])
+    else:
+        w = np.asarray(weights, dtype="float64")
+    if w.shape != (len(symbols),):
+        raise ValueError(f"Expected {len(symbols)} weights, got {w.shape}")
+    total = w.sum()
+    if not np.isfinite(total) or total == 0:
+        raise ValueError("Weights must have a non-zero sum")
+    return w / total
+
+
+def returns(prices):
+    """Per-bar simple returns of each column; missing bars count as 0."""
+    return pd.DataFrame(backtest.asset_returns(prices)[1:], index=prices.index[1:], columns=prices.columns)
+
+
+def portfolio_returns(prices, weights=None):
+    """Per-bar return of the portfolio rebalanced to ``weights`` every bar."""
+    w = normalize_weights(prices.columns, weights)
+    return pd.Series(backtest.asset_returns(prices)[1:] @ w, index=prices.index[1:], name="portfolio")
+
+
+def rolling_volatility(returns, window=21, periods=PERIODS):
+    """Annualized rolling standard deviation of a return Series or DataFrame."""
+    return returns.rolling(window).std() * np.sqrt(periods)
+
+
+def drawdown(returns):
+    """Fall of the equity curve from its running peak (0 at new highs, negative below)."""
+    equity = (1 + returns).cumprod()
+    return equity / np.maximum(equity.cummax(), 1.0) - 1
+
+
+def max_drawdown(returns):
+    """``(depth, peak date, trough date)`` of the deepest drawdown; depth is a positive fraction."""
+    dd = drawdown(returns)
+    if dd.empty or dd.min() >= 0:
+        return 0.0, None, None
+    trough = dd.idxmin()
+    equity = (1 + returns).cumprod()
+    before = equity.loc[:trough]
+    # A drawdown from the starting value has no earlier peak bar; report the first bar.
+    peak = before.idxmax() if before.max() >= 1.0 else returns.index[0]
+    return float(-dd.min()), peak, trough
+
+
+def _horizon_returns(returns, horizon):
+    values = np.asarray(returns, dtype="float64")
+    if horizon == 1:
+        return values
+    growth = np.cumsum(np.log1p(values))
+    return np.expm1(growth[horizon - 1:] - np.concatenate([[0.0], growth[:-horizon]]))
+
+
+def var_cvar(outcomes, level=0.95):
+    """VaR and CVaR (both positive losses) of an array of returns at confidence ``level``."""
+    outcomes = np.asarray(outcomes, dtype="float64")
+    outcomes = outcomes[np.isfinite(outcomes)]
+    if outcomes.size == 0:
+        return np.nan, np.nan
+    cutoff = np.quantile(outcomes, 1 - level)
+    return float(-cutoff), float(-outcomes[outcomes <= cutoff].mean())
+
+
+def historical_var(returns, level=0.95, horizon=1):
+    """Historical VaR/CVaR of ``horizon``-bar returns (overlapping windows when > 1)."""
+    return var_cvar(_horizon_returns(returns, horizon), level)
+
+
+def risk_contributions(asset_ret, weights=None, periods=PERIODS):
+    """Each symbol's contribution to annualized portfolio volatility.
+
+    ``contribution`` (weight times marginal volatility) sums to the portfolio
+    volatility; ``share`` sums to 1.
+    """
+    cov = asset_ret.cov().to_numpy() * periods
+    w = normalize_weights(asset_ret.columns, weights)
+    sigma = float(np.sqrt(w @ cov @ w))
+    marginal = cov @ w / sigma if sigma > 0 else np.zeros_like(w)
+    contribution = w * marginal
+    return pd.DataFrame({
+        "weight": w,
+        "volatility": np.sqrt(np.diag(cov)),
+        "marginal": marginal,
+        "contribution": contribution,
+        "share": contribution / sigma if sigma > 0 else np.zeros_like(w),
+    }, index=asset_ret.columns)
+
+
+def _factor(cov):
+    """A matrix ``L`` with ``L @ L.T == cov``, clipping negative eigenvalues of pairwise estimates."""
+    try:
+        return np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(cov)
+        return vectors * np.sqrt(np.clip(values, 0, None))
+
+
+def _simulate_chunk(paths, horizon, weights, seed, mean, factor, history):
+    """Horizon return of ``paths`` simulated paths (float32 draws, float64 compounding)."""
+    rng = np.random.default_rng(seed)
+    if history is not None:
+        daily = history[rng.integers(0, len(history), (paths, horizon))]
+    else:
+        days = rng.standard_normal((paths, horizon, len(weights)), dtype="float32")
+        days = days @ factor.T.astype("float32")
+        days += mean.astype("float32")
+        daily = days @ weights.astype("float32")
+    return np.expm1(np.log1p(np.maximum(daily.astype("float64"), -1.0)).sum(axis=1))
+
+
+def monte_carlo(asset_ret, weights=None, paths=100_000, horizon=PERIODS, level=0.95,
+                method="normal", seed=0, chunk_mb=64, processes=1):
+    """VaR and CVaR of the ``horizon``-bar portfolio return over simulated paths.
+
+    ``asset_ret`` is a bars x symbols return matrix (``returns(prices)``).
+    ``method="normal"`` draws correlated asset returns from the sample mean
+    and covariance; ``"bootstrap"`` resamples whole historical bars, keeping
+    fat tails and cross-asset dependence. Returns ``(var, cvar, outcomes)``
+    with one horizon return per path. With ``processes`` other than 1
+    (``None`` = all cores) chunks run across a process pool.
+    """
+    values = np.asarray(asset_ret, dtype="float64")
+    symbols = asset_ret.columns if isinstance(asset_ret, pd.DataFrame) else range(values.shape[1])
+    w = normalize_weights(list(symbols), weights)
+    if method == "bootstrap":
+        # Weights are fixed, so resampling a bar only needs its portfolio return.
+        history = np.nan_to_num(values, nan=0.0) @ w
+        mean = factor = None
+        row_bytes = horizon * 16
+    elif method == "normal":
+        frame = pd.DataFrame(values)
+        history = None
+        mean = frame.mean().fillna(0).to_numpy()
+        factor = _factor(frame.cov().fillna(0).to_numpy())
+        row_bytes = horizon * len(w) * 8  # float32 draws plus the transformed copy
+    else:
+        raise ValueError(f"Unknown Monte Carlo method: {method!r}")
+
+    per_chunk = max(1, min(paths, int(chunk_mb * 2**20 // row_bytes)))
+    sizes = [min(per_chunk, paths - i) for i in range(0, paths, per_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(n, horizon, w, s, mean, factor, history) for n, s in zip(sizes, seeds)]
+
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(sizes) <= 1:
+        outcomes = [_simulate_chunk(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            outcomes = list(pool.map(_simulate_chunk, *zip(*args), chunksize=max(1, len(args) // (4 * processes))))
+    outcomes = np.concatenate(outcomes)
+    var, cvar = var_cvar(outcomes, level)
+    return var, cvar, outcomes
+
+
+def summary(prices, weights=None, level=0.95, periods=PERIODS):
+    """Headline numbers for a portfolio of the columns of ``prices``."""
+    ret = portfolio_returns(prices, weights)
+    years = len(ret) / periods
+    total = float((1 + ret).prod() - 1)
+    vol = float(ret.std() * np.sqrt(periods))
+    depth, peak, trough = max_drawdown(ret)
+    var, cvar = historical_var(ret, level)
+    return {
+        "total_return": total,
+        "annual_return": (1 + total) ** (1 / years) - 1 if years > 0 and total > -1 else np.nan,
+        "annual_volatility": vol,
+        "sharpe": float(ret.mean() / ret.std() * np.sqrt(periods)) if ret.std() > 0 else np.nan,
+        "max_drawdown": depth,
+        "drawdown_peak": peak,
+        "drawdown_trough": trough,
+        "var": var,
+        "cvar": cvar,
+    }
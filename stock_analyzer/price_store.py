@@ -0,0 +1,390 @@
+"""On-disk OHLCV store that only downloads the date spans it does not already hold.
+
+Each symbol gets its own partition directory containing memory-mappable NumPy
+arrays (``dates.npy`` as int64 epoch nanoseconds, ``ohlcv.npy`` as a float64
+``rows x 5`` block) and a ``spans.json`` manifest of the half-open
+``[start, end)`` date ranges that have been fetched. A range only counts as
+fetched up to the last bar the provider returned; empty responses (a failed
+download looks the same as a holiday) are remembered in memory for
+``empty_ttl`` seconds instead of being written down. Intraday bars live in a
+subdirectory per stored resolution (``AAPL/5m/``); coarser intervals are
+resampled from the stored one (see ``intervals``) and kept in a byte-bounded
+LRU until the partition changes.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from . import telemetry
+from .intervals import BASE, base_interval, check, resample
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+DEFAULT_ROOT = os.environ.get("STOCK_ANALYZER_STORE", ".price_store")
+RESAMPLE_BUDGET = 64 * 2**20
+EMPTY_TTL = 900
+
+
+def _day(value):
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return ts.normalize()
+
+
+def merge_spans(spans):
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def missing_spans(covered, start, end):
+    """Return the parts of ``[start, end)`` not covered by the sorted ``covered`` spans."""
+    gaps = []
+    cursor = start
+    for span_start, span_end in covered:
+        if span_end <= cursor:
+            continue
+        if span_start >= end:
+            break
+        if span_start > cursor:
+            gaps.append((cursor, span_start))
+        cursor = max(cursor, span_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def empty_frame():
+    frame = pd.DataFrame(columns=COLUMNS, dtype="float64")
+    frame.index = pd.DatetimeIndex([], name="Date")
+    return frame
+
+
+def to_frame(dates, values):
+    return pd.DataFrame(
+        values,
+        index=pd.DatetimeIndex(np.asarray(dates).astype("datetime64[ns]"), name="Date"),
+        columns=COLUMNS,
+    )
+
+
+def is_normalized(df):
+    """True when ``df`` already has ``COLUMNS`` as float64 on a sorted, unique, naive DatetimeIndex."""
+    index = df.index
+    return (list(df.columns) == COLUMNS and isinstance(index, pd.DatetimeIndex) and index.tz is None
+            and (df.dtypes == "float64").all() and index.is_monotonic_increasing and index.is_unique)
+
+
+@telemetry.timed("normalize_ohlcv")
+def normalize_ohlcv(df):
+    """Coerce a provider response to a ``Date``-indexed frame with ``COLUMNS``.
+
+    Frames that are already normalized (every provider in ``providers``
+    returns them that way) are passed through untouched.
+    """
+    if df is None or df.empty:
+        return empty_frame()
+    if is_normalized(df):
+        return df
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    df = df.loc[:, ~df.columns.duplicated()]
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    out = pd.DataFrame(
+        {col: pd.to_numeric(df[col], errors="coerce") if col in df else np.nan for col in COLUMNS},
+        index=index,
+    ).astype("float64")
+    out.index.name = "Date"
+    return out[~out.index.duplicated(keep="last")].sort_index()
+
+
+class YFinanceProvider:
+    """Default provider backed by ``yfinance``.
+
+    ``yf.download`` turns every failure into an empty frame, so ``fetch``
+    asks ``Ticker.history`` to raise instead: network, rate-limit and server
+    errors propagate (for ``RetryingProvider`` / ``FallbackProvider`` to act
+    on) and only a symbol or range with no prices comes back empty.
+    """
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        import yfinance as yf
+        from yfinance.exceptions import YFTickerMissingError
+
+        try:
+            df = yf.Ticker(symbol).history(start=start, end=end, interval=interval, raise_errors=True)
+        except YFTickerMissingError:
+            return empty_frame()
+        return normalize_ohlcv(df)
+
+    def fetch_many(self, symbols, start, end, interval="1d"):
+        """Download several symbols in one call; symbols that came back empty are omitted.
+
+        A failed symbol is indistinguishable from an empty one here; the store
+        fetches omitted symbols again through ``fetch``, which does raise.
+        """
+        import yfinance as yf
+
+        df = yf.download(symbols, start=start, end=end, interval=interval, group_by="ticker",
+                         progress=False)
+        out = {}
+        if not isinstance(df.columns, pd.MultiIndex):
+            return out
+        present = set(df.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol in present:
+                frame = normalize_ohlcv(df[symbol].dropna(how="all"))
+                if not frame.empty:
+                    out[symbol] = frame
+        return out
+
+
+class PriceStore:
+    """Per-symbol partitions of fetched bars; providers take ``(symbol, start, end, interval)``.
+
+    Without a ``provider`` the chain named by ``$STOCK_ANALYZER_PROVIDER`` is
+    used (see ``providers.provider_from_spec``).
+
+    ``intraday_base`` is the resolution intraday requests are stored at and
+    resampled from (see ``intervals.base_interval``).
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, provider=None, max_workers=8, intraday_base=BASE,
+                 resample_budget=RESAMPLE_BUDGET, empty_ttl=EMPTY_TTL, clock=time.monotonic):
+        self.root = root
+        if provider is None:
+            from .providers import default_provider
+
+            provider = default_provider()
+        self.provider = provider
+        self.max_workers = max_workers
+        self.intraday_base = check(intraday_base)
+        self.resample_budget = resample_budget
+        self.empty_ttl = empty_ttl
+        self._clock = clock
+        self._empty = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._bars = OrderedDict()
+        self._bars_bytes = 0
+        self._bars_lock = threading.Lock()
+
+    def _lock(self, symbol, interval="1d"):
+        with self._locks_guard:
+            return self._locks.setdefault((symbol, interval), threading.Lock())
+
+    def _path(self, symbol, name, interval="1d"):
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+        if interval == "1d":
+            return os.path.join(self.root, safe, name)
+        return os.path.join(self.root, safe, interval, name)
+
+    def _read(self, symbol, mmap_mode="r", interval="1d"):
+        try:
+            with open(self._path(symbol, "spans.json", interval)) as fh:
+                manifest = json.load(fh)
+            dates = np.load(self._path(symbol, "dates.npy", interval), mmap_mode=mmap_mode)
+            values = np.load(self._path(symbol, "ohlcv.npy", interval), mmap_mode=mmap_mode)
+        except (OSError, ValueError):
+            return np.empty(0, dtype="int64"), np.empty((0, len(COLUMNS))), []
+        if len(dates) != manifest.get("rows") or len(values) != len(dates):
+            # A write was interrupted; treat the partition as empty and refetch.
+            return np.empty(0, dtype="int64"), np.empty((0, len(COLUMNS))), []
+        spans = [[pd.Timestamp(s), pd.Timestamp(e)] for s, e in manifest["spans"]]
+        return dates, values, spans
+
+    def _write(self, symbol, dates, values, spans, interval="1d"):
+        os.makedirs(os.path.dirname(self._path(symbol, "spans.json", interval)), exist_ok=True)
+        for name, array in (("dates.npy", dates), ("ohlcv.npy", values)):
+            tmp = self._path(symbol, name + ".tmp", interval)
+            with open(tmp, "wb") as fh:
+                np.save(fh, np.ascontiguousarray(array))
+            os.replace(tmp, self._path(symbol, name, interval))
+        manifest = {
+            "rows": int(len(dates)),
+            "spans": [[s.isoformat(), e.isoformat()] for s, e in spans],
+        }
+        tmp = self._path(symbol, "spans.json.tmp", interval)
+        with open(tmp, "w") as fh:
+            json.dump(manifest, fh)
+        os.replace(tmp, self._path(symbol, "spans.json", interval))
+
+    def covered(self, symbol, interval="1d"):
+        return self._read(symbol.upper(), interval=interval)[2]
+
+    def _gaps(self, symbol, start, end, interval, spans=None):
+        """Uncovered parts of ``[start, end)``, minus those that recently came back empty."""
+        if spans is None:
+            spans = self.covered(symbol, interval)
+        gaps = missing_spans(spans, start, end)
+        empty = self._empty.get((symbol, interval))
+        if not gaps or not empty:
+            return gaps
+        now = self._clock()
+        recent = [(s, e) for s, e, expires in empty if expires > now]
+        return [(s, e) for s, e in gaps if not any(lo <= s and e <= hi for lo, hi in recent)]
+
+    def _remember_empty(self, symbol, interval, start, end):
+        now = self._clock()
+        key = (symbol, interval)
+        # Read-modify-write under the partition lock held by the caller.
+        entries = [entry for entry in self._empty.get(key, []) if entry[2] > now]
+        self._empty[key] = entries + [(start, end, now + self.empty_ttl)]
+
+    def _fill(self, symbol, start, end, interval):
+        """Fetch the uncovered parts of ``[start, end)``; returns the whole (memory-mapped) partition."""
+        with self._lock(symbol, interval):
+            dates, values, spans = self._read(symbol, interval=interval)
+            gaps = self._gaps(symbol, start, end, interval, spans)
+            if gaps:
+                with telemetry.span("provider.fetch"):
+                    fetched = [self.provider.fetch(symbol, s, e, interval=interval) for s, e in gaps]
+                self._count_fetched(fetched)
+                dates, values = self._merge(symbol, dates, values, spans, gaps, fetched, interval)
+        return dates, values
+
+    def _count_fetched(self, frames):
+        if telemetry.enabled():
+            source = type(self.provider).__name__
+            rows = sum(len(f) for f in frames)
+            telemetry.count("fetched_rows", rows, source=source)
+            telemetry.count("fetched_bytes", sum(int(f.memory_usage().sum()) for f in frames), source=source)
+            telemetry.count("fetch_requests", len(frames), source=source)
+
+    def _arrays(self, symbol, start, end, interval="1d"):
+        base = base_interval(interval, self.intraday_base)
+        if base != interval:
+            return self._resampled(symbol, start, end, base, interval)
+        dates, values = self._fill(symbol, start, end, interval)
+        # Only the rows in range are copied out of the memory map.
+        lo, hi = np.searchsorted(dates, [start.value, end.value])
+        return np.array(dates[lo:hi]), np.array(values[lo:hi])
+
+    def _resampled(self, symbol, start, end, base, interval):
+        """``interval`` bars built from the ``base`` partition, cached until it changes."""
+        dates, values = self._fill(symbol, start, end, base)
+        try:
+            version = os.stat(self._path(symbol, "ohlcv.npy", base)).st_mtime_ns
+        except OSError:
+            version = None
+        key = (symbol, base, interval)
+        with self._bars_lock:
+            entry = self._bars.get(key)
+            if entry is not None and entry[0] == version:
+                self._bars.move_to_end(key)
+        hit = entry is not None and entry[0] == version
+        telemetry.count("cache_requests", cache="resampled", result="hit" if hit else "miss")
+        if not hit:
+            bar_dates, bar_values = resample(dates, values, interval)
+            entry = (version, bar_dates, bar_values)
+            self._put_bars(key, entry)
+        _, bar_dates, bar_values = entry
+        lo, hi = np.searchsorted(bar_dates, [start.value, end.value])
+        return bar_dates[lo:hi].copy(), bar_values[lo:hi].copy()
+
+    def _put_bars(self, key, entry):
+        size = entry[1].nbytes + entry[2].nbytes
+        with self._bars_lock:
+            old = self._bars.pop(key, None)
+            if old is not None:
+                self._bars_bytes -= old[1].nbytes + old[2].nbytes
+            self._bars[key] = entry
+            self._bars_bytes += size
+            while self._bars_bytes > self.resample_budget and len(self._bars) > 1:
+                _, (_, d, v) = self._bars.popitem(last=False)
+                self._bars_bytes -= d.nbytes + v.nbytes
+
+    def get(self, symbol, start, end, interval="1d"):
+        """Return ``[start, end)`` of ``interval`` bars for ``symbol``, fetching only the uncovered spans."""
+        start, end = _day(start), _day(end)
+        if end <= start:
+            return empty_frame()
+        return to_frame(*self._arrays(symbol.upper(), start, end, check(interval)))
+
+    def get_matrix(self, symbols, start, end, field="Close", interval="1d"):
+        """Return one ``field`` column per symbol as a date-aligned wide frame.
+
+        Symbols with missing spans are downloaded together through the
+        provider's ``fetch_many`` when it has one, otherwise through a bounded
+        thread pool. The result wraps a single 2-D float64 block with NaN where
+        a symbol has no bar for a date.
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        start, end = _day(start), _day(end)
+        col = COLUMNS.index(field)
+        base = base_interval(check(interval), self.intraday_base)
+        pending = [s for s in symbols if self._gaps(s, start, end, base)]
+        fetch_many = getattr(self.provider, "fetch_many", None)
+        if len(pending) > 1 and fetch_many is not None:
+            self._fill_many(pending, start, end, fetch_many, base)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            arrays = list(pool.map(lambda s: self._arrays(s, start, end, interval), symbols))
+
+        index = np.unique(np.concatenate([d for d, _ in arrays])) if arrays else np.empty(0, "int64")
+        block = np.full((len(index), len(symbols)), np.nan)
+        for j, (dates, values) in enumerate(arrays):
+            block[np.searchsorted(index, dates), j] = values[:, col]
+        return pd.DataFrame(
+            block,
+            index=pd.DatetimeIndex(index.astype("datetime64[ns]"), name="Date"),
+            columns=symbols,
+        )
+
+    def _fill_many(self, symbols, start, end, fetch_many, interval="1d"):
+        gaps = {s: self._gaps(s, start, end, interval) for s in symbols}
+        lo = min(g[0][0] for g in gaps.values() if g)
+        hi = max(g[-1][1] for g in gaps.values() if g)
+        with telemetry.span("provider.fetch_many"):
+            frames = fetch_many(symbols, lo, hi, interval=interval)
+        self._count_fetched(list(frames.values()))
+        # Symbols the batch call did not return are left uncovered and get
+        # retried individually by ``_arrays``.
+        for symbol, frame in frames.items():
+            with self._lock(symbol, interval):
+                dates, values, spans = self._read(symbol, interval=interval)
+                self._merge(symbol, dates, values, spans, [(lo, hi)], [frame], interval)
+
+    def _merge(self, symbol, dates, values, spans, gaps, fetched, interval="1d"):
+        fetched = [normalize_ohlcv(f) for f in fetched]
+        # A gap is covered from its start through the day of the last bar that
+        # came back (and any weekend right after it). Never mark today (or
+        # later) as covered: its bar is still forming.
+        horizon = _day("today")
+        new_spans = []
+        for (start, end), frame in zip(gaps, fetched):
+            if frame.empty:
+                self._remember_empty(symbol, interval, start, end)
+                continue
+            last = _day(frame.index[-1]) + pd.Timedelta(days=1)
+            if last < end and not len(pd.bdate_range(last, end - pd.Timedelta(days=1))):
+                last = end
+            last = min(end, horizon, last)
+            if last > start:
+                new_spans.append([start, last])
+        existing = pd.DataFrame(
+            np.array(values),
+            index=pd.DatetimeIndex(np.array(dates).astype("datetime64[ns]")),
+            columns=COLUMNS,
+        )
+        merged = pd.concat([existing, *fetched])
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        spans = merge_spans(spans + new_spans)
+        new_dates = merged.index.values.astype("datetime64[ns]").astype("int64")
+        new_values = merged.to_numpy(dtype="float64")
+        self._write(symbol, new_dates, new_values, spans, interval)
+        return new_dates, new_values
@@ -0,0 +1,128 @@
+"""Compact, shareable in-memory price series and a process-wide cache for them.
+
+A ``PriceSeries`` holds one symbol's bars as an int64 epoch-nanosecond date
+array and a single ``(5, rows)`` OHLCV block, both read-only, so any number
+of sessions can hold the same object and take zero-copy pandas or NumPy
+views of it. ``PriceCache`` keeps one series per (symbol, interval) under a
+byte budget and serves date ranges as slices of it.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from . import telemetry
+from .price_store import COLUMNS
+
+DEFAULT_BUDGET = int(float(os.environ.get("STOCK_ANALYZER_CACHE_MB", 256)) * 2**20)
+
+
+class PriceSeries:
+    __slots__ = ("symbol", "dates", "values")
+
+    def __init__(self, symbol, dates, values):
+        self.symbol = symbol
+        self.dates = dates
+        self.values = values
+        self.dates.flags.writeable = False
+        self.values.flags.writeable = False
+
+    @classmethod
+    def from_frame(cls, symbol, df, dtype="float64"):
+        dates = np.ascontiguousarray(pd.DatetimeIndex(df.index).values.astype("datetime64[ns]").view("int64"))
+        values = np.ascontiguousarray(df[COLUMNS].to_numpy(dtype=dtype).T)
+        return cls(symbol, dates, values)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __repr__(self):
+        return f"PriceSeries({self.symbol!r}, rows={len(self)}, dtype={self.values.dtype})"
+
+    @property
+    def nbytes(self):
+        return self.dates.nbytes + self.values.nbytes
+
+    @property
+    def index(self):
+        return pd.DatetimeIndex(self.dates.view("datetime64[ns]"), name="Date")
+
+    def column(self, name):
+        """Contiguous read-only view of one OHLCV column."""
+        return self.values[COLUMNS.index(name)]
+
+    def slice(self, start, end):
+        """Rows in ``[start, end)`` as a new series viewing the same memory."""
+        lo, hi = np.searchsorted(self.dates, [pd.Timestamp(start).value, pd.Timestamp(end).value])
+        return PriceSeries(self.symbol, self.dates[lo:hi], self.values[:, lo:hi])
+
+    def frame(self):
+        """Zero-copy ``Date``-indexed OHLCV DataFrame over this series.
+
+        The values are shared, so in-place edits raise; adding columns or
+        calling ``copy()`` is fine.
+        """
+        return pd.DataFrame(self.values.T, index=self.index, columns=COLUMNS, copy=False)
+
+
+class PriceCache:
+    """Process-wide LRU of ``PriceSeries`` bounded by total bytes.
+
+    Each (symbol, interval) has one entry covering the union of the ranges
+    requested so far; requests inside it are answered with slices, anything
+    wider reloads the symbol over the combined range. Entries older than ``ttl`` seconds are
+    reloaded so the latest bars show up.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_BUDGET, ttl=3600, dtype="float64", clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.dtype = dtype
+        self._clock = clock
+        self.nbytes = 0
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, symbol, start, end, loader, interval="1d"):
+        """Return ``[start, end)`` of ``symbol``; ``loader(symbol, start, end, interval)`` returns a frame."""
+        symbol = symbol.upper()
+        key = (symbol, interval)
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[3] >= self.ttl:
+                entry = None
+            if entry is not None and entry[0] <= start and end <= entry[1]:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                telemetry.count("cache_requests", cache="prices", result="hit")
+                return entry[2].slice(start, end)
+            self.misses += 1
+        telemetry.count("cache_requests", cache="prices", result="miss")
+        lo, hi = start, end
+        if entry is not None:
+            lo, hi = min(start, entry[0]), max(end, entry[1])
+        series = PriceSeries.from_frame(symbol, loader(symbol, lo, hi, interval), self.dtype)
+        self._put(key, lo, hi, series)
+        return series.slice(start, end)
+
+    def _put(self, key, start, end, series):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[2].nbytes
+            self._entries[key] = (start, end, series, self._clock())
+            self.nbytes += series.nbytes
+            while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, _, evicted, _) = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
@@ -0,0 +1,290 @@
+"""Price providers and the wrappers that make them dependable.
+
+Every provider implements ``fetch(symbol, start, end, interval="1d")`` and
+may implement ``fetch_many(symbols, start, end, interval="1d")``. Both return
+frames already in the store's normalized schema (``normalize_ohlcv``), so
+nothing downstream re-normalizes them. The wrappers compose:
+
+* ``RetryingProvider`` - retries raised errors with exponential backoff and jitter,
+* ``FallbackProvider`` - tries providers in order until one returns bars,
+* ``CoalescingProvider`` - concurrent identical requests share one call,
+* ``RecordingProvider`` / ``ReplayProvider`` - save every response under a
+  directory and serve them back later without a network.
+
+``provider_from_spec`` builds a chain from a short string such as
+``"replay:fixtures,yfinance"``; ``PriceStore`` uses
+``$STOCK_ANALYZER_PROVIDER`` (default ``"yfinance"``) when no provider is given.
+"""
+
+import functools
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from . import telemetry
+from .price_store import COLUMNS, YFinanceProvider, empty_frame, to_frame
+
+DEFAULT_SPEC = os.environ.get("STOCK_ANALYZER_PROVIDER", "yfinance")
+
+
+class ProviderError(Exception):
+    """A provider could not serve a request (after any retries or fallbacks)."""
+
+
+def _name(provider):
+    return type(provider).__name__
+
+
+def _optional_many(method):
+    """Expose ``fetch_many`` only when the wrapped provider has one.
+
+    ``PriceStore`` checks ``getattr(provider, "fetch_many", None)`` to choose
+    between one batched call and a thread pool of ``fetch`` calls.
+    """
+    @property
+    @functools.wraps(method)
+    def fetch_many(self):
+        inner = getattr(self.provider, "fetch_many", None)
+        return None if inner is None else functools.partial(method, self, inner)
+    return fetch_many
+
+
+class RetryingProvider:
+    """Retry raised errors up to ``attempts`` times, sleeping ``backoff * 2**n`` (jittered)."""
+
+    def __init__(self, provider, attempts=3, backoff=0.5, max_backoff=8.0, sleep=time.sleep):
+        self.provider = provider
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+
+    def _call(self, fn, *args, **kwargs):
+        for attempt in range(self.attempts):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as exc:
+                if attempt + 1 == self.attempts:
+                    raise ProviderError(f"{_name(self.provider)} failed after {self.attempts} attempts: {exc}") from exc
+                telemetry.count("provider_retries", source=_name(self.provider))
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                self._sleep(delay * random.uniform(0.5, 1.0))
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        return self._call(self.provider.fetch, symbol, start, end, interval=interval)
+
+    @_optional_many
+    def fetch_many(self, inner, symbols, start, end, interval="1d"):
+        return self._call(inner, symbols, start, end, interval=interval)
+
+
+class FallbackProvider:
+    """Ask each provider in turn; the first one that returns bars wins.
+
+    A provider that raises or returns no rows hands over to the next. When
+    all return no rows the (empty) result stands; when all raise, the last
+    error is raised as ``ProviderError``.
+    """
+
+    def __init__(self, providers):
+        self.providers = list(providers)
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        error = None
+        for provider in self.providers:
+            try:
+                frame = provider.fetch(symbol, start, end, interval=interval)
+            except Exception as exc:
+                error = exc
+                telemetry.count("provider_fallbacks", source=_name(provider), reason="error")
+                continue
+            if not frame.empty:
+                return frame
+            telemetry.count("provider_fallbacks", source=_name(provider), reason="empty")
+            error = None
+        if error is not None:
+            raise ProviderError(f"all providers failed for {symbol}: {error}") from error
+        return empty_frame()
+
+    def fetch_many(self, symbols, start, end, interval="1d"):
+        """Batch through the providers that support it; symbols still missing are left out.
+
+        ``PriceStore`` retries the missing ones through ``fetch``, which walks
+        the whole chain.
+        """
+        out, pending = {}, list(symbols)
+        for provider in self.providers:
+            fetch_many = getattr(provider, "fetch_many", None)
+            if not pending or fetch_many is None:
+                continue
+            try:
+                frames = fetch_many(pending, start, end, interval=interval)
+            except Exception:
+                telemetry.count("provider_fallbacks", source=_name(provider), reason="error")
+                continue
+            out.update({s: f for s, f in frames.items() if not f.empty})
+            pending = [s for s in pending if s not in out]
+        return out
+
+
+class CoalescingProvider:
+    """Concurrent calls with the same ``(symbol, start, end, interval)`` share one fetch."""
+
+    def __init__(self, provider):
+        self.provider = provider
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        key = (symbol.upper(), pd.Timestamp(start), pd.Timestamp(end), interval)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            telemetry.count("provider_coalesced", source=_name(self.provider))
+            return future.result()
+        try:
+            future.set_result(self.provider.fetch(symbol, start, end, interval=interval))
+        except Exception as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return future.result()
+
+    @_optional_many
+    def fetch_many(self, inner, symbols, start, end, interval="1d"):
+        return inner(symbols, start, end, interval=interval)
+
+
+def _recording_path(root, symbol, interval):
+    safe = re.sub(r"[^A-Za-z0-9._-]", "_", symbol.upper())
+    return os.path.join(root, f"{safe}_{interval}.npz")
+
+
+def _load_recording(path):
+    try:
+        with np.load(path) as data:
+            return data["dates"], data["values"]
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class RecordingProvider:
+    """Pass requests through to ``provider`` and keep every bar it returns under ``root``.
+
+    Each (symbol, interval) is one ``.npz`` file holding the union of all
+    recorded bars, which ``ReplayProvider`` can serve any range from.
+    """
+
+    def __init__(self, provider, root):
+        self.provider = provider
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _record(self, symbol, interval, frame):
+        if frame.empty:
+            return
+        path = _recording_path(self.root, symbol, interval)
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            old = _load_recording(path)
+            merged = frame if old is None else pd.concat([to_frame(*old), frame])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            tmp = path + ".tmp.npz"
+            np.savez(tmp, dates=merged.index.values.astype("datetime64[ns]").astype("int64"),
+                     values=merged[COLUMNS].to_numpy(dtype="float64"))
+            os.replace(tmp, path)
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        frame = self.provider.fetch(symbol, start, end, interval=interval)
+        self._record(symbol, interval, frame)
+        return frame
+
+    @_optional_many
+    def fetch_many(self, inner, symbols, start, end, interval="1d"):
+        frames = inner(symbols, start, end, interval=interval)
+        for symbol, frame in frames.items():
+            self._record(symbol, interval, frame)
+        return frames
+
+
+class ReplayProvider:
+    """Serve bars recorded by ``RecordingProvider`` from ``root``; never touches the network.
+
+    Symbols with no recording raise ``ProviderError`` (so a ``FallbackProvider``
+    moves on) unless ``strict=False``, which returns an empty frame instead.
+    """
+
+    def __init__(self, root, strict=True):
+        self.root = root
+        self.strict = strict
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _recording(self, symbol, interval):
+        key = (symbol.upper(), interval)
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = _load_recording(_recording_path(self.root, symbol, interval))
+            return self._cache[key]
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        recording = self._recording(symbol, interval)
+        if recording is None:
+            if self.strict:
+                raise ProviderError(f"no recording for {symbol.upper()} ({interval}) in {self.root}")
+            return empty_frame()
+        dates, values = recording
+        lo, hi = np.searchsorted(dates, [pd.Timestamp(start).value, pd.Timestamp(end).value])
+        return to_frame(dates[lo:hi], values[lo:hi])
+
+    def fetch_many(self, symbols, start, end, interval="1d"):
+        out = {}
+        for symbol in symbols:
+            if self._recording(symbol, interval) is not None:
+                out[symbol] = self.fetch(symbol, start, end, interval)
+        return out
+
+
+def _base(spec):
+    name, _, arg = spec.strip().partition(":")
+    if name == "yfinance":
+        return RetryingProvider(YFinanceProvider())
+    if name == "synthetic":
+        from .synthetic import SyntheticProvider
+
+        return SyntheticProvider(seed=int(arg or 0))
+    if name == "replay":
+        return ReplayProvider(arg or "fixtures")
+    if name == "record":
+        # record:DIR records what the default network provider returns.
+        return RecordingProvider(RetryingProvider(YFinanceProvider()), arg or "fixtures")
+    raise ValueError(f"Unknown provider: {spec!r}")
+
+
+def provider_from_spec(spec=DEFAULT_SPEC):
+    """Build a provider chain from ``"name[:arg],..."``.
+
+    Names: ``yfinance``, ``synthetic[:seed]``, ``replay:DIR`` and
+    ``record:DIR`` (yfinance, saving responses to DIR). Several names make a
+    ``FallbackProvider`` in that order; the result is always coalescing.
+    """
+    providers = [_base(part) for part in spec.split(",") if part.strip()]
+    if not providers:
+        raise ValueError("Empty provider spec")
+    chain = providers[0] if len(providers) == 1 else FallbackProvider(providers)
+    return CoalescingProvider(chain)
+
+
+def default_provider():
+    return provider_from_spec(DEFAULT_SPEC)
+
@@ -0,0 +1,222 @@
+"""Universe screener over a columnar table of each symbol's latest values.
+
+``LatestTable`` keeps one float64 array per field (``close``, ``rsi14``,
+``ma50``, ``anomaly_z``, ...) with one slot per symbol. It is filled in one
+vectorized pass from a close matrix (``load``) and kept current by
+``sync``-ing ``live.Watchlist`` snapshots, which only touches the symbols
+whose rows changed. A scan never recomputes indicators: expressions such as
+``rsi14 < 30 and close > ma50 and anomaly_z > 2`` compile once to NumPy
+operations over whole columns.
+
+Expressions support ``and``/``or``/``not``, comparisons (chained too),
+``+ - * / abs()`` and numeric literals; names are table columns and are
+case-insensitive. Conditions use three-valued logic: a comparison with a
+missing value is unknown rather than false, so neither it nor its ``not``
+matches.
+"""
+
+import ast
+import functools
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .anomalies import rolling_zscore
+from .indicators import compute_indicators
+from .live import DEFAULT_SPECS
+
+_COMPARE = {
+    ast.Lt: np.less, ast.LtE: np.less_equal, ast.Gt: np.greater,
+    ast.GtE: np.greater_equal, ast.Eq: np.equal, ast.NotEq: np.not_equal,
+}
+_ARITH = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide}
+
+
+def _truth(values):
+    """Condition value as 1.0 (true), 0.0 (false) or NaN (unknown)."""
+    values = np.asarray(values, dtype="float64")
+    return np.where(np.isnan(values), np.nan, values != 0)
+
+
+def _and(a, b):
+    return np.where((a == 0) | (b == 0), 0.0, np.where(np.isnan(a) | np.isnan(b), np.nan, 1.0))
+
+
+def _or(a, b):
+    return np.where((a == 1) | (b == 1), 1.0, np.where(np.isnan(a) | np.isnan(b), np.nan, 0.0))
+
+
+def _compile(node, names):
+    """Turn an expression AST into ``fn(columns) -> array``; records referenced names."""
+    if isinstance(node, ast.Expression):
+        return _compile(node.body, names)
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile(value, names) for value in node.values]
+        op = _and if isinstance(node.op, ast.And) else _or
+        return lambda cols: functools.reduce(op, (_truth(part(cols)) for part in parts))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        inner = _compile(node.operand, names)
+        return lambda cols: 1.0 - _truth(inner(cols))
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        inner = _compile(node.operand, names)
+        sign = -1.0 if isinstance(node.op, ast.USub) else 1.0
+        return lambda cols: sign * inner(cols)
+    if isinstance(node, ast.Compare):
+        operands = [_compile(node.left, names)] + [_compile(c, names) for c in node.comparators]
+        ops = [_COMPARE[type(op)] for op in node.ops]
+
+        def compare(cols):
+            values = [operand(cols) for operand in operands]
+            result = functools.reduce(_and, (_truth(op(values[i], values[i + 1])) for i, op in enumerate(ops)))
+            unknown = functools.reduce(np.logical_or, (np.isnan(value) for value in values))
+            return np.where(unknown, np.nan, result)
+        return compare
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITH:
+        left, right, op = _compile(node.left, names), _compile(node.right, names), _ARITH[type(node.op)]
+        return lambda cols: op(left(cols), right(cols))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "abs" \
+            and len(node.args) == 1 and not node.keywords:
+        inner = _compile(node.args[0], names)
+        return lambda cols: np.abs(inner(cols))
+    if isinstance(node, ast.Name):
+        name = node.id.lower()
+        names.add(name)
+        return lambda cols: cols[name]
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        value = float(node.value)
+        return lambda cols: value
+    raise ValueError(f"Unsupported in a screen: {ast.unparse(node)!r}")
+
+
+@functools.lru_cache(maxsize=256)
+def compile_expression(expression):
+    """Compile once; returns ``(fn, referenced column names)``."""
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(f"Invalid expression: {exc.msg}") from None
+    names = set()
+    fn = _compile(tree, names)
+    return fn, tuple(sorted(names))
+
+
+class LatestTable:
+    """Column-per-field table of the latest value of every symbol."""
+
+    def __init__(self, capacity=1024):
+        self._capacity = capacity
+        self.size = 0
+        self.symbols = []
+        self._slots = {}
+        self.dates = np.full(capacity, np.iinfo("int64").min, dtype="int64")
+        self.columns = {}
+        self._synced = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, symbol):
+        return symbol.upper() in self._slots
+
+    def __repr__(self):
+        return f"LatestTable(symbols={self.size}, columns={len(self.columns)})"
+
+    def _grow(self, needed):
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self._capacity:
+            return
+        self.dates = np.concatenate([self.dates, np.full(capacity - self._capacity, np.iinfo("int64").min)])
+        for name, values in self.columns.items():
+            self.columns[name] = np.concatenate([values, np.full(capacity - self._capacity, np.nan)])
+        self._capacity = capacity
+
+    def _slot_array(self, symbols):
+        new = [s for s in dict.fromkeys(symbols) if s not in self._slots]
+        if new:
+            self._grow(self.size + len(new))
+            for symbol in new:
+                self._slots[symbol] = self.size
+                self.symbols.append(symbol)
+                self.size += 1
+        return np.fromiter((self._slots[s] for s in symbols), dtype="int64", count=len(symbols))
+
+    def _column(self, name):
+        values = self.columns.get(name)
+        if values is None:
+            values = self.columns[name] = np.full(self._capacity, np.nan)
+        return values
+
+    def update(self, symbols, values, dates=None):
+        """Set ``values`` (``{column: array aligned with symbols}``) for ``symbols``."""
+        symbols = [s.upper() for s in symbols]
+        with self._lock:
+            slots = self._slot_array(symbols)
+            for name, column in values.items():
+                self._column(name.lower())[slots] = np.asarray(column, dtype="float64")
+            if dates is not None:
+                self.dates[slots] = pd.DatetimeIndex(dates).values.astype("datetime64[ns]").astype("int64")
+        return self
+
+    def sync(self, snapshot):
+        """Copy the rows of a ``live.Snapshot`` that changed since the last sync."""
+        changed = {s: row for s, row in snapshot.rows.items() if self._synced.get(s) is not row}
+        if not changed:
+            return 0
+        symbols = list(changed)
+        fields = sorted({key for row in changed.values() for key in row if key != "date"})
+        values = {name: [float(changed[s].get(name, np.nan)) for s in symbols] for name in fields}
+        self.update(symbols, values, [changed[s]["date"] for s in symbols])
+        self._synced.update(changed)
+        return len(changed)
+
+    def load(self, close, specs=DEFAULT_SPECS, window=20, threshold=2.0):
+        """Fill from a dates x symbols close matrix in one vectorized pass."""
+        results = compute_indicators(close, specs)
+        results["anomaly_z"] = rolling_zscore(close, window)
+        last = close.notna().to_numpy()[::-1].argmax(axis=0)
+        rows = len(close) - 1 - last
+        cols = np.arange(close.shape[1])
+        values = {"close": close.to_numpy()[rows, cols]}
+        for name, frame in results.items():
+            values[name] = np.asarray(frame)[rows, cols]
+        values["anomaly"] = np.abs(values["anomaly_z"]) > threshold
+        return self.update(list(close.columns), values, close.index[rows])
+
+    @classmethod
+    def from_prices(cls, close, **kwargs):
+        return cls(capacity=max(1024, close.shape[1])).load(close, **kwargs)
+
+    def scan(self, expression, sort=None, ascending=True, limit=None):
+        """Symbols matching ``expression`` with the columns it references.
+
+        Unknown column names (in the expression or ``sort``) raise ``KeyError``.
+        """
+        fn, names = compile_expression(expression)
+        with self._lock:
+            n = self.size
+            shown = list(dict.fromkeys(names + ((sort.lower(),) if sort else ())))
+            missing = [name for name in shown if name not in self.columns]
+            if missing:
+                raise KeyError(f"Unknown column(s): {', '.join(missing)}; have {', '.join(sorted(self.columns))}")
+            cols = {name: self.columns[name][:n] for name in names}
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mask = np.broadcast_to(_truth(fn(cols)) == 1, (n,))
+            hits = np.flatnonzero(mask)
+            data = {name: self.columns[name][hits] for name in shown}
+            symbols = [self.symbols[i] for i in hits]
+        out = pd.DataFrame(data, index=pd.Index(symbols, name="Symbol"))
+        if sort:
+            out = out.sort_values(sort.lower(), ascending=ascending)
+        return out.head(limit) if limit else out
+
+    def frame(self):
+        with self._lock:
+            n = self.size
+            data = {name: values[:n].copy() for name, values in self.columns.items()}
+            data["date"] = self.dates[:n].astype("datetime64[ns]")
+            symbols = list(self.symbols)
+        return pd.DataFrame(data, index=pd.Index(symbols, name="Symbol"))
@@ -0,0 +1,274 @@
+"""Offline news sentiment: lexicon scoring, a score cache and daily aggregation.
+
+``LexiconScorer`` scores headline + description text against a small
+finance word list (Loughran-McDonald style). A batch becomes one sparse
+word-count matrix and one matrix-vector product; a negator right before a
+word ("not profitable", "no growth") flips it. Raw sums are squashed into
+[-1, 1].
+
+``ScoreCache`` keys scores by article URL (or a hash of the text when there
+is none), so an article is scored once however many refreshes return it.
+``daily_sentiment`` averages article scores per symbol per session, aligned
+to a price index so sentiment can be drawn over price and anomalies.
+
+``SentimentFeed`` fetches and scores on a background thread; readers only
+ever see the last finished result.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from . import telemetry
+
+log = logging.getLogger(__name__)
+
+POSITIVE = """
+    advance advanced advances beat beats benefit benefited boost boosted bullish
+    buyback climb climbed climbs confident exceed exceeded exceeds expand expanded
+    expansion favorable gain gained gains good great growth grew improve improved
+    improvement improves innovative jump jumped jumps lead leading outperform
+    outperformed outperforms optimistic profit profitable profits rally rallied
+    rallies rebound rebounded record recover recovered recovery rise rises rising
+    rose soar soared soars strong stronger strength success successful surge surged
+    surges upbeat upgrade upgraded upgrades win wins
+""".split()
+
+NEGATIVE = """
+    bankrupt bankruptcy bearish concern concerns crash crashed cut cuts decline
+    declined declines default deficit delay delayed disappoint disappointed
+    disappointing downgrade downgraded downgrades drop dropped drops fall fallen
+    falling falls fear fears fine fined fraud investigation lawsuit layoff layoffs
+    loss losses miss missed misses plunge plunged plunges probe recall recession
+    risk risks sank selloff shortfall sink slide slump slumped slumps slow slowdown
+    slower struggle struggles sue sued tumble tumbled tumbles uncertain uncertainty
+    underperform underperformed warn warned warning warns weak weaker weakness worse
+    worst
+""".split()
+
+NEGATORS = ["not", "no", "never", "without", "didn't", "doesn't", "isn't", "wasn't", "won't", "can't"]
+
+LEXICON = {**{word: 1.0 for word in POSITIVE}, **{word: -1.0 for word in NEGATIVE}}
+
+# VADER-style normalization: score = raw / sqrt(raw^2 + ALPHA)
+ALPHA = 15.0
+
+
+def article_text(article):
+    return " ".join(filter(None, (article.get("title"), article.get("description"))))
+
+
+def article_key(article):
+    """URL when present, otherwise a hash of the text."""
+    url = article.get("url")
+    if url:
+        return url
+    return "sha1:" + hashlib.sha1(article_text(article).encode("utf-8")).hexdigest()
+
+
+class LexiconScorer:
+    """Scores texts in [-1, 1]; positive means positive sentiment."""
+
+    def __init__(self, lexicon=LEXICON, negators=NEGATORS):
+        # Unigrams carry the word weight; "negator word" bigrams carry -2x so
+        # the pair nets out to the flipped weight.
+        vocabulary = dict(lexicon)
+        for word, weight in lexicon.items():
+            for negator in negators:
+                vocabulary[f"{negator} {word}"] = -2.0 * weight
+        self.terms = list(vocabulary)
+        self.weights = np.array(list(vocabulary.values()))
+        self._vectorizer = None
+
+    def _vectorize(self, texts):
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import CountVectorizer
+
+            self._vectorizer = CountVectorizer(vocabulary=self.terms, ngram_range=(1, 2),
+                                               token_pattern=r"(?u)\b\w[\w']*\b", dtype=np.float64)
+        return self._vectorizer.transform(texts)
+
+    @telemetry.timed("sentiment.score")
+    def score(self, texts):
+        texts = list(texts)
+        if not texts:
+            return np.zeros(0)
+        raw = self._vectorize(texts) @ self.weights
+        return raw / np.sqrt(raw * raw + ALPHA)
+
+
+class ScoreCache:
+    """Thread-safe LRU of ``{article key: score}``."""
+
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_many(self, keys):
+        with self._lock:
+            found = {}
+            for key in keys:
+                score = self._data.get(key)
+                if score is not None:
+                    self._data.move_to_end(key)
+                    found[key] = score
+        telemetry.count("cache_requests", len(found), cache="sentiment", result="hit")
+        telemetry.count("cache_requests", len(keys) - len(found), cache="sentiment", result="miss")
+        return found
+
+    def put_many(self, items):
+        with self._lock:
+            for key, score in items:
+                self._data[key] = score
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+def score_articles(articles, scorer, cache=None, batch_size=1000):
+    """Scores aligned with ``articles``; only articles missing from ``cache`` are scored."""
+    keys = [article_key(a) for a in articles]
+    known = cache.get_many(keys) if cache is not None else {}
+    todo = {}
+    for key, article in zip(keys, articles):
+        if key not in known and key not in todo:
+            todo[key] = article_text(article)
+    pending = list(todo.items())
+    for i in range(0, len(pending), batch_size):
+        batch = pending[i:i + batch_size]
+        scores = scorer.score(text for _, text in batch)
+        new = [(key, float(score)) for (key, _), score in zip(batch, scores)]
+        known.update(new)
+        if cache is not None:
+            cache.put_many(new)
+    return np.array([known[key] for key in keys], dtype="float64")
+
+
+def to_frame(articles, scores, symbol):
+    """One row per article: ``published`` (UTC, tz-naive), ``symbol``, ``score``, title, source, url, key."""
+    published = pd.to_datetime([a.get("publishedAt") for a in articles], utc=True, errors="coerce")
+    return pd.DataFrame({
+        "published": published.tz_localize(None),
+        "symbol": symbol,
+        "score": scores,
+        "title": [a.get("title") for a in articles],
+        "source": [(a.get("source") or {}).get("name") for a in articles],
+        "url": [a.get("url") for a in articles],
+        "key": [article_key(a) for a in articles],
+    })
+
+
+def daily_sentiment(scored, index):
+    """Mean score and article count per symbol per bar of ``index``.
+
+    Articles count toward the first bar on or after their publication date,
+    so weekend news lands on Monday; articles dated outside ``index`` are
+    dropped. Returns ``{"sentiment": frame, "articles": frame}``, both
+    ``index`` x symbols; bars without news have a NaN sentiment and a count
+    of 0.
+    """
+    index = pd.DatetimeIndex(index)
+    scored = scored.dropna(subset=["published"])
+    symbols = list(dict.fromkeys(scored["symbol"]))
+    days = scored["published"].dt.normalize().to_numpy()
+    bar = index.searchsorted(days)
+    inside = bar < len(index)
+    if len(index):
+        inside &= days >= index[0].normalize().to_datetime64()
+    groups = pd.DataFrame({"bar": bar[inside], "symbol": scored["symbol"].to_numpy()[inside],
+                           "score": scored["score"].to_numpy()[inside]})
+    stats = groups.groupby(["bar", "symbol"])["score"].agg(["mean", "count"])
+    out = {}
+    for field, column, fill in (("sentiment", "mean", np.nan), ("articles", "count", 0)):
+        wide = stats[column].unstack("symbol").reindex(index=range(len(index)), columns=symbols)
+        out[field] = pd.DataFrame(wide.fillna(fill).to_numpy(), index=index, columns=symbols)
+    out["articles"] = out["articles"].astype("int64")
+    return out
+
+
+class SentimentFeed:
+    """Fetch and score news for symbols in the background, keeping each symbol's history.
+
+    ``fetch_many(symbols)`` returns ``{symbol: [NewsAPI article dicts]}``.
+    ``refresh`` returns at once with the ``Future``s covering the symbols; a
+    symbol already being refreshed, or refreshed less than ``every`` seconds
+    ago, is not fetched again. ``frame`` returns what has been scored so far. Each symbol keeps at most ``max_articles``
+    of its newest articles.
+    """
+
+    def __init__(self, fetch_many, scorer=None, cache=None, max_articles=5000, batch_size=1000,
+                 every=300.0, clock=time.monotonic):
+        self.fetch_many = fetch_many
+        self.scorer = scorer or LexiconScorer()
+        self.cache = cache if cache is not None else ScoreCache()
+        self.max_articles = max_articles
+        self.batch_size = batch_size
+        self.every = every
+        self._clock = clock
+        self._refreshed = {}
+        self._frames = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentiment")
+
+    def refresh(self, symbols):
+        symbols = [s.upper() for s in symbols]
+        with self._lock:
+            now = self._clock()
+            mine = [s for s in symbols if s not in self._inflight
+                    and now - self._refreshed.get(s, -math.inf) >= self.every]
+            futures = {self._inflight[s] for s in symbols if s in self._inflight}
+            if mine:
+                future = self._pool.submit(self._refresh, mine)
+                for symbol in mine:
+                    self._inflight[symbol] = future
+                    self._refreshed[symbol] = now
+                futures.add(future)
+        return list(futures)
+
+    def _refresh(self, symbols):
+        try:
+            with telemetry.span("sentiment.refresh"):
+                fetched = self.fetch_many(symbols)
+                for symbol in symbols:
+                    articles = fetched.get(symbol) or []
+                    scores = score_articles(articles, self.scorer, self.cache, self.batch_size)
+                    self._merge(symbol, to_frame(articles, scores, symbol))
+        except Exception:
+            log.exception("sentiment refresh failed")
+            raise
+        finally:
+            with self._lock:
+                for symbol in symbols:
+                    self._inflight.pop(symbol, None)
+
+    def _merge(self, symbol, new):
+        with self._lock:
+            old = self._frames.get(symbol)
+        merged = new if old is None else pd.concat([old, new], ignore_index=True)
+        merged = merged.drop_duplicates("key", keep="last").sort_values("published", ascending=False)
+        with self._lock:
+            self._frames[symbol] = merged.head(self.max_articles).reset_index(drop=True)
+
+    def pending(self, symbols):
+        with self._lock:
+            return any(s.upper() in self._inflight for s in symbols)
+
+    def frame(self, symbols):
+        """Scored articles for ``symbols`` (newest first); never waits for a refresh."""
+        with self._lock:
+            frames = [self._frames[s.upper()] for s in symbols if s.upper() in self._frames]
+        if not frames:
+            return to_frame([], np.zeros(0), None)
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,303 @@
+"""Stateful O(1)-per-bar indicators for append-only price updates.
+
+Each indicator can be seeded from history, updated one bar at a time with
+``update(close)`` and round-tripped through ``state()`` / ``from_state()`` so a
+restarted process resumes without recomputing the full history. Outputs match
+``compute_indicators`` (and therefore ``utils.add_*``) on the same series.
+A NaN close leaves every value unchanged; EMAs still age their weight across
+it, as pandas' ``ewm`` does.
+"""
+
+import json
+import math
+
+from .indicators import DEFAULTS, parse_spec
+
+_KINDS = {}
+
+
+def _register(cls):
+    _KINDS[cls.__name__] = cls
+    return cls
+
+
+def from_state(state):
+    """Rebuild any streaming indicator from the dict produced by its ``state()``."""
+    state = dict(state)
+    return _KINDS[state.pop("kind")]._from_state(state)
+
+
+def dumps(indicators):
+    return json.dumps({name: ind.state() for name, ind in indicators.items()})
+
+
+def loads(text):
+    return {name: from_state(state) for name, state in json.loads(text).items()}
+
+
+class _Streaming:
+    def seed(self, closes):
+        for close in closes:
+            self.update(close)
+        return self
+
+    def state(self):
+        return {"kind": type(self).__name__, **self._state()}
+
+
+@_register
+class EMA(_Streaming):
+    """``adjust=False`` exponential moving average seeded by the first close.
+
+    ``weight`` is the relative weight of ``value``; each bar (NaN or not)
+    multiplies it by ``1 - alpha`` and each close resets it to 1, which is
+    how ``ewm(adjust=False)`` treats gaps.
+    """
+
+    def __init__(self, span, value=math.nan, weight=1.0):
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = value
+        self.weight = weight
+
+    def update(self, close):
+        if math.isnan(self.value):
+            if not math.isnan(close):
+                self.value = close
+            return self.value
+        self.weight *= 1.0 - self.alpha
+        if not math.isnan(close):
+            if close != self.value:
+                self.value = (self.weight * self.value + self.alpha * close) / (self.weight + self.alpha)
+            self.weight = 1.0
+        return self.value
+
+    def _state(self):
+        return {"span": self.span, "value": self.value, "weight": self.weight}
+
+    @classmethod
+    def _from_state(cls, state):
+        return cls(state["span"], state["value"], state.get("weight", 1.0))
+
+
+@_register
+class RollingStats(_Streaming):
+    """Rolling mean and sample std over a ring buffer with running sums.
+
+    Values are stored relative to the first close seen so the running sum of
+    squares keeps its precision, and the sums are rebuilt from the buffer
+    every time the ring wraps to bound floating-point drift.
+    """
+
+    def __init__(self, window, buffer=None, pos=0, count=0, shift=None):
+        self.window = window
+        self.buffer = list(buffer) if buffer is not None else [0.0] * window
+        self.pos = pos
+        self.count = count
+        self.shift = shift
+        self._resum()
+
+    def _resum(self):
+        live = self.buffer[:self.count] if self.count < self.window else self.buffer
+        self.total = math.fsum(live)
+        self.squares = math.fsum(v * v for v in live)
+
+    def update(self, close):
+        if not math.isnan(close):
+            if self.shift is None:
+                self.shift = close
+            value = close - self.shift
+            old = self.buffer[self.pos]
+            if self.count == self.window:
+                self.total -= old
+                self.squares -= old * old
+            else:
+                self.count += 1
+            self.buffer[self.pos] = value
+            self.total += value
+            self.squares += value * value
+            self.pos = (self.pos + 1) % self.window
+            if self.pos == 0:
+                self._resum()
+        return self.mean
+
+    @property
+    def ready(self):
+        return self.count == self.window
+
+    @property
+    def mean(self):
+        if not self.ready:
+            return math.nan
+        return self.shift + self.total / self.window
+
+    @property
+    def std(self):
+        if not self.ready or self.window < 2:
+            return math.nan
+        var = (self.squares - self.total * self.total / self.window) / (self.window - 1)
+        return math.sqrt(max(var, 0.0))
+
+    def _state(self):
+        return {"window": self.window, "buffer": self.buffer, "pos": self.pos,
+                "count": self.count, "shift": self.shift}
+
+    @classmethod
+    def _from_state(cls, state):
+        return cls(**state)
+
+
+@_register
+class RSI(_Streaming):
+    """Simple-average RSI: rolling means of gains and losses over ``window`` bars."""
+
+    def __init__(self, window=14, gains=None, losses=None, last=math.nan):
+        self.window = window
+        self.gains = gains or RollingStats(window)
+        self.losses = losses or RollingStats(window)
+        self.last = last
+
+    def update(self, close):
+        if not math.isnan(close):
+            # The first bar has no previous close and counts as no change,
+            # like ``diff().where(...)`` filling the leading NaN with 0.
+            delta = 0.0 if math.isnan(self.last) else close - self.last
+            self.gains.update(max(delta, 0.0))
+            self.losses.update(max(-delta, 0.0))
+            self.last = close
+        return self.value
+
+    @property
+    def value(self):
+        gain, loss = self.gains.mean, self.losses.mean
+        if math.isnan(gain) or math.isnan(loss) or (gain == 0 and loss == 0):
+            return math.nan
+        if loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + gain / loss)
+
+    def _state(self):
+        return {"window": self.window, "gains": self.gains.state(),
+                "losses": self.losses.state(), "last": self.last}
+
+    @classmethod
+    def _from_state(cls, state):
+        return cls(state["window"], from_state(state["gains"]),
+                   from_state(state["losses"]), state["last"])
+
+
+@_register
+class MACD(_Streaming):
+    """MACD line and signal line; ``update`` returns ``(macd, signal)``."""
+
+    def __init__(self, fast=12, slow=26, signal=9, emas=None):
+        self.fast, self.slow, self.signal = fast, slow, signal
+        self.emas = emas or [EMA(fast), EMA(slow), EMA(signal)]
+
+    def update(self, close):
+        # Like the batch MACD line, the line carries through a NaN close and
+        # the signal EMA sees that carried value as a bar.
+        fast, slow, signal = self.emas
+        signal.update(fast.update(close) - slow.update(close))
+        return self.value
+
+    @property
+    def value(self):
+        fast, slow, signal = self.emas
+        return fast.value - slow.value, signal.value
+
+    def _state(self):
+        return {"fast": self.fast, "slow": self.slow, "signal": self.signal,
+                "emas": [ema.state() for ema in self.emas]}
+
+    @classmethod
+    def _from_state(cls, state):
+        return cls(state["fast"], state["slow"], state["signal"],
+                   [from_state(s) for s in state["emas"]])
+
+
+@_register
+class BollingerBands(_Streaming):
+    """Rolling mean +/- ``num_std`` sample deviations; ``update`` returns ``(upper, lower)``."""
+
+    def __init__(self, window=20, num_std=2.0, stats=None):
+        self.window = window
+        self.num_std = num_std
+        self.stats = stats or RollingStats(window)
+
+    def update(self, close):
+        self.stats.update(close)
+        return self.value
+
+    @property
+    def value(self):
+        mean, width = self.stats.mean, self.stats.std * self.num_std
+        return mean + width, mean - width
+
+    def _state(self):
+        return {"window": self.window, "num_std": self.num_std, "stats": self.stats.state()}
+
+    @classmethod
+    def _from_state(cls, state):
+        return cls(state["window"], state["num_std"], from_state(state["stats"]))
+
+
+def _from_spec(spec):
+    name, args = parse_spec(spec)
+    if name == "rsi":
+        return RSI(*args)
+    if name == "ema":
+        return EMA(*args)
+    if name == "ma":
+        return RollingStats(*args)
+    if name == "bb":
+        return BollingerBands(*args)
+    return MACD(*args)
+
+
+def _named(spec, indicator):
+    name, args = parse_spec(spec)
+    if name == "rsi":
+        return {f"rsi{args[0]}": indicator.value}
+    if name == "ema":
+        return {f"ema{args[0]}": indicator.value}
+    if name == "ma":
+        return {f"ma{args[0]}": indicator.mean}
+    if name == "bb":
+        upper, lower = indicator.value
+        return {f"bb{args[0]}_upper": upper, f"bb{args[0]}_lower": lower}
+    suffix = "" if args == DEFAULTS["macd"] else "_{}_{}_{}".format(*args)
+    macd, signal = indicator.value
+    return {f"macd{suffix}": macd, f"macd_signal{suffix}": signal}
+
+
+@_register
+class IndicatorSet(_Streaming):
+    """Indicators for a list of spec strings, updated together.
+
+    ``update`` returns ``{name: value}`` using the same names as
+    ``compute_indicators``.
+    """
+
+    def __init__(self, specs, members=None):
+        self.specs = list(specs)
+        self.members = members or [_from_spec(spec) for spec in self.specs]
+
+    def update(self, close):
+        for member in self.members:
+            member.update(close)
+        return self.value
+
+    @property
+    def value(self):
+        out = {}
+        for spec, member in zip(self.specs, self.members):
+            out.update(_named(spec, member))
+        return out
+
+    def _state(self):
+        return {"specs": self.specs, "members": [member.state() for member in self.members]}
+
+    @classmethod
+    def _from_state(cls, state):
+        return cls(state["specs"], [from_state(s) for s in state["members"]])
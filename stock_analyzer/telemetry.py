@@ -0,0 +1,198 @@
+"""Opt-in timing spans and counters for the data, analytics and page code.
+
+Off unless ``STOCK_ANALYZER_TELEMETRY=1`` is set or ``enable()`` is called.
+While off, ``span`` returns a shared no-op context manager and ``count``
+returns immediately, so instrumented code pays one global lookup per call.
+
+While on, every span adds to a per-name count/total/max summary, and spans
+opened under ``begin(name)`` (one call per page rerun) are also recorded on
+that trace so a rerun can be drawn as a waterfall. Counters are labelled
+totals (cache hits and misses, rows and bytes fetched). ``prometheus()``
+renders everything in the Prometheus text exposition format.
+"""
+
+import contextvars
+import functools
+import numbers
+import os
+import threading
+import time
+from collections import deque
+
+_enabled = os.environ.get("STOCK_ANALYZER_TELEMETRY", "") not in ("", "0")
+_lock = threading.Lock()
+_counters = {}
+_spans = {}
+_traces = deque(maxlen=50)
+_current = contextvars.ContextVar("stock_analyzer_trace", default=None)
+
+
+def enabled():
+    return _enabled
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _spans.clear()
+        _traces.clear()
+
+
+class Trace:
+    """Spans recorded during one page rerun, as ``(name, offset, seconds, depth)``."""
+
+    __slots__ = ("name", "started", "start", "spans", "depth")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self.depth = 0
+
+    def __repr__(self):
+        return f"Trace({self.name!r}, spans={len(self.spans)})"
+
+    @property
+    def seconds(self):
+        return max((offset + seconds for _, offset, seconds, _ in self.spans), default=0.0)
+
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _Noop()
+
+
+class _Span:
+    __slots__ = ("name", "trace", "start", "depth")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.trace = _current.get()
+        if self.trace is not None:
+            self.depth = self.trace.depth
+            self.trace.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        with _lock:
+            stats = _spans.get(self.name)
+            if stats is None:
+                _spans[self.name] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+        if self.trace is not None:
+            self.trace.depth -= 1
+            self.trace.spans.append((self.name, self.start - self.trace.start, seconds, self.depth))
+        return False
+
+
+def span(name):
+    """Context manager timing the block as ``name``."""
+    return _Span(name) if _enabled else _NOOP
+
+
+def timed(name):
+    """Decorator form of ``span``."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def count(name, value=1, **labels):
+    """Add ``value`` to the counter ``name`` with ``labels``."""
+    if not _enabled:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def begin(name):
+    """Start a new trace for the current thread/context; spans opened after it land on it."""
+    if not _enabled:
+        _current.set(None)
+        return None
+    trace = Trace(name)
+    _current.set(trace)
+    with _lock:
+        _traces.append(trace)
+    return trace
+
+
+def traces():
+    with _lock:
+        return list(_traces)
+
+
+def counters():
+    """``{(name, labels): value}`` snapshot."""
+    with _lock:
+        return dict(_counters)
+
+
+def span_stats():
+    """``{name: (count, total_seconds, max_seconds)}`` snapshot."""
+    with _lock:
+        return {name: tuple(stats) for name, stats in _spans.items()}
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+                    for k, v in pairs)
+    return "{" + body + "}"
+
+
+def _number(value):
+    """Exact text for a sample: integers as-is, floats at full precision."""
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    return repr(float(value))
+
+
+def prometheus(prefix="stock_analyzer"):
+    """All counters and span summaries in the Prometheus text format."""
+    lines = []
+    by_name = {}
+    for (name, labels), value in sorted(counters().items()):
+        by_name.setdefault(name, []).append((labels, value))
+    for name, series in by_name.items():
+        lines.append(f"# TYPE {prefix}_{name}_total counter")
+        lines.extend(f"{prefix}_{name}_total{_labels(labels)} {_number(value)}" for labels, value in series)
+    stats = sorted(span_stats().items())
+    if stats:
+        lines.append(f"# TYPE {prefix}_span_seconds summary")
+        for name, (n, total, _) in stats:
+            lines.append(f"{prefix}_span_seconds_sum{_labels([('span', name)])} {total:.6f}")
+            lines.append(f"{prefix}_span_seconds_count{_labels([('span', name)])} {n}")
+        lines.append(f"# TYPE {prefix}_span_seconds_max gauge")
+        lines.extend(f"{prefix}_span_seconds_max{_labels([('span', name)])} {peak:.6f}"
+                     for name, (_, _, peak) in stats)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,72 @@
+import datetime
+
+import pandas as pd
+
+from stock_analyzer.anomalies import FEATURE_WARMUP, IsolationForestDetector, detect
+from stock_analyzer.synthetic import SyntheticProvider
+
+
+class CountingDetector(IsolationForestDetector):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.fits = 0
+        self.scored = 0
+
+    def _fit(self, feats):
+        self.fits += 1
+        entry = super()._fit(feats)
+        model = entry["model"]
+        decision_function = model.decision_function
+
+        def counted(x):
+            self.scored += len(x)
+            return decision_function(x)
+
+        model.decision_function = counted
+        return entry
+
+
+def prices():
+    return SyntheticProvider().fetch("AAPL", datetime.date(2018, 1, 1), datetime.date(2024, 1, 1))
+
+
+def score(df, detector):
+    return detect(df, "isolation_forest", symbol="AAPL", detector=detector)
+
+
+def test_isolation_forest_flags_do_not_depend_on_call_order():
+    df = prices()
+    fresh = score(df, IsolationForestDetector(window=252))
+
+    detector = IsolationForestDetector(window=252)
+    score(df.iloc[:30], detector)
+    score(df.iloc[-300:], detector)
+    reused = score(df, detector)
+
+    pd.testing.assert_frame_equal(reused, fresh)
+    assert len(detector._models) == 1
+
+
+def test_appended_bars_reuse_the_model_and_only_score_new_rows():
+    df = prices()
+    detector = CountingDetector(window=252)
+    # Find a cut whose next three bars fall in the same refit period.
+    n = next(n for n in range(len(df) - 3, 0, -1)
+             if detector._training_rows(df.index[:n]) == detector._training_rows(df.index[:n + 3]))
+    score(df.iloc[:n], detector)
+    assert (detector.fits, detector.scored) == (1, n)
+
+    extended = score(df.iloc[:n + 3], detector)
+    # The warm-up rows depend on where the frame starts and are always rescored.
+    assert (detector.fits, detector.scored) == (1, n + 3 + FEATURE_WARMUP)
+    pd.testing.assert_frame_equal(extended, score(df.iloc[:n + 3], IsolationForestDetector(window=252)))
+
+
+def test_model_is_refitted_once_the_cutoff_moves():
+    df = prices()
+    detector = CountingDetector(window=252, refit_every=21)
+    score(df.iloc[:-60], detector)
+    extended = score(df, detector)
+    assert detector.fits == 2
+    assert len(detector._models) == 1
+    pd.testing.assert_frame_equal(extended, score(df, IsolationForestDetector(window=252)))
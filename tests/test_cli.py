@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from stock_analyzer.cli import main
+
+
+def test_unknown_indicator_is_rejected_before_fetching(tmp_path, capsys):
+    out = tmp_path / "out.csv"
+    with pytest.raises(SystemExit) as exit:
+        main(["analyze", "--symbols", "AAPL,MSFT", "--indicators", "rsi,foo", "--provider", "synthetic",
+              "--store", str(tmp_path / "store"), "--out", str(out)])
+    assert exit.value.code == 2
+    assert "Unknown indicator: 'foo'" in capsys.readouterr().err
+    assert not out.exists()
+    assert not (tmp_path / "store").exists()
+
+
+def test_too_many_indicator_arguments_are_rejected(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main(["analyze", "--symbols", "AAPL", "--indicators", "rsi:14:2", "--out", str(tmp_path / "out.csv")])
+    assert "Too many arguments for rsi" in capsys.readouterr().err
+
+
+def test_analyze_writes_one_block_per_symbol(tmp_path):
+    out = tmp_path / "out.csv"
+    code = main(["analyze", "--symbols", "AAPL,MSFT", "--indicators", "rsi, ma:50", "--anomalies",
+                 "--start", "2021-01-01", "--end", "2022-01-01", "--processes", "1",
+                 "--provider", "synthetic", "--store", str(tmp_path / "store"), "--out", str(out)])
+    assert code == 0
+    frame = pd.read_csv(out)
+    assert set(frame["Symbol"]) == {"AAPL", "MSFT"}
+    assert {"rsi14", "ma50", "anomaly"} <= set(frame.columns)
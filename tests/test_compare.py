@@ -0,0 +1,34 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from stock_analyzer.compare import ComparisonCache, RollingCorrelation, log_return_matrix
+from stock_analyzer.synthetic import SyntheticProvider
+
+SYMBOLS = ["AAPL", "MSFT", "SPY"]
+
+
+def prices():
+    frames = SyntheticProvider().fetch_many(SYMBOLS, datetime.date(2022, 1, 1), datetime.date(2023, 1, 1))
+    return pd.DataFrame({symbol: frame["Close"] for symbol, frame in frames.items()})
+
+
+def expected(prices, window):
+    return RollingCorrelation(SYMBOLS, window).seed(log_return_matrix(prices)).corr()
+
+
+def test_short_range_does_not_reuse_a_longer_window():
+    close = prices()
+    cache = ComparisonCache()
+    cache.get(close.iloc[-120:], window=60)
+    _, corr = cache.get(close.iloc[-41:], window=60)
+    np.testing.assert_allclose(corr, expected(close.iloc[-41:], 60))
+
+
+def test_cached_engine_slides_to_new_bars():
+    close = prices()
+    cache = ComparisonCache()
+    cache.get(close.iloc[:-5], window=60)
+    _, corr = cache.get(close, window=60)
+    np.testing.assert_allclose(corr, expected(close, 60))
@@ -0,0 +1,33 @@
+import datetime
+
+import numpy as np
+
+from stock_analyzer.forecast import ModelStore, RidgeForecaster
+from stock_analyzer.synthetic import SyntheticProvider
+
+
+def closes():
+    return SyntheticProvider().fetch("AAPL", datetime.date(2015, 1, 1), datetime.date(2024, 1, 1))["Close"]
+
+
+def test_model_store_update_matches_a_full_fit(tmp_path):
+    close = closes()
+    store = ModelStore(str(tmp_path))
+    store.updated("AAPL", close.iloc[:1000])
+    model = store.updated("AAPL", close)
+    fresh = RidgeForecaster().update(close)
+    np.testing.assert_allclose(model.coefficients()[0], fresh.coefficients()[0])
+    assert model.trained_through == fresh.trained_through
+
+
+def test_model_store_does_not_use_bars_after_an_earlier_end(tmp_path):
+    close = closes()
+    store = ModelStore(str(tmp_path))
+    store.updated("AAPL", close)
+    past = close.iloc[:1000]
+
+    model = store.updated("AAPL", past)
+    assert model.trained_through <= past.index[-1].value
+    np.testing.assert_allclose(model.coefficients()[0], RidgeForecaster().update(past).coefficients()[0])
+    # The stored model keeps its full history.
+    assert store.load("AAPL", 5, 10).trained_through == RidgeForecaster().update(close).trained_through
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_analyzer.intervals import base_interval, max_lookback_days, resample
+
+
+def ns(*stamps):
+    return pd.DatetimeIndex(stamps).values.astype("datetime64[ns]").astype("int64")
+
+
+def bars(dates):
+    """OHLCV rows where row ``i`` has open ``i``, high ``i + 10``, low ``i - 10``, close ``i + 0.5``, volume 1."""
+    i = np.arange(len(dates), dtype="float64")
+    return np.column_stack([i, i + 10, i - 10, i + 0.5, np.ones_like(i)])
+
+
+@pytest.mark.parametrize("interval, base, expected", [
+    ("1d", "5m", "1d"),
+    ("1wk", "5m", "1d"),
+    ("1h", "5m", "5m"),
+    ("15m", "5m", "5m"),
+    ("5m", "5m", "5m"),
+    ("1m", "5m", "1m"),
+    ("2m", "5m", "2m"),
+    ("1h", "15m", "15m"),
+    ("5m", "15m", "5m"),
+])
+def test_base_interval(interval, base, expected):
+    assert base_interval(interval, base) == expected
+
+
+def test_unknown_interval_is_rejected():
+    with pytest.raises(ValueError, match="Unknown interval"):
+        base_interval("3h")
+
+
+def test_max_lookback_uses_the_stored_resolution():
+    assert max_lookback_days("1h", base="5m") == 60
+    assert max_lookback_days("1h", base="1h") == 730
+    assert max_lookback_days("1m") == 30
+    assert max_lookback_days("1d") is None
+    assert max_lookback_days("1wk") is None
+
+
+def test_hourly_bars_from_five_minute_bars():
+    dates = ns(*pd.date_range("2024-01-02 14:30", "2024-01-02 16:25", freq="5min"))
+    values = bars(dates)
+    out_dates, out = resample(dates, values, "1h")
+    assert list(pd.to_datetime(out_dates)) == list(pd.to_datetime(["2024-01-02 14:00", "2024-01-02 15:00",
+                                                                  "2024-01-02 16:00"]))
+    # 14:30-14:55 is rows 0-5, 15:00-15:55 rows 6-17, 16:00-16:25 rows 18-23.
+    np.testing.assert_array_equal(out[:, 0], [0, 6, 18])
+    np.testing.assert_array_equal(out[:, 1], [15, 27, 33])
+    np.testing.assert_array_equal(out[:, 2], [-10, -4, 8])
+    np.testing.assert_array_equal(out[:, 3], [5.5, 17.5, 23.5])
+    np.testing.assert_array_equal(out[:, 4], [6, 12, 6])
+
+
+def test_weekly_bars_start_on_monday():
+    # Thu 2024-01-04 .. Tue 2024-01-16; weeks start Mon 01-01, 01-08 and 01-15.
+    dates = ns(*pd.bdate_range("2024-01-04", "2024-01-16"))
+    out_dates, out = resample(dates, bars(dates), "1wk")
+    labels = pd.to_datetime(out_dates)
+    assert list(labels) == list(pd.to_datetime(["2024-01-01", "2024-01-08", "2024-01-15"]))
+    assert (labels.dayofweek == 0).all()
+    np.testing.assert_array_equal(out[:, 0], [0, 2, 7])
+    np.testing.assert_array_equal(out[:, 3], [1.5, 6.5, 8.5])
+    np.testing.assert_array_equal(out[:, 4], [2, 5, 2])
+
+
+def test_resample_keeps_nan_volume_out_of_sums_and_handles_empty_input():
+    dates = ns("2024-01-02", "2024-01-03")
+    values = bars(dates)
+    values[1, 4] = np.nan
+    _, out = resample(dates, values, "1wk")
+    assert out[0, 4] == 1
+    out_dates, out = resample(np.empty(0, "int64"), np.empty((0, 5)), "1h")
+    assert out_dates.shape == (0,) and out.shape == (0, 5)
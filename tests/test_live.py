@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+
+from stock_analyzer.indicators import compute_indicators
+from stock_analyzer.live import DEFAULT_SPECS, SimulatedSource, Watchlist
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_refresh_publishes_streamed_indicators():
+    source = SimulatedSource(history=200)
+    live = Watchlist(source, clock=Clock())
+    live.watch(["aapl", "MSFT"])
+    assert live.symbols == ["AAPL", "MSFT"]
+
+    snapshot = live.refresh()
+    assert snapshot.version == 1
+    assert source.calls == 1
+    for symbol in ("AAPL", "MSFT"):
+        history = source.history(symbol)
+        row = snapshot.get(symbol)
+        assert row["date"] == history.index[-1]
+        expected = compute_indicators(history, DEFAULT_SPECS)
+        for name in ("rsi14", "macd", "macd_signal", "bb20_upper", "ema20", "ma50"):
+            np.testing.assert_allclose(row[name], expected[name].iloc[-1], rtol=1e-9)
+
+
+def test_each_poll_advances_one_bar():
+    source = SimulatedSource(history=100)
+    live = Watchlist(source, clock=Clock())
+    live.watch(["AAPL"])
+    first = live.refresh().get("AAPL")
+    second = live.refresh().get("AAPL")
+    assert second["date"] - first["date"] == source.freq
+    assert second["close"] == source.history("AAPL").iloc[-1]
+    assert live.snapshot().version == 2
+
+
+def test_unrenewed_watches_expire():
+    clock = Clock()
+    live = Watchlist(SimulatedSource(history=60), ttl=100, clock=clock)
+    live.watch(["AAPL", "TYPO"])
+    live.refresh()
+    clock.now = 50
+    live.watch(["AAPL"])
+    clock.now = 120
+    assert live.symbols == ["AAPL"]
+
+    assert live.expire() == ["TYPO"]
+    assert live.snapshot().get("TYPO") is None
+    assert live.snapshot().get("AAPL") is not None
+    clock.now = 200
+    assert live.symbols == []
+
+
+def test_background_poller_publishes_until_stopped():
+    source = SimulatedSource(history=60)
+    live = Watchlist(source, every=0.01)
+    live.watch(["AAPL"])
+    live.start()
+    deadline = time.monotonic() + 5
+    while live.snapshot().version < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    live.stop(timeout=5)
+    assert live.snapshot().version >= 3
+    calls = source.calls
+    time.sleep(0.05)
+    assert source.calls == calls
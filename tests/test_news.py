@@ -0,0 +1,84 @@
+import json
+
+import pytest
+import requests
+
+from stock_analyzer.news import NewsClient
+
+ARTICLES = [
+    {"title": "Apple beats estimates", "url": "https://example.com/1", "publishedAt": "2024-01-02T10:00:00Z"},
+    {"title": "Apple beats estimates", "url": "https://example.com/1", "publishedAt": "2024-01-02T10:00:00Z"},
+    {"title": "Apple shares slide", "url": "https://example.com/2", "publishedAt": "2024-01-01T10:00:00Z"},
+]
+
+
+def response(status=200, body=None, headers=None):
+    out = requests.Response()
+    out.status_code = status
+    out._content = b"" if body is None else json.dumps(body).encode()
+    out.headers.update(headers or {})
+    out.url = "https://newsapi.test/v2/everything"
+    return out
+
+
+class StubSession:
+    """Replays queued responses (or raises queued exceptions) and records each request."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append({"url": url, "params": params, "headers": headers, "timeout": timeout})
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def client(session, **kwargs):
+    return NewsClient("key", base_url="https://newsapi.test/v2", rate=1000, burst=1000,
+                      session=session, **kwargs)
+
+
+def test_fetch_caches_and_dedupes():
+    session = StubSession(response(body={"articles": ARTICLES}))
+    news = client(session, timeout=3)
+    first = news.fetch("aapl")
+    assert [a["url"] for a in first] == ["https://example.com/1", "https://example.com/2"]
+    assert news.fetch("AAPL") == first
+    assert len(session.requests) == 1
+    request = session.requests[0]
+    assert request["params"] == {"q": "aapl", "sortBy": "publishedAt", "pageSize": 20}
+    assert request["headers"]["X-Api-Key"] == "key"
+    assert request["timeout"] == 3
+
+
+def test_stale_entry_is_revalidated_with_etag():
+    session = StubSession(response(body={"articles": ARTICLES}, headers={"ETag": '"v1"'}),
+                          response(status=304))
+    news = client(session, ttl=0)
+    first = news.fetch("AAPL")
+    assert news.fetch("AAPL") == first
+    assert session.requests[1]["headers"]["If-None-Match"] == '"v1"'
+
+
+def test_timeout_raises_and_is_not_cached():
+    session = StubSession(requests.Timeout("read timed out"), response(body={"articles": ARTICLES}))
+    news = client(session)
+    with pytest.raises(requests.Timeout):
+        news.fetch("AAPL")
+    assert len(news.fetch("AAPL")) == 2
+
+
+@pytest.mark.parametrize("status", [401, 429, 500])
+def test_http_errors_raise(status):
+    news = client(StubSession(response(status=status, body={"status": "error"})))
+    with pytest.raises(requests.HTTPError):
+        news.fetch("AAPL")
+
+
+def test_fetch_many_maps_failures_to_empty_lists():
+    session = StubSession(response(status=429, body={"status": "error"}), requests.ConnectionError("reset"))
+    news = client(session, max_workers=1)
+    assert news.fetch_many(["AAPL", "MSFT"]) == {"AAPL": [], "MSFT": []}
@@ -0,0 +1,86 @@
+import pandas as pd
+
+from stock_analyzer.price_store import PriceStore, empty_frame
+from stock_analyzer.synthetic import SyntheticProvider
+
+
+class FlakyProvider:
+    """Returns an empty frame (like a failed ``yf.download``) for the first ``failures`` calls."""
+
+    def __init__(self, failures=1):
+        self.failures = failures
+        self.calls = 0
+        self.inner = SyntheticProvider()
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return empty_frame()
+        return self.inner.fetch(symbol, start, end, interval)
+
+
+class CountingProvider:
+    """Records the ``[start, end)`` of every fetch."""
+
+    def __init__(self):
+        self.calls = []
+        self.inner = SyntheticProvider()
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        self.calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        return self.inner.fetch(symbol, start, end, interval)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_empty_response_is_not_cached_as_covered(tmp_path):
+    provider, clock = FlakyProvider(), Clock()
+    store = PriceStore(str(tmp_path), provider, empty_ttl=60, clock=clock)
+
+    assert store.get("AAPL", "2021-01-04", "2021-02-01").empty
+    assert store.covered("AAPL") == []
+
+    # Within the TTL the empty answer is reused instead of hitting the provider again.
+    assert store.get("AAPL", "2021-01-04", "2021-02-01").empty
+    assert provider.calls == 1
+
+    clock.now = 61
+    frame = store.get("AAPL", "2021-01-04", "2021-02-01")
+    assert len(frame) == 20
+    assert provider.calls == 2
+    assert store.get("AAPL", "2021-01-04", "2021-02-01").equals(frame)
+    assert provider.calls == 2
+
+
+def test_coverage_stops_at_last_returned_bar(tmp_path):
+    provider = FlakyProvider(failures=0)
+    fetch = provider.inner.fetch
+    # The provider only has bars through Friday 2021-01-22.
+    provider.inner.fetch = lambda symbol, start, end, interval="1d": fetch(symbol, start, "2021-01-23", interval)
+    store = PriceStore(str(tmp_path), provider)
+    store.get("AAPL", "2021-01-04", "2021-01-28")
+    assert store.covered("AAPL") == [[pd.Timestamp("2021-01-04"), pd.Timestamp("2021-01-23")]]
+
+
+def test_trailing_weekend_is_covered(tmp_path):
+    store = PriceStore(str(tmp_path), FlakyProvider(failures=0))
+    # The last bar is Friday 2021-01-29; the weekend after it has no bars to wait for.
+    store.get("AAPL", "2021-01-04", "2021-02-01")
+    assert store.covered("AAPL") == [[pd.Timestamp("2021-01-04"), pd.Timestamp("2021-02-01")]]
+
+
+def test_extending_a_range_fetches_only_the_new_days(tmp_path):
+    provider = CountingProvider()
+    store = PriceStore(str(tmp_path), provider)
+    five_years = store.get("AAPL", "2019-01-01", "2024-01-01")
+    assert len(provider.calls) == 1
+
+    frame = store.get("AAPL", "2019-01-01", "2024-01-02")
+    assert provider.calls[1:] == [(pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-02"))]
+    assert frame.loc[:"2023-12-31"].equals(five_years)
@@ -0,0 +1,78 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from stock_analyzer.price_store import PriceStore, YFinanceProvider
+from stock_analyzer.providers import FallbackProvider, ProviderError, RetryingProvider
+from stock_analyzer.synthetic import SyntheticProvider
+
+START, END = datetime.date(2021, 1, 4), datetime.date(2021, 2, 1)
+
+
+class FailingProvider:
+    """Raises for the first ``failures`` calls, then serves synthetic bars."""
+
+    def __init__(self, failures=1):
+        self.failures = failures
+        self.calls = 0
+        self.inner = SyntheticProvider()
+
+    def fetch(self, symbol, start, end, interval="1d"):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("connection reset")
+        return self.inner.fetch(symbol, start, end, interval)
+
+
+def test_retry_recovers_and_store_caches_the_result(tmp_path):
+    flaky = FailingProvider(failures=2)
+    sleeps = []
+    store = PriceStore(root=str(tmp_path), provider=RetryingProvider(flaky, sleep=sleeps.append))
+
+    assert len(store.get("AAPL", START, END)) == 20
+    assert flaky.calls == 3
+    assert len(sleeps) == 2
+    assert len(store.get("AAPL", START, END)) == 20
+    assert flaky.calls == 3
+
+
+def test_retry_gives_up_with_provider_error():
+    flaky = FailingProvider(failures=5)
+    with pytest.raises(ProviderError, match="after 3 attempts"):
+        RetryingProvider(flaky, sleep=lambda _: None).fetch("AAPL", START, END)
+    assert flaky.calls == 3
+
+
+def test_fallback_moves_past_a_failing_provider(tmp_path):
+    broken = FailingProvider(failures=10)
+    store = PriceStore(root=str(tmp_path), provider=FallbackProvider([broken, SyntheticProvider()]))
+    assert len(store.get("AAPL", START, END)) == 20
+    assert broken.calls == 1
+
+
+class FakeTicker:
+    def __init__(self, error):
+        self.error = error
+
+    def history(self, **kwargs):
+        assert kwargs["raise_errors"]
+        raise self.error
+
+
+def test_yfinance_download_errors_raise(monkeypatch):
+    import yfinance as yf
+
+    monkeypatch.setattr(yf, "Ticker", lambda symbol: FakeTicker(ConnectionError("timed out")))
+    with pytest.raises(ConnectionError):
+        YFinanceProvider().fetch("AAPL", START, END)
+
+
+def test_yfinance_missing_prices_are_empty(monkeypatch):
+    import yfinance as yf
+    from yfinance.exceptions import YFPricesMissingError
+
+    monkeypatch.setattr(yf, "Ticker", lambda symbol: FakeTicker(YFPricesMissingError(symbol, "")))
+    frame = YFinanceProvider().fetch("AAPL", START, END)
+    assert frame.empty
+    assert isinstance(frame.index, pd.DatetimeIndex)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from stock_analyzer.screener import LatestTable, compile_expression
+
+
+def table():
+    return LatestTable().update(["AAA", "BBB", "CCC", "DDD"], {
+        "close": [10.0, 20.0, 30.0, np.nan],
+        "rsi14": [25.0, 50.0, np.nan, 20.0],
+        "ma50": [9.0, 25.0, 28.0, 5.0],
+    })
+
+
+def matches(expression, **kwargs):
+    return list(table().scan(expression, **kwargs).index)
+
+
+@pytest.mark.parametrize("expression", [
+    "close.__class__",
+    "close.real > 1",
+    "__import__('os')",
+    "abs.__self__",
+    "max(close, 1) > 2",
+    "abs(close, 1) > 2",
+    "abs(x=close) > 2",
+    "(lambda: 1)()",
+    "close[0] > 1",
+    "'text' == close",
+    "close if rsi14 else ma50",
+    "[c for c in close]",
+    "close ** 2 > 1",
+    "close in (1, 2)",
+])
+def test_unsupported_syntax_is_rejected(expression):
+    with pytest.raises(ValueError, match="Unsupported"):
+        compile_expression(expression)
+
+
+def test_invalid_syntax_is_a_value_error():
+    with pytest.raises(ValueError, match="Invalid expression"):
+        compile_expression("close >")
+
+
+def test_unknown_names_raise_key_error():
+    with pytest.raises(KeyError, match="nope"):
+        table().scan("nope > 1")
+    with pytest.raises(KeyError, match="open"):
+        table().scan("close > 1", sort="open")
+
+
+def test_unknown_sort_does_not_add_a_column():
+    t = table()
+    with pytest.raises(KeyError):
+        t.scan("close > 1", sort="nope")
+    assert "nope" not in t.columns
+
+
+def test_scan_matches_and_sorts():
+    assert matches("rsi14 < 30 and close > ma50") == ["AAA"]
+    assert matches("close > ma50 or rsi14 > 40", sort="close", ascending=False) == ["CCC", "BBB", "AAA"]
+    assert matches("10 <= CLOSE < 30") == ["AAA", "BBB"]
+    assert matches("abs(close - ma50) / close > 0.05 and not rsi14 > 40") == ["AAA"]
+
+
+def test_nan_never_matches_a_comparison():
+    assert matches("close > 0") == ["AAA", "BBB", "CCC"]
+    assert matches("rsi14 != 50") == ["AAA", "DDD"]
+    assert matches("close == close") == ["AAA", "BBB", "CCC"]
+    assert matches("close + rsi14 > 0") == ["AAA", "BBB"]
+    assert matches("rsi14") == ["AAA", "BBB", "DDD"]
+
+
+def test_nan_never_matches_under_not_or_or():
+    assert matches("not rsi14 > 40") == ["AAA", "DDD"]
+    assert matches("not (rsi14 < 30 or rsi14 > 40)") == []
+    assert matches("rsi14 < 30 or close > 100") == ["AAA", "DDD"]
+    assert matches("rsi14 < 30 or close > ma50") == ["AAA", "CCC", "DDD"]
+    assert matches("not (close > 0 and rsi14 > 0)") == []
+    assert matches("not (close > 100 and rsi14 > 0)") == ["AAA", "BBB", "CCC"]
@@ -0,0 +1,78 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils
+from stock_analyzer import streaming
+from stock_analyzer.indicators import compute_indicators
+
+SPECS = ["rsi", "rsi:21", "ema:20", "ma:50", "bb:20:2", "macd", "macd:5:35:5"]
+
+
+def closes(n=400, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.Series(close, index=pd.bdate_range("2020-01-01", periods=n))
+
+
+def stream(specs, series):
+    indicators = streaming.IndicatorSet(specs)
+    return pd.DataFrame([indicators.update(close) for close in series], index=series.index)
+
+
+def assert_matches(streamed, batch):
+    streamed = np.asarray(streamed, dtype="float64")
+    batch = np.asarray(batch, dtype="float64")
+    np.testing.assert_array_equal(np.isnan(streamed), np.isnan(batch))
+    np.testing.assert_allclose(streamed, batch, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_indicator_set_matches_compute_indicators():
+    series = closes()
+    streamed = stream(SPECS, series)
+    batch = compute_indicators(series, SPECS)
+    assert set(streamed.columns) == set(batch)
+    for name, values in batch.items():
+        assert_matches(streamed[name], values)
+
+
+def test_streaming_matches_utils_helpers():
+    series = closes()
+    df = pd.DataFrame({"Close": series})
+    utils.add_moving_average(df, 20)
+    utils.add_ema(df, 20)
+    utils.add_bollinger_bands(df)
+    utils.add_rsi(df)
+    utils.add_macd(df)
+    streamed = stream(["ma:20", "ema:20", "bb:20:2", "rsi:14", "macd"], series)
+    for column, name in [("MA", "ma20"), ("EMA", "ema20"), ("Upper", "bb20_upper"),
+                         ("Lower", "bb20_lower"), ("RSI", "rsi14"), ("MACD", "macd"),
+                         ("Signal", "macd_signal")]:
+        assert_matches(streamed[name], df[column])
+
+
+def test_nan_closes_match_pandas_ewm():
+    series = closes(120)
+    series.iloc[[0, 30, 31, 80]] = np.nan
+    streamed = stream(["ema:10", "macd"], series)
+    batch = compute_indicators(series, ["ema:10", "macd"])
+    # The baseline helpers: plain ewm(adjust=False), so gaps age the average.
+    ema10 = series.ewm(span=10, adjust=False).mean()
+    macd = series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    for name, expected in (("ema10", ema10), ("macd", macd), ("macd_signal", signal)):
+        assert_matches(batch[name], expected)
+        assert_matches(streamed[name], expected)
+
+
+@pytest.mark.parametrize("spec", SPECS)
+def test_state_round_trip_resumes(spec):
+    series = closes(200)
+    whole = streaming.IndicatorSet([spec]).seed(series)
+    head = streaming.IndicatorSet([spec]).seed(series.iloc[:120])
+    resumed = streaming.loads(streaming.dumps({"x": head}))["x"].seed(series.iloc[120:])
+    for name, value in whole.value.items():
+        other = resumed.value[name]
+        assert math.isclose(value, other, rel_tol=1e-12) or (math.isnan(value) and math.isnan(other))
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from stock_analyzer import telemetry
+
+
+@pytest.fixture
+def collecting():
+    was = telemetry.enabled()
+    telemetry.enable()
+    telemetry.reset()
+    yield
+    telemetry.reset()
+    telemetry.enable(was)
+
+
+def test_prometheus_counters_keep_full_precision(collecting):
+    telemetry.count("fetched_bytes", 12345678, source="yfinance")
+    telemetry.count("fetched_bytes", np.int64(2**53 + 1), source="newsapi")
+    telemetry.count("weight", 0.1 + 0.2)
+    text = telemetry.prometheus()
+    assert 'stock_analyzer_fetched_bytes_total{source="yfinance"} 12345678\n' in text
+    assert f'stock_analyzer_fetched_bytes_total{{source="newsapi"}} {2**53 + 1}\n' in text
+    assert "stock_analyzer_weight_total 0.30000000000000004\n" in text
+
+
+def test_counters_are_off_unless_enabled(collecting):
+    telemetry.enable(False)
+    telemetry.count("cache_requests", cache="prices", result="hit")
+    assert telemetry.counters() == {}
@@ -1,59 +1,169 @@
-import yfinance as yf
+import datetime
+import logging
+import os
+import threading
 import pandas as pd
 import numpy as np
-import requests
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import StandardScaler
 import streamlit as st
+from stock_analyzer.price_store import PriceStore
+from stock_analyzer.prices import PriceCache
+from stock_analyzer.indicators import compute_indicators
+from stock_analyzer.anomalies import detect
+from stock_analyzer.sentiment import SentimentFeed, daily_sentiment
+from stock_analyzer.forecast import ModelStore
+from stock_analyzer.compare import ComparisonCache
+from stock_analyzer.live import StoreSource, Watchlist
+from stock_analyzer.screener import LatestTable
+from stock_analyzer.portfolio import monte_carlo
+from stock_analyzer import telemetry
 
-@st.cache_data(ttl=3600)
-def fetch_stock_data(symbol, start, end):
+log = logging.getLogger(__name__)
+
+# Optional default universe loaded once per server process, e.g. "AAPL,MSFT,SPY"
+PREWARM = [s.strip().upper() for s in os.environ.get("STOCK_ANALYZER_PREWARM", "").split(",") if s.strip()]
+PREWARM_START = os.environ.get("STOCK_ANALYZER_PREWARM_START", "2020-01-01")
+
+# Headlines and the sentiment feed share one cached NewsAPI response per symbol
+NEWS_PAGE_SIZE = 100
+
+price_store = PriceStore()
+# Shared by every session in this server process; pages get zero-copy views.
+price_cache = PriceCache()
+forecast_models = ModelStore()
+comparison_cache = ComparisonCache()
+
+def load_prices(symbol, start, end, interval="1d"):
+    return price_cache.get(symbol, start, end, price_store.get, interval)
+
+def fetch_stock_data(symbol, start, end, interval="1d"):
     try:
-        df = yf.download(symbol, start=start, end=end)
+        with telemetry.span("load_prices"):
+            df = load_prices(symbol, start, end, interval).frame()
         return df if not df.empty else pd.DataFrame()
     except Exception as e:
         st.error(f"Error fetching data: {e}")
         return pd.DataFrame()
 
+_matrix_call = threading.local()
+
+@st.cache_data(ttl=3600)
+def _cached_price_matrix(symbols, start, end, field="Close"):
+    # Only runs on a Streamlit cache miss; errors propagate so they are not cached
+    _matrix_call.missed = True
+    with telemetry.span("price_matrix"):
+        return price_store.get_matrix(list(symbols), start, end, field=field)
+
+def fetch_price_matrix(symbols, start, end, field="Close"):
+    _matrix_call.missed = False
+    try:
+        matrix = _cached_price_matrix(symbols, start, end, field)
+    except Exception as e:
+        st.error(f"Error fetching data: {e}")
+        matrix = pd.DataFrame()
+    telemetry.count("cache_requests", cache="price_matrix", result="miss" if _matrix_call.missed else "hit")
+    return matrix
+
+@st.cache_data(ttl=3600, max_entries=16)
+def simulate_portfolio(asset_returns, weights, paths, horizon, level, method):
+    # Chunks run in this process: forking a process pool from the threaded
+    # server (poller, prewarm, sentiment and Tornado threads) can deadlock.
+    with telemetry.span("monte_carlo"):
+        return monte_carlo(asset_returns, list(weights), paths=paths, horizon=horizon,
+                           level=level, method=method, processes=1)
+
+@st.cache_resource
+def watchlist():
+    # One poller per server process; sessions only read its snapshots.
+    return Watchlist(StoreSource(price_store)).start()
+
+@st.cache_resource
+def screener_table():
+    # Latest values for every symbol any session has loaded; scans only read it.
+    return LatestTable()
+
+@st.cache_resource
+def news_client():
+    # requests is only imported by pages that show news
+    from stock_analyzer.news import NewsClient
+
+    return NewsClient(st.secrets["newsapi"]["api_key"])
+
+@st.cache_resource
+def sentiment_feed():
+    # Fetching and scoring run on the feed's own thread; pages read its last result.
+    client = news_client()
+    return SentimentFeed(lambda symbols: client.fetch_many(symbols, page_size=NEWS_PAGE_SIZE))
+
+def news_sentiment(symbol, index):
+    """Scored articles and daily sentiment for ``symbol`` so far; never waits for a refresh."""
+    scored = sentiment_feed().frame([symbol])
+    return scored, daily_sentiment(scored, index)
+
 def fetch_news(symbol):
-    key = st.secrets["newsapi"]["api_key"]
-    url = f"https://newsapi.org/v2/everything?q={symbol}&sortBy=publishedAt&apiKey={key}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json().get("articles", [])[:5]
-    return []
+    import requests
+
+    try:
+        with telemetry.span("news"):
+            return news_client().fetch(symbol, page_size=NEWS_PAGE_SIZE)[:5]
+    except requests.RequestException:
+        return []
 
 def add_moving_average(df, window):
-    df["MA"] = df["Close"].rolling(window).mean()
+    df["MA"] = compute_indicators(df["Close"], [f"ma:{window}"])[f"ma{window}"]
     return df
 
 def add_ema(df, span):
-    df["EMA"] = df["Close"].ewm(span=span, adjust=False).mean()
+    df["EMA"] = compute_indicators(df["Close"], [f"ema:{span}"])[f"ema{span}"]
     return df
 
 def add_bollinger_bands(df, window=20, num_std_dev=2):
-    rolling_mean = df['Close'].rolling(window).mean()
-    rolling_std = df['Close'].rolling(window).std()
-    df['Upper'] = rolling_mean + (rolling_std * num_std_dev)
-    df['Lower'] = rolling_mean - (rolling_std * num_std_dev)
+    bands = compute_indicators(df['Close'], [f"bb:{window}:{num_std_dev}"])
+    df['Upper'] = bands[f"bb{window}_upper"]
+    df['Lower'] = bands[f"bb{window}_lower"]
     return df
 
 def add_rsi(df, window=14):
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    df['RSI'] = 100 - (100 / (1 + rs))
+    df['RSI'] = compute_indicators(df['Close'], [f"rsi:{window}"])[f"rsi{window}"]
     return df
 
 def add_macd(df):
-    exp1 = df['Close'].ewm(span=12, adjust=False).mean()
-    exp2 = df['Close'].ewm(span=26, adjust=False).mean()
-    df['MACD'] = exp1 - exp2
-    df['Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
+    macd = compute_indicators(df['Close'], ["macd"])
+    df['MACD'] = macd["macd"]
+    df['Signal'] = macd["macd_signal"]
     return df
 
-def detect_anomalies(df):
-    model = IsolationForest(contamination=0.05)
-    df["Anomaly"] = model.fit_predict(df[["Close"]])
+def detect_anomalies(df, symbol=None):
+    flags = detect(df, "isolation_forest", symbol=symbol)["anomaly"]
+    df["Anomaly"] = np.where(flags, -1, 1)
     return df
+
+def prewarm(symbols, start=PREWARM_START, end=None):
+    """Load ``symbols`` into the store, the price cache and the screener table.
+
+    One batched fetch fills the on-disk store; the price cache and screener
+    are then built from local data, so the first page that asks for these
+    symbols over this range is served from memory.
+    """
+    end = pd.Timestamp(end or datetime.date.today() + datetime.timedelta(days=1))
+    table = screener_table()
+    with telemetry.span("prewarm"):
+        close = price_store.get_matrix(symbols, start, end)
+        for symbol in symbols:
+            price_cache.get(symbol, start, end, price_store.get)
+        close = close.dropna(axis=1, how="all")
+        if not close.empty:
+            table.load(close)
+    return close
+
+def _prewarm_in_background(symbols):
+    try:
+        prewarm(symbols)
+    except Exception:
+        log.exception("prewarm failed")
+
+# utils is imported once per server process, by the first script run; the
+# prewarm runs beside that run instead of delaying it.
+prewarm_thread = None
+if PREWARM:
+    prewarm_thread = threading.Thread(target=_prewarm_in_background, args=(PREWARM,), name="prewarm", daemon=True)
+    prewarm_thread.start()